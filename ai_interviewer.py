@@ -1,9 +1,91 @@
 import os
 import json
 import openai
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Iterator, Optional
 from dataclasses import dataclass, asdict
 
+from completion_cache import completion_key
+from interview_context import InterviewContext, count_message_tokens, count_tokens, resume_digest
+
+# Seconds before a single completion request is abandoned
+OPENAI_REQUEST_TIMEOUT = float(os.getenv("OPENAI_REQUEST_TIMEOUT", 30))
+
+# Completions at or below this temperature are served from the completion cache, if one is set
+COMPLETION_CACHE_MAX_TEMPERATURE = float(os.getenv("COMPLETION_CACHE_MAX_TEMPERATURE", 0.3))
+
+# Ask for analysis/score/follow-up (and summary/recommendation/skills) in one JSON reply
+AI_INTERVIEWER_STRUCTURED = os.getenv("AI_INTERVIEWER_STRUCTURED", "1") == "1"
+
+# JSON Schemas for the combined replies (only the subset _matches_schema checks)
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["analysis", "score", "follow_up"],
+    "properties": {
+        "analysis": {"type": "string"},
+        "score": {"type": "integer", "minimum": 1, "maximum": 5},
+        "follow_up": {"type": "string"}
+    }
+}
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "required": ["summary", "score", "recommendation", "skills"],
+    "properties": {
+        "summary": {"type": "string"},
+        "score": {"type": "integer", "minimum": 1, "maximum": 10},
+        "recommendation": {"type": "string"},
+        "skills": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["skill", "confidence", "evidence"],
+                "properties": {
+                    "skill": {"type": "string"},
+                    "confidence": {"type": "integer", "minimum": 1, "maximum": 5},
+                    "evidence": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+def _matches_schema(value, schema: Dict) -> bool:
+    """Check value against a JSON Schema using type, required, properties, items, minimum and maximum"""
+    kind = schema.get("type")
+    if kind == "object":
+        if not isinstance(value, dict) or any(key not in value for key in schema.get("required", [])):
+            return False
+        return all(_matches_schema(value[key], sub) for key, sub in schema.get("properties", {}).items() if key in value)
+    if kind == "array":
+        return isinstance(value, list) and all(_matches_schema(item, schema.get("items", {})) for item in value)
+    if kind == "string":
+        return isinstance(value, str)
+    if kind == "integer":
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            return False
+        return schema.get("minimum", value) <= value <= schema.get("maximum", value)
+    return True
+
+def _parse_json_reply(text: str):
+    """json.loads a reply, tolerating a ```json fenced block around it"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    return json.loads(text)
+
+def _parse_structured_reply(text: str, schema: Dict) -> Dict:
+    data = _parse_json_reply(text)
+    if not _matches_schema(data, schema):
+        raise ValueError("reply does not match its schema")
+    return data
+
+# Shared by every interviewer; the calls are I/O bound, so threads overlap the round trips
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("AI_INTERVIEWER_WORKERS", 8)),
+                               thread_name_prefix="ai-interviewer")
+
 @dataclass
 class InterviewQuestion:
     """Class to store interview questions and candidate responses"""
@@ -12,13 +94,26 @@ class InterviewQuestion:
     analysis: Dict = None
 
 class AIInterviewer:
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, model: str = "gpt-4", api_base: str = None,
+                 request_timeout: float = None, structured: bool = None, completion_cache=None,
+                 cache_max_temperature: float = None, context_tokens: int = None):
         self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it to the constructor.")
         
         openai.api_key = self.api_key
+        self.model = model
+        self.api_base = api_base or os.getenv("OPENAI_API_BASE")
+        self.request_timeout = request_timeout or OPENAI_REQUEST_TIMEOUT
+        self.structured = AI_INTERVIEWER_STRUCTURED if structured is None else structured
+        # Anything with get(key) / set(key, text), e.g. completion_cache.SQLiteCompletionCache
+        self.completion_cache = completion_cache
+        self.cache_max_temperature = COMPLETION_CACHE_MAX_TEMPERATURE if cache_max_temperature is None else cache_max_temperature
         self.conversation_history = []
+        # What each prompt sends of conversation_history: a running summary plus the recent turns
+        self.context = InterviewContext(self._summarize_turns, context_tokens, model)
+        # One entry per completion: prompt/completion tokens and whether the completion cache answered it
+        self.token_log = []
         self.job_description = ""
         self.resume_data = None
         
@@ -34,19 +129,105 @@ class AIInterviewer:
         """Generate an initial greeting message"""
         return "Hello! Thank you for joining this interview. I'll be asking you some questions to better understand your experience and skills. Let's get started!"
     
+    def _log_tokens(self, prompt_tokens: int, completion_tokens: int, cached: bool = False):
+        self.token_log.append({"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "cached": cached})
+    
+    def token_usage(self) -> Dict:
+        """Token totals over every completion this interviewer has made, and the largest prompt"""
+        billed = [entry for entry in self.token_log if not entry["cached"]]
+        return {
+            "calls": len(self.token_log),
+            "cached_calls": len(self.token_log) - len(billed),
+            "prompt_tokens": sum(entry["prompt_tokens"] for entry in billed),
+            "completion_tokens": sum(entry["completion_tokens"] for entry in billed),
+            "max_prompt_tokens": max((entry["prompt_tokens"] for entry in self.token_log), default=0)
+        }
+    
+    def _chat_completion(self, messages: List[Dict], temperature: float, max_tokens: int,
+                         timeout: float = None, parse=None):
+        """Run one chat completion and return the stripped reply text (or parse(text))
+        
+        Low-temperature prompts repeat with the same inputs (scores, summaries
+        regenerated for the same transcript), so at or below
+        cache_max_temperature replies come from the completion cache when one
+        is set. A reply parse rejects is never cached.
+        """
+        key = None
+        if self.completion_cache is not None and temperature <= self.cache_max_temperature:
+            key = completion_key(self.model, messages, temperature=temperature, max_tokens=max_tokens)
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                self._log_tokens(count_message_tokens(messages, self.model), 0, cached=True)
+                return parse(cached) if parse else cached
+        
+        options = {"api_base": self.api_base} if self.api_base else {}
+        response = openai.ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            request_timeout=timeout or self.request_timeout,
+            **options
+        )
+        text = response.choices[0].message['content'].strip()
+        usage = response.get('usage') or {}
+        # Count locally only what the API did not report
+        prompt_tokens = usage.get('prompt_tokens')
+        if prompt_tokens is None:
+            prompt_tokens = count_message_tokens(messages, self.model)
+        completion_tokens = usage.get('completion_tokens')
+        if completion_tokens is None:
+            completion_tokens = count_tokens(text, self.model)
+        self._log_tokens(prompt_tokens, completion_tokens)
+        result = parse(text) if parse else text
+        if key is not None:
+            self.completion_cache.set(key, text)
+        return result
+    
+    def _chat_completion_stream(self, messages: List[Dict], temperature: float, max_tokens: int,
+                                timeout: float = None) -> Iterator[str]:
+        """Run one chat completion with stream=True, yielding text as it arrives"""
+        options = {"api_base": self.api_base} if self.api_base else {}
+        response = openai.ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            request_timeout=timeout or self.request_timeout,
+            stream=True,
+            **options
+        )
+        # Streamed replies carry no usage, so both counts are computed locally
+        prompt_tokens, completion_tokens = count_message_tokens(messages, self.model), 0
+        try:
+            for chunk in response:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.get('content')
+                    if content:
+                        completion_tokens += count_tokens(content, self.model)
+                        yield content
+        finally:
+            self._log_tokens(prompt_tokens, completion_tokens)
+    
+    def _structured_completion(self, messages: List[Dict], schema: Dict, temperature: float,
+                               max_tokens: int) -> Optional[Dict]:
+        """Run a completion that must reply with JSON matching schema; None if it doesn't"""
+        messages = [
+            {"role": "system", "content": f"Respond with a single JSON object matching this JSON Schema, and nothing else:\n{json.dumps(schema)}"}
+        ] + messages
+        try:
+            return self._chat_completion(messages, temperature=temperature, max_tokens=max_tokens,
+                                         parse=lambda text: _parse_structured_reply(text, schema))
+        except Exception as e:
+            print(f"Error in structured completion: {str(e)}")
+            return None
+    
     def generate_question(self) -> str:
         """Generate an interview question based on the conversation history"""
         try:
             prompt = self._build_prompt()
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=prompt,
-                temperature=0.7,
-                max_tokens=150
-            )
-            
-            question = response.choices[0].message['content'].strip()
+            question = self._chat_completion(prompt, temperature=0.7, max_tokens=150)
             self.conversation_history.append({"role": "assistant", "content": question})
             
             return question
@@ -55,86 +236,143 @@ class AIInterviewer:
             print(f"Error generating question: {str(e)}")
             return "Could you tell me more about your experience?"
     
-    def analyze_response(self, question: str, answer: str) -> Dict:
-        """Analyze the candidate's response to a question"""
+    def stream_question(self) -> Iterator[str]:
+        """Yield the next interview question piece by piece as the model generates it
+        
+        Same prompt as generate_question. The full question is appended to
+        conversation_history once the stream ends, so callers see the first
+        words after one token's latency instead of the whole completion's.
+        """
+        chunks = []
         try:
+            for content in self._chat_completion_stream(self._build_prompt(), temperature=0.7, max_tokens=150):
+                chunks.append(content)
+                yield content
+        except Exception as e:
+            print(f"Error streaming question: {str(e)}")
+            if not chunks:
+                yield "Could you tell me more about your experience?"
+                return
+        
+        question = "".join(chunks).strip()
+        if question:
+            self.conversation_history.append({"role": "assistant", "content": question})
+    
+    def record_answer(self, answer: str):
+        """Add the candidate's answer to the conversation so the next question can build on it"""
+        self.conversation_history.append({"role": "user", "content": answer})
+    
+    def analyze_response(self, question: str, answer: str) -> Dict:
+        """Analyze the candidate's response to a question
+        
+        In structured mode one completion returns the analysis, score and
+        follow-up as JSON; if that fails or doesn't match ANALYSIS_SCHEMA the
+        separate prompts are used instead.
+        """
+        if self.structured:
             prompt = [
-                {"role": "system", "content": "You are an expert interviewer analyzing a candidate's response. Provide a brief analysis of the response's quality, relevance, and any red flags."},
+                {"role": "system", "content": "You are an expert interviewer analyzing a candidate's response. Give a brief analysis of the response's quality, relevance, and any red flags; rate it 1-5 on relevance, clarity, and depth; and suggest a one-sentence follow-up question. Use the keys 'analysis', 'score' and 'follow_up'."},
                 {"role": "user", "content": f"Job Description:\n{self.job_description}\n\nQuestion: {question}\nCandidate's Answer: {answer}"}
             ]
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=prompt,
-                temperature=0.5,
-                max_tokens=200
-            )
-            
-            analysis_text = response.choices[0].message['content'].strip()
-            
-            score_prompt = [
-                {"role": "system", "content": "Rate the candidate's response on a scale of 1-5 based on relevance, clarity, and depth of answer. Return only the number."},
-                {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"}
-            ]
-            
-            score_response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=score_prompt,
-                temperature=0.2,
-                max_tokens=2
-            )
-            
-            try:
-                score = min(max(1, int(score_response.choices[0].message['content'].strip())), 5)
-            except (ValueError, KeyError):
-                score = 3
-            
-            return {
-                "text": analysis_text,
-                "score": score,
-                "suggested_follow_up": self._generate_follow_up(question, answer, analysis_text)
-            }
-            
+            data = self._structured_completion(prompt, ANALYSIS_SCHEMA, temperature=0.3, max_tokens=300)
+            if data is not None:
+                return {
+                    "text": data["analysis"].strip(),
+                    "score": int(data["score"]),
+                    "suggested_follow_up": data["follow_up"].strip()
+                }
+        return self._analyze_response_separately(question, answer)
+    
+    def _analyze_response_separately(self, question: str, answer: str) -> Dict:
+        """Analysis, score and follow-up from three prompts
+        
+        The prompts don't depend on each other, so they run concurrently and
+        the candidate waits for the slowest one rather than all three. Each
+        call has its own timeout and fallback.
+        """
+        analysis_prompt = [
+            {"role": "system", "content": "You are an expert interviewer analyzing a candidate's response. Provide a brief analysis of the response's quality, relevance, and any red flags."},
+            {"role": "user", "content": f"Job Description:\n{self.job_description}\n\nQuestion: {question}\nCandidate's Answer: {answer}"}
+        ]
+        score_prompt = [
+            {"role": "system", "content": "Rate the candidate's response on a scale of 1-5 based on relevance, clarity, and depth of answer. Return only the number."},
+            {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"}
+        ]
+        
+        analysis = _executor.submit(self._chat_completion, analysis_prompt, 0.5, 200)
+        score = _executor.submit(self._chat_completion, score_prompt, 0.2, 2)
+        follow_up = _executor.submit(self._generate_follow_up, question, answer)
+        # One deadline for all three; result(timeout=0) raises for any still running
+        wait((analysis, score, follow_up), timeout=self.request_timeout)
+        
+        try:
+            analysis_text = analysis.result(timeout=0)
         except Exception as e:
             print(f"Error analyzing response: {str(e)}")
-            return {"text": "Analysis unavailable", "score": 3, "suggested_follow_up": ""}
+            analysis_text = "Analysis unavailable"
+        
+        try:
+            score_value = min(max(1, int(score.result(timeout=0))), 5)
+        except Exception as e:
+            print(f"Error scoring response: {str(e)}")
+            score_value = 3
+        
+        try:
+            suggested_follow_up = follow_up.result(timeout=0)
+        except Exception:
+            suggested_follow_up = ""
+        
+        return {
+            "text": analysis_text,
+            "score": score_value,
+            "suggested_follow_up": suggested_follow_up
+        }
     
     def generate_summary(self) -> Dict:
-        """Generate a summary of the interview"""
+        """Generate a summary of the interview
+        
+        In structured mode the summary, score, recommendation and skills come
+        from one completion validated against SUMMARY_SCHEMA, falling back to
+        separate prompts.
+        """
         if not self.conversation_history:
             return {"summary": "No interview data available.", "overall_score": 0, "recommendation": "No recommendation possible."}
         
+        conversation = self.context.transcript(self.conversation_history)
+        if self.structured:
+            prompt = [
+                {"role": "system", "content": "You are an expert HR professional. Summarize this interview concisely, highlighting the candidate's strengths, weaknesses, and overall fit for the role ('summary'); give an overall score from 1-10 ('score') and a hiring recommendation ('recommendation'); and list the technical and soft skills the candidate demonstrated ('skills'), each with a confidence level from 1-5 and brief evidence."},
+                {"role": "user", "content": f"Job Description:\n{self.job_description}\n\nInterview Conversation:\n{conversation}"}
+            ]
+            data = self._structured_completion(prompt, SUMMARY_SCHEMA, temperature=0.3, max_tokens=1000)
+            if data is not None:
+                return {
+                    "summary": data["summary"].strip(),
+                    "overall_score": int(data["score"]),
+                    "recommendation": data["recommendation"].strip(),
+                    "skills_assessed": data["skills"]
+                }
+        return self._generate_summary_separately(conversation)
+    
+    def _generate_summary_separately(self, conversation: str) -> Dict:
+        """Summary, then score and recommendation, then skills, from separate prompts"""
         try:
-            conversation = "\n".join([f"{msg['role']}: {msg['content']}" for msg in self.conversation_history])
-            
             prompt = [
                 {"role": "system", "content": "You are an expert HR professional. Provide a concise summary of this interview, highlighting the candidate's strengths, weaknesses, and overall fit for the role."},
                 {"role": "user", "content": f"Job Description:\n{self.job_description}\n\nInterview Conversation:\n{conversation}"}
             ]
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=prompt,
-                temperature=0.5,
-                max_tokens=500
-            )
-            
-            summary = response.choices[0].message['content'].strip()
+            summary = self._chat_completion(prompt, temperature=0.5, max_tokens=500)
             
             recommendation_prompt = [
                 {"role": "system", "content": "Based on the interview summary, provide an overall score (1-10) and a hiring recommendation. Format as JSON with 'score' and 'recommendation' keys."},
                 {"role": "user", "content": summary}
             ]
             
-            rec_response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=recommendation_prompt,
-                temperature=0.3,
-                max_tokens=100
-            )
+            rec_text = self._chat_completion(recommendation_prompt, temperature=0.3, max_tokens=100)
             
             try:
-                rec_data = json.loads(rec_response.choices[0].message['content'].strip())
+                rec_data = json.loads(rec_text)
                 overall_score = rec_data.get('score', 5)
                 recommendation = rec_data.get('recommendation', 'No specific recommendation provided.')
             except (json.JSONDecodeError, KeyError):
@@ -153,7 +391,13 @@ class AIInterviewer:
             return {"summary": "Error generating summary.", "overall_score": 0, "recommendation": "No recommendation available."}
     
     def _build_prompt(self) -> List[Dict]:
-        """Build the prompt for generating the next question"""
+        """Build the prompt for generating the next question
+        
+        Sends a resume digest rather than the whole parsed resume, and the
+        bounded context (running summary plus recent turns) rather than the
+        whole conversation, so the prompt stops growing after the first few
+        questions.
+        """
         prompt = [
             {"role": "system", "content": """You are a professional interviewer conducting a technical interview. 
             Ask relevant questions based on the job description and the candidate's resume. 
@@ -164,29 +408,36 @@ class AIInterviewer:
             prompt.append({"role": "system", "content": f"Job Description: {self.job_description}"})
         
         if self.resume_data:
-            resume_context = "\n".join([f"{k}: {v}" for k, v in self.resume_data.items() if v])
-            prompt.append({"role": "system", "content": f"Candidate's Resume: {resume_context}"})
+            prompt.append({"role": "system", "content": f"Candidate's Resume: {resume_digest(self.resume_data, model=self.model)}"})
         
-        prompt.extend(self.conversation_history)
+        prompt.extend(self.context.messages(self.conversation_history))
         
         return prompt
     
-    def _generate_follow_up(self, question: str, answer: str, analysis: str) -> str:
-        """Generate a follow-up question based on the candidate's response"""
+    def _summarize_turns(self, summary: str, turns: str) -> str:
+        """Fold interview turns into the running summary kept by self.context"""
+        prompt = [
+            {"role": "system", "content": "You keep notes on a job interview. Update the summary with the new turns, keeping the questions covered, the candidate's claims, technologies and examples, and any concerns. Stay under 150 words."},
+            {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew turns:\n{turns}"}
+        ]
+        return self._chat_completion(prompt, temperature=0.3, max_tokens=250)
+    
+    def _generate_follow_up(self, question: str, answer: str, analysis: str = "") -> str:
+        """Generate a follow-up question based on the candidate's response
+        
+        analysis is optional so the follow-up can be requested alongside the
+        analysis instead of after it.
+        """
         try:
+            context = f"Question: {question}\nAnswer: {answer}"
+            if analysis:
+                context += f"\nAnalysis: {analysis}"
             prompt = [
                 {"role": "system", "content": "Generate a concise follow-up question based on the candidate's answer. Keep it to one sentence."},
-                {"role": "user", "content": f"Question: {question}\nAnswer: {answer}\nAnalysis: {analysis}"}
+                {"role": "user", "content": context}
             ]
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=prompt,
-                temperature=0.7,
-                max_tokens=50
-            )
-            
-            return response.choices[0].message['content'].strip()
+            return self._chat_completion(prompt, temperature=0.7, max_tokens=50)
             
         except Exception:
             return ""
@@ -197,7 +448,7 @@ class AIInterviewer:
             return []
             
         try:
-            conversation = "\n".join([f"{msg['role']}: {msg['content']}" for msg in self.conversation_history])
+            conversation = self.context.transcript(self.conversation_history)
             
             prompt = [
                 {"role": "system", "content": """Analyze the interview conversation and identify the technical and soft skills demonstrated by the candidate. 
@@ -205,15 +456,10 @@ class AIInterviewer:
                 {"role": "user", "content": conversation}
             ]
             
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=prompt,
-                temperature=0.3,
-                max_tokens=500
-            )
+            skills_text = self._chat_completion(prompt, temperature=0.3, max_tokens=500)
             
             try:
-                return json.loads(response.choices[0].message['content'].strip())
+                return json.loads(skills_text)
             except json.JSONDecodeError:
                 return [{"skill": "Error parsing skills", "confidence": 0, "evidence": "Could not extract skills from interview."}]
                 
@@ -4,6 +4,9 @@ import os
 from datetime import datetime
 import json
 
+from parse_cache import parse_resume_file
+from skill_index import search_candidates
+
 api = Blueprint('api', __name__)
 
 # In-memory storage for demo purposes
@@ -34,6 +37,46 @@ def get_candidates():
         'per_page': per_page
     })
 
+@api.route('/candidates/search', methods=['GET'])
+def search_candidates_by_skill():
+    """Boolean skill search over the resume_skills index.
+    
+    ?all=python,docker  every skill (AND)
+    ?any=aws,azure      at least one (OR)
+    ?not=php            none of these (NOT)
+    ?min_relevance=0.5  minimum link relevance for all/any
+    """
+    def skill_list(name):
+        return [s for s in request.args.get(name, '').split(',') if s.strip()]
+    
+    all_skills, any_skills, not_skills = skill_list('all'), skill_list('any'), skill_list('not')
+    if not (all_skills or any_skills or not_skills):
+        return jsonify({'error': 'Provide at least one of all, any or not'}), 400
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    results = search_candidates(
+        all_skills=all_skills,
+        any_skills=any_skills,
+        not_skills=not_skills,
+        min_relevance=request.args.get('min_relevance', 0.0, type=float),
+        page=page,
+        per_page=per_page
+    )
+    
+    return jsonify({
+        'data': [{
+            'id': c.id,
+            'name': f"{c.first_name} {c.last_name}",
+            'email': c.email,
+            'status': c.status,
+            'ats_score': c.ats_score
+        } for c in results.items],
+        'total': results.total,
+        'page': page,
+        'per_page': per_page
+    })
+
 @api.route('/api/candidates/<int:candidate_id>', methods=['GET'])
 def get_candidate(candidate_id):
     """Get a single candidate by ID"""
@@ -59,21 +102,21 @@ def create_candidate():
     filepath = os.path.join(upload_folder, filename)
     file.save(filepath)
     
-    # Parse resume (in a real app, you'd use your resume parser here)
-    # For now, we'll just store basic info
+    # Parse resume (served from the parse cache when the same file was uploaded before)
+    resume_data = parse_resume_file(filepath)
     candidate_id = len(candidates) + 1
     candidate = {
         'id': candidate_id,
-        'name': request.form.get('name', 'Unknown'),
-        'email': request.form.get('email', ''),
-        'phone': request.form.get('phone', ''),
+        'name': request.form.get('name') or resume_data.name or 'Unknown',
+        'email': request.form.get('email') or resume_data.email,
+        'phone': request.form.get('phone') or resume_data.phone,
         'resume_path': filepath,
         'status': 'new',
         'created_at': datetime.utcnow().isoformat(),
         'ats_score': 0.0,
-        'skills': [],
-        'experience': [],
-        'education': []
+        'skills': resume_data.skills or [],
+        'experience': resume_data.experience or [],
+        'education': resume_data.education or []
     }
     
     candidates[candidate_id] = candidate
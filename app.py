@@ -3,7 +3,7 @@ import json
 import random
 import sys
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, send_from_directory, current_app, Blueprint
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, send_from_directory, current_app, Blueprint, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf.csrf import CSRFProtect, generate_csrf
 from flask_migrate import Migrate
@@ -11,19 +11,35 @@ from werkzeug.utils import secure_filename
 from typing import Dict, List, Any, Tuple, Optional
 import re
 import pickle
+import click
 import os
 from pathlib import Path
 from datetime import datetime
 
 # Import models after db is initialized to avoid circular imports
-from models import db, User, Candidate, Resume, JobPosting, Application, Interview, Note, AIConversation, AIMessage
+from models import db, User, Candidate, Resume, JobPosting, Application, Interview, Note, AIConversation, AIMessage, add_missing_columns
 from resume_parser import ResumeData
+from parse_cache import init_parse_cache, parse_resume_file
+from completion_cache import init_completion_cache
+from interview_sessions import init_interview_sessions
+from skill_index import index_resume_skills
+from ranking import BM25Index, init_ranking_index, resume_search_text
+from dashboard import dashboard_bp, dashboard as dashboard_page
+from rollups import reconcile_rollups, seed_rollups
+from matching import job_skill_set, job_seniority_level, canonical_skills, experience_match as score_experience, score_job_postings, SKILL_WEIGHT, EXPERIENCE_WEIGHT, SKILL_INDEX_VERSION
 
 # Add the app directory to the path
 sys.path.append(str(Path(__file__).parent))
 
-def calculate_match_score(resume_data: ResumeData, job_title: str, job_description: str) -> Dict[str, Any]:
-    """Calculate a match score between resume and job description"""
+def calculate_match_score(resume_data: ResumeData, job_title: str, job_description: str,
+                          job_skills: Optional[set] = None, seniority_level: Optional[int] = None) -> Dict[str, Any]:
+    """Calculate a match score between resume and job description.
+    
+    Skills on both sides are compared by canonical taxonomy name. Pass
+    job_skills and seniority_level (e.g. JobPosting.job_skills() and
+    job_seniority()) to reuse a precompiled skill index instead of scanning
+    the title and description.
+    """
     if not job_description:
         return {
             'score': 0,
@@ -32,25 +48,12 @@ def calculate_match_score(resume_data: ResumeData, job_title: str, job_descripti
             'experience_match': 0
         }
     
-    # Extract skills from job description (simple keyword matching)
-    required_skills = {
-        'python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php',
-        'swift', 'kotlin', 'go', 'rust', 'typescript', 'html', 'css',
-        'django', 'flask', 'react', 'angular', 'vue', 'node', 'spring',
-        'rails', 'laravel', '.net', 'tensorflow', 'pytorch', 'pandas',
-        'numpy', 'docker', 'kubernetes', 'git', 'aws', 'azure', 'gcp',
-        'mongodb', 'postgresql', 'mysql', 'sql', 'nosql', 'linux', 'ci/cd',
-        'jenkins', 'github actions', 'rest', 'graphql', 'api'
-    }
-    
     # Find matching skills
-    resume_skills = set(skill.lower() for skill in (resume_data.skills or []))
-    job_skills = set()
-    job_desc_lower = job_description.lower()
-    
-    for skill in required_skills:
-        if skill in job_desc_lower:
-            job_skills.add(skill)
+    resume_skills = canonical_skills(resume_data.skills)
+    if job_skills is None:
+        job_skills = job_skill_set(job_description)
+    if seniority_level is None:
+        seniority_level = job_seniority_level(job_title, job_description)
     
     matched_skills = resume_skills.intersection(job_skills)
     missing_skills = job_skills - resume_skills
@@ -60,40 +63,11 @@ def calculate_match_score(resume_data: ResumeData, job_title: str, job_descripti
     if job_skills:
         skill_match = len(matched_skills) / len(job_skills) * 100
     
-    # Check experience level (very basic)
-    experience_match = 0
-    if resume_data.experience:
-        # Simple check for seniority in job title/description
-        seniority_keywords = {
-            'junior': 1,
-            'mid-level': 2,
-            'senior': 3,
-            'lead': 4,
-            'principal': 5,
-            'architect': 5
-        }
-        
-        # Check job title for seniority
-        job_level = 2  # Default to mid-level
-        for keyword, level in seniority_keywords.items():
-            if keyword in job_title.lower() or keyword in job_description.lower():
-                job_level = level
-                break
-        
-        # Count years of experience (very rough estimate)
-        exp_years = 0
-        for exp in resume_data.experience:
-            if 'duration' in exp:
-                # Try to extract years from duration (simplified)
-                years = re.findall(r'\d+', exp['duration'])
-                if years:
-                    exp_years += int(years[0])
-        
-        # Simple experience match (0-100)
-        experience_match = min(exp_years / 10 * 100, 100)  # Cap at 10+ years
+    # Years of experience against those expected at the job's seniority
+    experience_match = score_experience(resume_data.experience, seniority_level)
     
     # Calculate overall score (weighted average)
-    overall_score = (skill_match * 0.7) + (experience_match * 0.3)
+    overall_score = (skill_match * SKILL_WEIGHT) + (experience_match * EXPERIENCE_WEIGHT)
     
     return {
         'score': round(overall_score, 1),
@@ -111,6 +85,16 @@ app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx', 'doc', 'txt'}
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['WTF_CSRF_ENABLED'] = True
 app.config['WTF_CSRF_SECRET_KEY'] = os.environ.get('CSRF_SECRET_KEY') or 'another-secret-key-please-change-in-production'
+app.config['PARSE_CACHE_DIR'] = os.environ.get('PARSE_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'parse_cache')
+app.config['PARSE_CACHE_MAX_ENTRIES'] = int(os.environ.get('PARSE_CACHE_MAX_ENTRIES', 1000))
+app.config['COMPLETION_CACHE_PATH'] = os.environ.get('COMPLETION_CACHE_PATH') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'completion_cache.sqlite3')
+app.config['COMPLETION_CACHE_MAX_ENTRIES'] = int(os.environ.get('COMPLETION_CACHE_MAX_ENTRIES', 10000))
+app.config['COMPLETION_CACHE_TTL'] = int(os.environ.get('COMPLETION_CACHE_TTL', 7 * 24 * 3600))  # Seconds
+app.config['RANKING_INDEX_DIR'] = os.environ.get('RANKING_INDEX_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'ranking_index')
+app.config['RANKING_INDEX_SAVE_INTERVAL'] = float(os.environ.get('RANKING_INDEX_SAVE_INTERVAL', 30))  # Seconds before new resumes are saved for other workers
+app.config['RANKING_INDEX_RELOAD_INTERVAL'] = float(os.environ.get('RANKING_INDEX_RELOAD_INTERVAL', 5))  # Seconds between checks for another worker's save
+app.config['AI_INTERVIEW_SESSIONS_MAX'] = int(os.environ.get('AI_INTERVIEW_SESSIONS_MAX', 100))  # AIInterviewers kept in memory per worker
+app.config['AI_INTERVIEW_SESSIONS_IDLE'] = float(os.environ.get('AI_INTERVIEW_SESSIONS_IDLE', 1800))  # Seconds before an unused one is dropped
 
 # Database configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -122,6 +106,9 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 migrate = Migrate(app, db)
 csrf = CSRFProtect(app)
+init_parse_cache(app)
+init_completion_cache(app)
+init_ranking_index(app)
 
 # Create upload folder if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -129,6 +116,7 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 # Import and register API routes
 from api_routes import api as api_blueprint
 app.register_blueprint(api_blueprint, url_prefix='/api')
+app.register_blueprint(dashboard_bp)
 
 # Create database tables
 # Initialize mock database for development
@@ -137,6 +125,7 @@ class MockDB:
         self.app = app
         with app.app_context():
             db.create_all()
+            seed_rollups()
             self._init_sample_data()
     
     def _init_sample_data(self):
@@ -233,6 +222,7 @@ class MockDB:
                     }
                 )
                 db.session.add(resume)
+                db.session.flush()
                 
                 # Create a sample application
                 application = Application(
@@ -313,6 +303,68 @@ if os.environ.get('FLASK_ENV') == 'development':
     mock_db = MockDB(app)
     # Use the real db for operations, mock_db just for sample data
 
+# Rollup tables added to an existing database start empty; fill them before serving
+with app.app_context():
+    try:
+        if seed_rollups():
+            print("Seeded dashboard rollups from existing data")
+    except Exception as e:
+        print(f"Warning: Could not seed dashboard rollups: {str(e)}")
+
+@app.cli.command('backfill-job-index')
+def backfill_job_index():
+    """Compile the skill index for job postings that are missing it or are stale"""
+    added = add_missing_columns(JobPosting)
+    if added:
+        print(f"Added job_postings columns: {', '.join(added)}")
+    stale = JobPosting.query.filter(db.or_(
+        JobPosting.skill_index_version.is_(None),
+        JobPosting.skill_index_version != SKILL_INDEX_VERSION
+    ))
+    jobs = stale.all()
+    for job in jobs:
+        job.compile_skill_index()
+    db.session.commit()
+    print(f"Compiled skill index for {len(jobs)} job postings")
+
+@app.cli.command('reindex-skills')
+def reindex_skills():
+    """Rebuild Skill rows and resume_skills links from every resume's parsed_data"""
+    count = 0
+    for resume in Resume.query.filter(Resume.parsed_data.isnot(None)).all():
+        index_resume_skills(resume)
+        count += 1
+        if count % 500 == 0:
+            db.session.commit()
+    db.session.commit()
+    print(f"Indexed skills for {count} resumes")
+
+@app.cli.command('build-ranking-index')
+def build_ranking_index():
+    """Rebuild the BM25 ranking index from every candidate's latest resume"""
+    index = BM25Index()
+    resumes = latest_resumes()
+    index.add_many((resume.id, resume_search_text(resume.parsed_data)) for resume in resumes)
+    app.extensions['ranking_index'].replace(index)
+    print(f"Indexed {len(resumes)} resumes into {app.config['RANKING_INDEX_DIR']}")
+
+@app.cli.command('reconcile-rollups')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the rollup tables')
+def reconcile_rollups_command(dry_run):
+    """Recompute the dashboard rollup tables from scratch and report drift"""
+    report = reconcile_rollups(fix=not dry_run)
+    for row in report['counters']:
+        print(f"{row['metric']}/{row['bucket']}: stored {row['stored']}, actual {row['actual']}")
+    for row in report['hires']:
+        print(f"hires job {row['job_posting_id']} on {row['day']}: stored {row['stored']}, actual {row['actual']}")
+    drifted = len(report['counters']) + len(report['hires'])
+    if not drifted:
+        print("Rollups are in sync")
+    elif dry_run:
+        print(f"{drifted} rollup rows drifted (dry run, nothing rewritten)")
+    else:
+        print(f"Rebuilt rollups; {drifted} rows had drifted")
+
 @app.route('/')
 def index():
     return redirect(url_for('select_role'))
@@ -350,10 +402,6 @@ def candidate_interviews_route():
 def candidate_resume_route():
     return render_template('candidate_resume.html')
 
-@app.route('/dashboard')
-def dashboard_route():
-    return render_template('dashboard.html')
-
 @app.route('/error')
 def error_route():
     return render_template('error.html')
@@ -369,11 +417,47 @@ def interview_route():
 # Initialize the NLP chatbot
 try:
     from .nlp.train import NLPChatbot
+    from .nlp.jobs import TrainingJobQueue
     # Global chatbot instance
     chatbot = NLPChatbot()
+    # sklearn/NLTK otherwise load on the first chat message
+    if os.environ.get('CHATBOT_WARM_UP') == '1':
+        chatbot.warm_up()
+    # Retraining runs in the background and swaps the new model in when ready
+    training_jobs = TrainingJobQueue(chatbot)
 except ImportError:
     print("Warning: Could not import NLPChatbot. Some features may not be available.")
     chatbot = None
+    training_jobs = None
+
+# Initialize the AI interviewer
+try:
+    from ai_interviewer import AIInterviewer
+except ImportError:
+    print("Warning: Could not import AIInterviewer. AI interviews will use the fixed question list.")
+    AIInterviewer = None
+
+def new_ai_interviewer(candidate_id):
+    """An AIInterviewer set up with the candidate's latest application and resume"""
+    interviewer = AIInterviewer(completion_cache=app.extensions.get('completion_cache'))
+    application = Application.query.filter_by(candidate_id=candidate_id)\
+                                   .order_by(Application.applied_at.desc()).first()
+    if application:
+        job = application.job_posting
+        interviewer.set_job_description(f"{job.title}\n{job.description}\n{job.requirements}")
+    resume = Resume.query.filter_by(candidate_id=candidate_id).order_by(Resume.created_at.desc()).first()
+    if resume and resume.parsed_data:
+        interviewer.set_resume_data(resume.parsed_data)
+    return interviewer
+
+# Interview turns are saved as AIConversation/AIMessage rows, so every worker
+# continues the same interview; each keeps a bounded set of interviewers in memory
+ai_interview_sessions = init_interview_sessions(app, new_ai_interviewer)
+
+def get_ai_interviewer(candidate_id):
+    """The candidate's AIInterviewer with the interview so far"""
+    Candidate.query.get_or_404(candidate_id)
+    return ai_interview_sessions.get(candidate_id)
 
 @app.route('/ai-training')
 @app.route('/ai_training')
@@ -410,9 +494,33 @@ def chat():
         print(f"Error in chat endpoint: {str(e)}")
         return jsonify({'error': 'An error occurred while processing your message'}), 500
 
+@app.route('/api/chat/matches', methods=['POST'])
+def chat_matches():
+    """Debug view: the training phrases closest to a message, with similarity scores"""
+    if chatbot is None:
+        return jsonify({'error': 'Chatbot is not available'}), 503
+    data = request.get_json() or {}
+    message = data.get('message', '').strip()
+    if not message:
+        return jsonify({'error': 'Empty message'}), 400
+    k = min(int(data.get('k', 5)), 50)
+    return jsonify({
+        'index': getattr(chatbot.index, 'name', None),
+        'matches': chatbot.top_matches(message, k=k)
+    })
+
+@app.route('/api/chat/stats', methods=['GET'])
+def chat_stats():
+    """Hit rates of the chatbot's intent and tokenizer caches in this worker"""
+    if chatbot is None:
+        return jsonify({'error': 'Chatbot is not available'}), 503
+    return jsonify({'model_version': chatbot.version, **chatbot.cache_stats()})
+
 @app.route('/api/train', methods=['POST'])
 def train_chatbot():
-    """Endpoint to train the chatbot with new data"""
+    """Queue a background job to train the chatbot with new data"""
+    if training_jobs is None:
+        return jsonify({'error': 'Chatbot is not available'}), 503
     try:
         data = request.get_json()
         new_data = data.get('training_data', [])
@@ -420,14 +528,28 @@ def train_chatbot():
         if not new_data:
             return jsonify({'error': 'No training data provided'}), 400
             
-        # Train the chatbot with new data
-        chatbot.train(new_data)
+        # Chat keeps using the current model until the job swaps in the new one
+        job = training_jobs.submit(new_data)
         
-        return jsonify({'message': 'Chatbot trained successfully'})
+        return jsonify({
+            'message': 'Training job queued',
+            'job': job,
+            'status_url': url_for('training_job_status', job_id=job['id'])
+        }), 202
         
     except Exception as e:
         print(f"Error in train endpoint: {str(e)}")
-        return jsonify({'error': 'An error occurred while training the chatbot'}), 500
+        return jsonify({'error': 'An error occurred while queueing the training job'}), 500
+
+@app.route('/api/train/<job_id>', methods=['GET'])
+def training_job_status(job_id):
+    """Status of a chatbot training job, plus the model version currently serving"""
+    if training_jobs is None:
+        return jsonify({'error': 'Chatbot is not available'}), 503
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Training job not found'}), 404
+    return jsonify({'job': job, 'current_model_version': chatbot.version})
 
 @app.route('/onboarding', methods=['GET', 'POST'])
 def onboarding_route():
@@ -446,8 +568,7 @@ def onboarding_route():
             
             # Parse the resume
             try:
-                parser = ResumeParser()
-                resume_data = parser.parse_resume(temp_file)
+                resume_data = parse_resume_file(temp_file)
             except Exception as e:
                 app.logger.error(f"Error parsing resume: {str(e)}")
                 resume_data = ResumeData()  # Create empty ResumeData object if parsing fails
@@ -686,7 +807,6 @@ def resume_review_route():
 
 @app.route('/resume-screening', methods=['GET', 'POST'])
 def resume_screening_route():
-    from resume_parser import ResumeParser
     import os
     from werkzeug.utils import secure_filename
     
@@ -709,8 +829,7 @@ def resume_screening_route():
             file.save(filepath)
             
             # Parse the resume
-            parser = ResumeParser()
-            resume_data = parser.parse_resume(filepath)
+            resume_data = parse_resume_file(filepath)
             
             # Calculate match score (you can customize the job description)
             job_description = request.form.get('job_description', '')
@@ -800,14 +919,57 @@ def manual_review(candidate_id):
 
 @app.route('/interview/ai/<int:candidate_id>', methods=['GET'])
 def ai_interview(candidate_id):
-    # Find the candidate
-    candidate = next((c for c in db.candidates if c['id'] == candidate_id), None)
+    # Find the candidate (the same record the interview routes look up)
+    candidate = Candidate.query.get(candidate_id)
     if not candidate:
         flash('Candidate not found', 'error')
         return redirect(url_for('resume_screening_route'))
     
     return render_template('ai_interview.html', candidate=candidate)
 
+@app.route('/interview/ai/<int:candidate_id>/question/stream', methods=['GET'])
+def ai_interview_question_stream(candidate_id):
+    """Stream the next AI interview question as server-sent events
+    
+    'token' events carry text as the model generates it; a final 'done'
+    event carries the whole question.
+    """
+    if AIInterviewer is None:
+        return jsonify({'error': 'AI interviewer is not available'}), 503
+    try:
+        interviewer = get_ai_interviewer(candidate_id)
+    except ValueError as e:  # No OpenAI API key configured
+        return jsonify({'error': str(e)}), 503
+    
+    def events():
+        chunks = []
+        for content in interviewer.stream_question():
+            chunks.append(content)
+            yield f"event: token\ndata: {json.dumps(content)}\n\n"
+        ai_interview_sessions.save(candidate_id)
+        yield f"event: done\ndata: {json.dumps(''.join(chunks).strip())}\n\n"
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Stop nginx-style proxies from buffering the stream
+    })
+
+@app.route('/interview/ai/<int:candidate_id>/answer', methods=['POST'])
+def ai_interview_answer(candidate_id):
+    """Record the candidate's answer before the next question is streamed"""
+    if AIInterviewer is None:
+        return jsonify({'error': 'AI interviewer is not available'}), 503
+    data = request.get_json() or {}
+    answer = data.get('answer', '').strip()
+    if not answer:
+        return jsonify({'error': 'Empty answer'}), 400
+    try:
+        get_ai_interviewer(candidate_id).record_answer(answer)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 503
+    ai_interview_sessions.save(candidate_id)
+    return jsonify({'recorded': True})
+
 @app.route('/schedule-appointment')
 def schedule_appointment_route():
     return render_template('schedule_appointment.html')
@@ -898,101 +1060,61 @@ def manage_appointment(appointment_id):
                          candidates=candidates,
                          interviewers=interviewers)
 
+def latest_resumes() -> List[Resume]:
+    """Most recent parsed resume for each candidate"""
+    latest = {}
+    for resume in Resume.query.filter(Resume.parsed_data.isnot(None)).order_by(Resume.created_at).all():
+        latest[resume.candidate_id] = resume
+    return list(latest.values())
+
+@app.route('/api/jobs/<int:job_id>/rankings')
+def job_rankings(job_id):
+    """Re-rank every candidate for a job with one batched score_matrix call"""
+    job = JobPosting.query.get_or_404(job_id)
+    limit = request.args.get('limit', 20, type=int)
+    
+    resumes = latest_resumes()
+    scores = score_job_postings([r.parsed_data for r in resumes], [job])
+    
+    rankings = []
+    for i, _ in scores.top_resumes(0, limit):
+        resume = resumes[i]
+        rankings.append({
+            'candidate_id': resume.candidate_id,
+            'resume_id': resume.id,
+            'name': f"{resume.candidate.first_name} {resume.candidate.last_name}",
+            'match_score': scores.result(i, 0)
+        })
+    
+    return jsonify({'job_id': job.id, 'title': job.title, 'total': len(resumes), 'rankings': rankings})
+
+@app.route('/api/jobs/<int:job_id>/top-candidates')
+def job_top_candidates(job_id):
+    """Top-k candidates for a job by BM25 relevance of their resume text"""
+    job = JobPosting.query.get_or_404(job_id)
+    k = min(request.args.get('k', 10, type=int), 100)
+    
+    hits = app.extensions['ranking_index'].search(f"{job.title}\n{job.full_description}", k)
+    resumes = {r.id: r for r in Resume.query.filter(Resume.id.in_([doc_id for doc_id, _ in hits])).all()}
+    
+    results = []
+    for doc_id, score in hits:
+        resume = resumes.get(doc_id)
+        if resume:
+            results.append({
+                'candidate_id': resume.candidate_id,
+                'resume_id': resume.id,
+                'name': f"{resume.candidate.first_name} {resume.candidate.last_name}",
+                'relevance': round(score, 3)
+            })
+    
+    return jsonify({'job_id': job.id, 'title': job.title, 'results': results})
+
 # HR Dashboard
 @app.route('/hr/dashboard')
 def hr_dashboard():
-    """HR Dashboard route"""
-    # Get counts for dashboard stats using SQLAlchemy queries
-    total_candidates = Candidate.query.count()
-    total_applications = Application.query.count()
-    interviews_scheduled = Application.query.filter_by(status='interview_scheduled').count()
-    jobs_posted = JobPosting.query.filter_by(is_active=True).count()
-    
-    # Calculate average ATS score
-    avg_ats_score = db.session.query(db.func.avg(Candidate.ats_score) * 100).scalar() or 0
-    avg_ats_score = round(avg_ats_score, 1)
-    
-    # Calculate hiring rate (assuming 'hired' status means successful hire)
-    total_apps = Application.query.count()
-    hired_count = Application.query.filter_by(status='hired').count()
-    hiring_rate = round((hired_count / total_apps * 100), 1) if total_apps > 0 else 0
-    
-    # Get recent activities
-    recent_applications = Application.query.order_by(Application.updated_at.desc()).limit(10).all()
-    recent_activities = get_recent_activities(recent_applications)
-    
-    # Get top candidates (top 5 by score)
-    top_candidates = Candidate.query.filter(Candidate.ats_score.isnot(None))\
-                                 .order_by(Candidate.ats_score.desc())\
-                                 .limit(5).all()
-    
-    # Get application status distribution
-    status_counts = db.session.query(
-        Application.status,
-        db.func.count(Application.id)
-    ).group_by(Application.status).all()
-    
-    status_counts = {
-        status.replace('_', ' ').title(): count 
-        for status, count in status_counts
-    }
-    
-    # Calculate ATS score distribution
-    score_distribution = {
-        '0-20': Candidate.query.filter(Candidate.ats_score <= 0.2).count(),
-        '21-40': Candidate.query.filter(Candidate.ats_score > 0.2, Candidate.ats_score <= 0.4).count(),
-        '41-60': Candidate.query.filter(Candidate.ats_score > 0.4, Candidate.ats_score <= 0.6).count(),
-        '61-80': Candidate.query.filter(Candidate.ats_score > 0.6, Candidate.ats_score <= 0.8).count(),
-        '81-100': Candidate.query.filter(Candidate.ats_score > 0.8).count()
-    }
-    
-    # Get hiring trends (last 6 months)
-    current_date = datetime.now()
-    hiring_trends = {}
-    
-    for i in range(5, -1, -1):
-        target_date = current_date - timedelta(days=30*i)
-        month_year = target_date.strftime('%b %Y')
-        
-        # Query for hired applications in this month
-        month_start = datetime(target_date.year, target_date.month, 1)
-        if target_date.month == 12:
-            next_month = datetime(target_date.year + 1, 1, 1)
-        else:
-            next_month = datetime(target_date.year, target_date.month + 1, 1)
-            
-        hired_count = Application.query.filter(
-            Application.status == 'hired',
-            Application.updated_at >= month_start,
-            Application.updated_at < next_month
-        ).count()
-        
-        hiring_trends[month_year] = hired_count
-    
-    # Sample sentiment data (in a real app, this would come from your database)
-    sentiment_data = {
-        'Positive': random.randint(15, 25),
-        'Neutral': random.randint(5, 15),
-        'Negative': random.randint(1, 5)
-    }
-    sentiment_total = sum(sentiment_data.values())
-    
-    return render_template(
-        'dashboard.html',
-        total_candidates=total_candidates,
-        total_applications=total_applications,
-        interviews_scheduled=interviews_scheduled,
-        jobs_posted=jobs_posted,
-        recent_activities=recent_activities,
-        top_candidates=top_candidates,
-        status_counts=status_counts,
-        score_distribution=score_distribution,
-        hiring_trends=hiring_trends,
-        avg_ats_score=avg_ats_score,
-        hiring_rate=hiring_rate,
-        sentiment_data=sentiment_data,
-        sentiment_total=sentiment_total if sentiment_total > 0 else 1  # Avoid division by zero
-    )
+    """HR Dashboard route (the same page as the dashboard blueprint's /dashboard)"""
+    return dashboard_page()
 
 # Candidate Routes
 def get_recent_activities(applications):
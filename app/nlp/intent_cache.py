@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+# Marks a miss; a cached intent of None means "no match, use a default response"
+MISS = object()
+
+def normalize_message(message):
+    """Lowercase and collapse whitespace, so trivially different phrasings share an entry"""
+    return ' '.join(message.lower().split())
+
+class IntentCache:
+    """LRU cache of resolved intents, keyed by normalized message and model version.
+
+    Chat traffic repeats the same greetings and FAQ phrasings, so a hit
+    skips tokenizing, vectorizing and the index lookup altogether. Only the
+    intent is cached; responses are still picked at random per request.
+    Entries belong to one model version: a lookup for a newer version drops
+    everything cached for the old one, and requests still holding an older
+    model neither read nor write entries.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, version, message):
+        """The cached intent for a normalized message, or MISS"""
+        with self._lock:
+            if self.version is None or version > self.version:
+                self._entries.clear()
+                self.version = version
+            intent = self._entries.get(message, MISS) if version == self.version else MISS
+            if intent is MISS:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(message)
+                self.hits += 1
+            return intent
+
+    def set(self, version, message, intent):
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[message] = intent
+            self._entries.move_to_end(message)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'model_version': self.version,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,165 @@
+"""
+Nearest-neighbour indexes over the chatbot's L2-normalized training matrix.
+
+ExactIntentIndex scores every training phrase with one sparse dot product.
+LSHIntentIndex uses random-projection (SimHash) locality-sensitive hashing
+to pick candidate phrases and only scores those, which keeps lookups flat as
+the training set grows into the hundreds of thousands. build_intent_index
+chooses between them by size; evaluate_recall measures how often the LSH
+results agree with the exact ones.
+"""
+
+import os
+import numpy as np
+from scipy import sparse
+
+# Training sets up to this many phrases use the exact index
+INTENT_INDEX_EXACT_MAX = int(os.environ.get('INTENT_INDEX_EXACT_MAX', 20000))
+
+def l2_normalize(matrix):
+    """Scale each row of a sparse matrix to unit length (empty rows stay empty).
+
+    Same result as sklearn.preprocessing.normalize, without importing sklearn
+    on the model loading and serving path.
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+def _top_k(rows, scores, k):
+    """(row, score) pairs for the k highest scores, best first"""
+    if k <= 0 or len(scores) == 0:
+        return []
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(int(rows[i]), float(scores[i])) for i in top]
+
+class ExactIntentIndex:
+    """Brute-force cosine search; rows and queries are unit length"""
+
+    name = 'exact'
+
+    def __init__(self, matrix):
+        self.matrix = sparse.csr_matrix(matrix)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def search(self, query_vec, k=1):
+        scores = (self.matrix @ query_vec.T).toarray().ravel()
+        return _top_k(np.arange(len(scores)), scores, k)
+
+class LSHIntentIndex:
+    """Random-projection LSH with multi-probe lookups and exact re-ranking.
+
+    Each of n_tables hashes a vector to the signs of n_bits random projections.
+    Phrases sharing a bucket with the query in any table are candidates; the
+    probes least-confident bits of each query hash are also flipped to search
+    neighbouring buckets. Candidates are then scored exactly. Projections only
+    cover columns some training row uses (hashed features are mostly empty);
+    other query terms cannot change any cosine score.
+    """
+
+    name = 'lsh'
+
+    def __init__(self, matrix, n_bits=14, n_tables=16, probes=4, seed=0):
+        self.matrix = sparse.csr_matrix(matrix)
+        self.n_bits = n_bits
+        self.n_tables = n_tables
+        self.probes = probes
+        rng = np.random.default_rng(seed)
+        self.columns = np.unique(self.matrix.indices)
+        self.planes = rng.standard_normal((len(self.columns), n_bits * n_tables)).astype(np.float32)
+        self._powers = 1 << np.arange(n_bits, dtype=np.int64)
+
+        codes = self._codes(self.matrix[:, self.columns] @ self.planes)
+        # Per table: rows sorted by bucket code, plus each bucket's code and start offset
+        self._tables = []
+        for t in range(n_tables):
+            order = np.argsort(codes[:, t], kind='stable')
+            bucket_codes, starts = np.unique(codes[order, t], return_index=True)
+            self._tables.append((order, bucket_codes, np.append(starts, len(order))))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def _codes(self, projections):
+        bits = np.asarray(projections).reshape(-1, self.n_tables, self.n_bits) > 0
+        return bits.astype(np.int64) @ self._powers
+
+    def _project(self, query_vec):
+        query_vec = sparse.csr_matrix(query_vec)
+        positions = np.searchsorted(self.columns, query_vec.indices)
+        known = positions < len(self.columns)
+        known[known] = self.columns[positions[known]] == query_vec.indices[known]
+        return query_vec.data[known] @ self.planes[positions[known]]
+
+    def _probe_codes(self, projections):
+        """Query bucket code per table, plus the codes with its weakest bits flipped"""
+        projections = np.asarray(projections).reshape(self.n_tables, self.n_bits)
+        codes = ((projections > 0).astype(np.int64) @ self._powers).tolist()
+        weakest = np.argsort(np.abs(projections), axis=1)[:, :self.probes]
+        return [
+            [code] + [code ^ (1 << int(bit)) for bit in weakest[t]]
+            for t, code in enumerate(codes)
+        ]
+
+    def candidates(self, query_vec):
+        """Row ids sharing a probed bucket with the query"""
+        found = []
+        for (order, bucket_codes, bounds), codes in zip(self._tables, self._probe_codes(self._project(query_vec))):
+            positions = np.searchsorted(bucket_codes, codes)
+            for code, position in zip(codes, positions):
+                if position < len(bucket_codes) and bucket_codes[position] == code:
+                    found.append(order[bounds[position]:bounds[position + 1]])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def search(self, query_vec, k=1):
+        rows = self.candidates(query_vec)
+        if len(rows) == 0:
+            return []
+        scores = (self.matrix[rows] @ query_vec.T).toarray().ravel()
+        return _top_k(rows, scores, k)
+
+def build_intent_index(matrix, exact_max=None, **lsh_options):
+    """Exact index for small training sets, LSH once there are more than exact_max rows"""
+    exact_max = INTENT_INDEX_EXACT_MAX if exact_max is None else exact_max
+    if matrix.shape[0] <= exact_max:
+        return ExactIntentIndex(matrix)
+    return LSHIntentIndex(matrix, **lsh_options)
+
+def evaluate_recall(index, exact_index, query_vecs, k=5):
+    """How well index reproduces exact_index's top-k over a set of query rows.
+
+    Returns top1 (share of queries with the same best match), recall_at_k
+    (mean overlap of the top-k sets) and candidate_fraction (mean share of
+    the training set scored per query, for LSH indexes).
+    """
+    query_vecs = sparse.csr_matrix(query_vecs)
+    top1, recall, scanned, counted = 0, 0.0, 0.0, 0
+    for i in range(query_vecs.shape[0]):
+        query = query_vecs[i]
+        expected = exact_index.search(query, k)
+        if not expected or expected[0][1] <= 0:
+            continue  # Query shares no terms with the training set
+        counted += 1
+        found = index.search(query, k)
+        # Compared by score so ties between equally similar phrases don't count as misses
+        top1 += bool(found) and found[0][1] >= expected[0][1] - 1e-6
+        recall += sum(score >= expected[-1][1] - 1e-6 for _, score in found) / len(expected)
+        if hasattr(index, 'candidates'):
+            scanned += len(index.candidates(query)) / len(exact_index)
+        else:
+            scanned += 1.0
+    if not counted:
+        return {'queries': 0, 'top1': 0.0, 'recall_at_k': 0.0, 'candidate_fraction': 0.0}
+    return {
+        'queries': counted,
+        'top1': round(top1 / counted, 4),
+        'recall_at_k': round(recall / counted, 4),
+        'candidate_fraction': round(scanned / counted, 4)
+    }
@@ -0,0 +1,97 @@
+import os
+import json
+import uuid
+import queue
+import threading
+from datetime import datetime
+
+class TrainingJobQueue:
+    """Runs chatbot training jobs one at a time on a background thread.
+
+    submit() returns immediately with a job record; the worker calls
+    chatbot.train(), which swaps the new model in only once it is fully
+    fitted and saved. Job records are JSON files under
+    <model_dir>/training_jobs, so any worker process can report a job's
+    status. The thread starts on the first submit, so it is created in
+    the serving process rather than a pre-fork master.
+    """
+
+    def __init__(self, chatbot, max_jobs=200):
+        self.chatbot = chatbot
+        self.max_jobs = max_jobs
+        self.jobs_dir = os.path.join(chatbot.model_dir, 'training_jobs')
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def _path(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _write(self, job):
+        tmp_path = f"{self._path(job['id'])}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, self._path(job['id']))
+
+    def _update(self, job, **fields):
+        job.update(fields)
+        self._write(job)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='chatbot-training', daemon=True)
+                self._worker.start()
+
+    def submit(self, new_data):
+        """Queue a training job for new_data ([(text, intent), ...]) and return its record"""
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': 'queued',
+            'examples': len(new_data),
+            'submitted_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'model_version': None,
+            'error': None
+        }
+        self._write(job)
+        self._prune()
+        queued = dict(job)
+        self._queue.put((job, [tuple(item) for item in new_data]))
+        self._ensure_worker()
+        return queued
+
+    def get(self, job_id):
+        """The job record for job_id, or None if it is unknown"""
+        try:
+            with open(self._path(os.path.basename(job_id))) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _prune(self):
+        """Drop the oldest job records beyond max_jobs"""
+        paths = [os.path.join(self.jobs_dir, name) for name in os.listdir(self.jobs_dir) if name.endswith('.json')]
+        if len(paths) <= self.max_jobs:
+            return
+        paths.sort(key=lambda path: os.path.getmtime(path))
+        for path in paths[:len(paths) - self.max_jobs]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _run(self):
+        while True:
+            job, new_data = self._queue.get()
+            try:
+                self._update(job, status='running', started_at=datetime.utcnow().isoformat())
+                version = self.chatbot.train(new_data)
+                self._update(job, status='succeeded', model_version=version, finished_at=datetime.utcnow().isoformat())
+            except Exception as e:
+                print(f"Error in training job {job['id']}: {str(e)}")
+                self._update(job, status='failed', error=str(e), finished_at=datetime.utcnow().isoformat())
+            finally:
+                self._queue.task_done()
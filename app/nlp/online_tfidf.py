@@ -0,0 +1,72 @@
+import numpy as np
+from scipy import sparse
+
+try:
+    from .intent_index import l2_normalize
+except ImportError:
+    from intent_index import l2_normalize
+
+class OnlineTfidfVectorizer:
+    """TF-IDF over hashed features, with document frequencies updated per batch.
+
+    Hashing needs no vocabulary, so new phrases are vectorized without
+    touching the existing corpus; only the batch is tokenized. IDF uses the
+    same smoothed formula as TfidfVectorizer, computed from running document
+    counts, so it matches a full refit exactly apart from hash collisions.
+    Instances are never mutated: updated() returns a new vectorizer, which
+    lets a serving model keep using the old statistics until it is swapped.
+    The hasher (and sklearn) is only loaded once texts need vectorizing.
+    """
+
+    def __init__(self, tokenizer, n_features=2 ** 18, doc_freq=None, n_docs=0):
+        self.tokenizer = tokenizer
+        self.n_features = n_features
+        self.doc_freq = np.zeros(n_features, dtype=np.int64) if doc_freq is None else doc_freq
+        self.n_docs = n_docs
+        self.idf = np.log((1 + n_docs) / (1 + self.doc_freq)) + 1
+        self._hasher = None
+
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._hasher = HashingVectorizer(
+                tokenizer=self.tokenizer,
+                token_pattern=None,
+                stop_words='english',
+                n_features=self.n_features,
+                alternate_sign=False,
+                norm=None
+            )
+        return self._hasher
+
+    def counts(self, texts):
+        """Raw term counts for texts (rows x n_features)"""
+        return self.hasher.transform(texts).tocsr()
+
+    def updated(self, counts):
+        """A new vectorizer whose document frequencies also include these rows"""
+        doc_freq = self.doc_freq + np.bincount(counts.indices, minlength=self.n_features)
+        vectorizer = OnlineTfidfVectorizer(self.tokenizer, self.n_features, doc_freq, self.n_docs + counts.shape[0])
+        # The hasher is stateless; sharing it skips sklearn re-tokenizing its stop words for each new one
+        vectorizer._hasher = self._hasher
+        return vectorizer
+
+    def weight(self, counts):
+        """L2-normalized TF-IDF rows from raw counts"""
+        return l2_normalize(counts @ sparse.diags(self.idf)).tocsr()
+
+    def transform(self, texts):
+        return self.weight(self.counts(texts))
+
+    def state(self):
+        """(JSON metadata, arrays) for saving; document frequencies are stored sparsely"""
+        columns = np.flatnonzero(self.doc_freq)
+        meta = {'kind': 'hashed', 'n_features': self.n_features, 'n_docs': self.n_docs}
+        return meta, {'df_columns': columns, 'df_values': self.doc_freq[columns]}
+
+    @classmethod
+    def from_state(cls, tokenizer, meta, arrays):
+        doc_freq = np.zeros(meta['n_features'], dtype=np.int64)
+        doc_freq[arrays['df_columns']] = arrays['df_values']
+        return cls(tokenizer, meta['n_features'], doc_freq, meta['n_docs'])
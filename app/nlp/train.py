@@ -1,47 +1,301 @@
 import numpy as np
+import glob
 import json
 import os
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+import time
+import tempfile
+import threading
+import functools
+from scipy import sparse
 import string
-import pickle
 
-# Download required NLTK data
-def download_nltk_data():
-    nltk.download('punkt', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('stopwords', quiet=True)
+# sklearn and NLTK are imported where they are first needed (fitting, or
+# vectorizing a message), so importing this module and loading a saved
+# model stay fast; see `python benchmark_chatbot.py --startup`.
+try:
+    from .intent_index import build_intent_index, l2_normalize
+    from .online_tfidf import OnlineTfidfVectorizer
+    from .intent_cache import IntentCache, MISS, normalize_message
+except ImportError:
+    from intent_index import build_intent_index, l2_normalize
+    from online_tfidf import OnlineTfidfVectorizer
+    from intent_cache import IntentCache, MISS, normalize_message
 
-download_nltk_data()
+try:
+    from utils.file_lock import file_lock
+except ImportError:  # Run as a script from app/nlp, which never trains
+    from contextlib import nullcontext as file_lock
+
+# NLTK data shipped with the app (`python train.py --download-nltk` fills it);
+# NLTK_DATA and NLTK's default locations are searched too
+NLTK_DATA_DIR = os.environ.get('CHATBOT_NLTK_DATA', os.path.join(os.path.dirname(__file__), 'nltk_data'))
+# With CHATBOT_NLTK_OFFLINE=1 missing data is an error instead of a download
+NLTK_OFFLINE = os.environ.get('CHATBOT_NLTK_OFFLINE', '0') == '1'
+
+# Bounds for LemmaTokenizer's memo caches (distinct tokens / distinct texts)
+LEMMA_CACHE_SIZE = int(os.environ.get('CHATBOT_LEMMA_CACHE_SIZE', 50000))
+TOKEN_CACHE_SIZE = int(os.environ.get('CHATBOT_TOKEN_CACHE_SIZE', 10000))
+# Normalized messages whose resolved intent get_response remembers
+INTENT_CACHE_SIZE = int(os.environ.get('CHATBOT_INTENT_CACHE_SIZE', 1024))
+
+# Bump when the saved model layout changes; older models are refit from training_data.json
+MODEL_FORMAT = 2
+
+def _nltk_resources():
+    """NLTK package -> resource path for the data LemmaTokenizer uses"""
+    from nltk.tokenize import punkt
+    # NLTK 3.8.2+ tokenizes with punkt_tab rather than the pickled punkt models
+    tokenizer = 'punkt_tab' if hasattr(punkt, 'PunktTokenizer') else 'punkt'
+    return {tokenizer: f'tokenizers/{tokenizer}', 'wordnet': 'corpora/wordnet', 'stopwords': 'corpora/stopwords'}
+
+# Download required NLTK data (a provisioning step; nothing calls this at import)
+def download_nltk_data(download_dir=None):
+    import nltk
+    for package in _nltk_resources():
+        nltk.download(package, download_dir=download_dir, quiet=True)
+
+_nltk_checked = False
+
+def ensure_nltk_data():
+    """Find the NLTK data locally, downloading only what is missing (unless offline)"""
+    global _nltk_checked
+    if _nltk_checked:
+        return
+    import nltk
+    if os.path.isdir(NLTK_DATA_DIR) and NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    missing = []
+    for package, resource in _nltk_resources().items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(package)
+    if missing:
+        if NLTK_OFFLINE:
+            raise LookupError(
+                f"NLTK data not found: {', '.join(missing)}. "
+                f"Provision it with `python app/nlp/train.py --download-nltk`."
+            )
+        print(f"Downloading NLTK data: {', '.join(missing)}")
+        for package in missing:
+            nltk.download(package, quiet=True)
+    _nltk_checked = True
+
+# How often a process checks whether another process saved a newer model
+MODEL_RELOAD_INTERVAL = float(os.environ.get('CHATBOT_MODEL_RELOAD_INTERVAL', 5))
+
+# Incremental mode: hashed TF-IDF features with online IDF, so train() only
+# tokenizes the new batch. CHATBOT_FULL_REFIT_EVERY > 0 re-tokenizes the whole
+# corpus every N incremental updates (e.g. after changing the tokenizer).
+INCREMENTAL_TRAINING = os.environ.get('CHATBOT_INCREMENTAL', '0') == '1'
+FULL_REFIT_EVERY = int(os.environ.get('CHATBOT_FULL_REFIT_EVERY', 0))
+
+def _atomic_write(path, write, mode='w'):
+    """Write via a temp file in the same directory and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@functools.lru_cache(maxsize=None)
+def _nltk_tools():
+    """(word_tokenize, lemmatizer, stop words), loaded on first use"""
+    ensure_nltk_data()
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+    return word_tokenize, WordNetLemmatizer(), frozenset(stopwords.words('english') + list(string.punctuation))
+
+@functools.lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def _lemma(token):
+    return _nltk_tools()[1].lemmatize(token)
+
+@functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _lemma_tokens(text):
+    word_tokenize, _, stop_words = _nltk_tools()
+    return tuple(_lemma(token) for token in word_tokenize(text.lower()) if token not in stop_words)
+
+def tokenizer_cache_info():
+    """Hit/miss counters of the shared lemma and tokenization caches"""
+    stats = {}
+    for name, cached in (('lemmas', _lemma), ('texts', _lemma_tokens)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0
+        }
+    return stats
+
+class LemmaTokenizer:
+    """Vectorizer tokenizer: lowercase, drop stop words and punctuation, lemmatize.
+
+    NLTK and its data are loaded on the first call, so building a vectorizer
+    around it (e.g. when loading a model) costs nothing until a text needs
+    tokenizing. Lemmas and whole tokenized texts are memoized in bounded LRU
+    caches shared by every model, so a retrain keeps them warm.
+    """
+
+    def __call__(self, text):
+        return list(_lemma_tokens(text))
+
+class VocabularyTfidfVectorizer:
+    """A fitted TfidfVectorizer, kept as its vocabulary and IDF weights.
+
+    That is all a saved model needs to store. The sklearn vectorizer is
+    rebuilt from them the first time a text is transformed.
+    """
+
+    def __init__(self, vocabulary, idf, vectorizer=None):
+        self.vocabulary = vocabulary  # Terms in column order
+        self.idf = idf
+        self._vectorizer = vectorizer
+
+    @classmethod
+    def fit_transform(cls, texts):
+        """(fitted vectorizer, L2-normalized TF-IDF rows of texts)"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(tokenizer=LemmaTokenizer(), stop_words='english')
+        matrix = vectorizer.fit_transform(texts)
+        vocabulary = vectorizer.get_feature_names_out().tolist()
+        return cls(vocabulary, vectorizer.idf_, vectorizer), l2_normalize(matrix).tocsr()
+
+    @property
+    def n_features(self):
+        return len(self.vocabulary)
+
+    def transform(self, texts):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            vectorizer = TfidfVectorizer(
+                tokenizer=LemmaTokenizer(),
+                stop_words='english',
+                vocabulary={term: column for column, term in enumerate(self.vocabulary)}
+            )
+            vectorizer.idf_ = self.idf
+            self._vectorizer = vectorizer
+        return self._vectorizer.transform(texts)
+
+    def state(self):
+        """(JSON metadata, arrays) for saving"""
+        return {'kind': 'tfidf', 'vocabulary': self.vocabulary}, {'idf': self.idf}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        return cls(meta['vocabulary'], arrays['idf'])
+
+class ChatbotModel:
+    """A fully fitted model: vectorizer, training data, responses, training matrix and index.
+
+    Never mutated after construction. NLPChatbot retrains by building a new
+    instance and swapping the reference, so a request always sees one
+    consistent model.
+    """
+
+    def __init__(self, vectorizer, training_data, responses, training_matrix, version, counts=None, updates=0):
+        self.vectorizer = vectorizer
+        self.training_data = training_data
+        self.responses = responses
+        self.training_matrix = training_matrix  # L2-normalized TF-IDF rows of the training texts
+        self.index = build_intent_index(training_matrix)  # Nearest-neighbour index over training_matrix
+        self.version = version
+        self.counts = counts  # Raw hashed term counts (incremental models only)
+        self.updates = updates  # Incremental updates since the last full fit
+
+    @property
+    def incremental(self):
+        return isinstance(self.vectorizer, OnlineTfidfVectorizer)
+
+    @classmethod
+    def fit(cls, training_data, responses, version, incremental=False):
+        """Fit a new vectorizer and compute the training matrix in one pass over the corpus"""
+        texts = [item[0] for item in training_data]
+        if incremental:
+            counts = OnlineTfidfVectorizer(LemmaTokenizer()).counts(texts)
+            vectorizer = OnlineTfidfVectorizer(LemmaTokenizer()).updated(counts)
+            return cls(vectorizer, list(training_data), responses, vectorizer.weight(counts), version, counts=counts)
+        vectorizer, matrix = VocabularyTfidfVectorizer.fit_transform(texts)
+        return cls(vectorizer, list(training_data), responses, matrix, version)
+
+    def extended(self, new_data, version):
+        """This model plus new_data, tokenizing only the new phrases (incremental models)"""
+        new_counts = self.vectorizer.counts([item[0] for item in new_data])
+        vectorizer = self.vectorizer.updated(new_counts)
+        counts = sparse.vstack([self.counts, new_counts], format='csr')
+        # IDF moved, so every row is re-weighted; that is one sparse product, no tokenizing
+        return ChatbotModel(
+            vectorizer, self.training_data + list(new_data), self.responses,
+            vectorizer.weight(counts), version, counts=counts, updates=self.updates + 1
+        )
 
 class NLPChatbot:
-    def __init__(self):
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english') + list(string.punctuation))
-        self.vectorizer = TfidfVectorizer(tokenizer=self._lemmatize_text, stop_words='english')
-        self.training_data = []
-        self.model = None
-        self.responses = {}
-        self.model_path = os.path.join(os.path.dirname(__file__), 'chatbot_model.pkl')
-        self.training_data_path = os.path.join(os.path.dirname(__file__), 'training_data.json')
+    def __init__(self, model_dir=None, incremental=None):
+        self.model_dir = model_dir or os.path.dirname(__file__)
+        self.incremental = INCREMENTAL_TRAINING if incremental is None else incremental
+        # chatbot_model.json names the current version; model files are versioned
+        self.pointer_path = os.path.join(self.model_dir, 'chatbot_model.json')
+        self.training_data_path = os.path.join(self.model_dir, 'training_data.json')
+        # Held while a process fits and saves a version, so workers never save the same one
+        self.train_lock_path = os.path.join(self.model_dir, 'train.lock')
+        self._train_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._next_reload_check = 0.0
+        self.intent_cache = IntentCache(INTENT_CACHE_SIZE)
         
         # Load existing model if available
-        if os.path.exists(self.model_path) and os.path.exists(self.training_data_path):
-            self._load_model()
-        else:
-            self._initialize_default_data()
+        with file_lock(self.train_lock_path):
+            model = self._load_model()
+            if model is None:
+                model = self._initialize_default_data()
+                self._save_model(model)
+        self._model = model
+    
+    @property
+    def model(self):
+        """The current ChatbotModel; read it once per request and use that snapshot"""
+        return self._model
     
-    def _lemmatize_text(self, text):
-        tokens = word_tokenize(text.lower())
-        return [self.lemmatizer.lemmatize(token) for token in tokens if token not in self.stop_words]
+    @property
+    def version(self):
+        return self._model.version
+    
+    @property
+    def vectorizer(self):
+        return self._model.vectorizer
+    
+    @property
+    def training_data(self):
+        return self._model.training_data
+    
+    @property
+    def responses(self):
+        return self._model.responses
+    
+    @property
+    def training_matrix(self):
+        return self._model.training_matrix
+    
+    @property
+    def index(self):
+        return self._model.index
+    
+    def model_path(self, version):
+        return os.path.join(self.model_dir, f'chatbot_model.v{version}.json')
+    
+    def arrays_path(self, version):
+        return os.path.join(self.model_dir, f'chatbot_model.v{version}.npz')
     
     def _initialize_default_data(self):
         # Default training data
-        self.training_data = [
+        training_data = [
             ("hello", "greeting"),
             ("hi there", "greeting"),
             ("how are you", "greeting"),
@@ -58,7 +312,7 @@ class NLPChatbot:
             ("how to conduct an interview", "interview_conduct")
         ]
         
-        self.responses = {
+        responses = {
             "greeting": [
                 "Hello! How can I assist you with your recruitment process today?",
                 "Hi there! I'm here to help with your hiring needs. What would you like to know?",
@@ -106,69 +360,206 @@ class NLPChatbot:
             ]
         }
         
-        # Save the default data
-        self._save_model()
+        return ChatbotModel.fit(training_data, responses, version=1, incremental=self.incremental)
     
-    def train(self, new_data=None):
+    def train(self, new_data=None, replace=False, full=False):
         """
         Train or retrain the model with new data
         Format of new_data: [("sample text", "intent"), ...]
+        
+        The new model is fitted and saved off to the side, then swapped in;
+        get_response keeps serving the previous model until then. In
+        incremental mode only new_data is tokenized, unless replace or full
+        is set or CHATBOT_FULL_REFIT_EVERY updates have accumulated. Returns
+        the new model version.
+        
+        Training holds train.lock across processes and starts from the
+        latest saved model, so a version trained by another worker is built
+        on rather than overwritten.
         """
-        if new_data:
-            self.training_data.extend(new_data)
+        new_data = [tuple(item) for item in new_data or []]
+        with self._train_lock, file_lock(self.train_lock_path):
+            current = self._model
+            saved_version = self._saved_version()
+            if saved_version is not None and saved_version > current.version:
+                current = self._load_model() or current
+            version = max(current.version, saved_version or 0) + 1
+            refit_due = FULL_REFIT_EVERY > 0 and current.updates + 1 >= FULL_REFIT_EVERY
+            if self.incremental and current.incremental and new_data and not (replace or full or refit_due):
+                model = current.extended(new_data, version)
+            else:
+                training_data = ([] if replace else list(current.training_data)) + new_data
+                model = ChatbotModel.fit(training_data, current.responses, version, incremental=self.incremental)
+            self._save_model(model)
+            self._model = model
+        return model.version
+    
+    def _save_model(self, model):
+        """Save the model under its version, then point chatbot_model.json at it
+        
+        Each version is a JSON file (training data, responses, vectorizer
+        vocabulary or settings) plus an .npz of plain arrays (IDF or document
+        frequencies and the training rows), so loading unpickles nothing.
+        Incremental models store raw counts, one product away from the matrix.
+        """
+        meta, arrays = model.vectorizer.state()
+        rows = model.counts if model.incremental else model.training_matrix
+        arrays.update(rows_data=rows.data, rows_indices=rows.indices, rows_indptr=rows.indptr,
+                      rows_shape=np.array(rows.shape))
+        _atomic_write(self.arrays_path(model.version), lambda f: np.savez(f, **arrays), mode='wb')
+        _atomic_write(self.model_path(model.version), lambda f: json.dump({
+            'format': MODEL_FORMAT,
+            'version': model.version,
+            'updates': model.updates,
+            'vectorizer': meta,
+            'training_data': model.training_data,
+            'responses': model.responses
+        }, f))
         
-        # Save the updated training data
-        with open(self.training_data_path, 'w') as f:
-            json.dump({
-                'training_data': self.training_data,
-                'responses': self.responses
-            }, f)
+        # Save the training data
+        _atomic_write(self.training_data_path, lambda f: json.dump({
+            'training_data': model.training_data,
+            'responses': model.responses
+        }, f))
+        _atomic_write(self.pointer_path, lambda f: json.dump({'version': model.version}, f))
         
-        # Retrain the model
-        texts = [item[0] for item in self.training_data]
-        self.vectorizer.fit(texts)
-        self._save_model()
-    
-    def _save_model(self):
-        """Save the trained model and data"""
-        with open(self.model_path, 'wb') as f:
-            pickle.dump({
-                'vectorizer': self.vectorizer,
-                'training_data': self.training_data,
-                'responses': self.responses
-            }, f)
+        # Keep the previous version so a process that is mid-load can still read it
+        for old_version in range(model.version - 2, 0, -1):
+            for path in (self.model_path(old_version), self.arrays_path(old_version)):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def _saved_version(self):
+        try:
+            with open(self.pointer_path) as f:
+                return json.load(f)['version']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _refit_saved_training_data(self, version):
+        """Rebuild from training_data.json as version (for models in an older format), or None"""
+        if not os.path.exists(self.training_data_path):
+            return None
+        with open(self.training_data_path) as f:
+            data = json.load(f)
+        training_data = [tuple(item) for item in data['training_data']]
+        model = ChatbotModel.fit(training_data, data['responses'], version, incremental=self.incremental)
+        self._save_model(model)
+        # Pickled models from before MODEL_FORMAT 2 are never loaded; drop them
+        for pattern in ('chatbot_model*.pkl', 'chatbot_matrix.v*.npz', 'chatbot_counts.v*.npz'):
+            for path in glob.glob(os.path.join(self.model_dir, pattern)):
+                os.remove(path)
+        return model
     
     def _load_model(self):
-        """Load the trained model and data"""
-        with open(self.model_path, 'rb') as f:
-            data = pickle.load(f)
-            self.vectorizer = data['vectorizer']
-            self.training_data = data['training_data']
-            self.responses = data['responses']
+        """Load the current saved model, refitting older formats from training_data.json, or None"""
+        version = self._saved_version()
+        try:
+            with open(self.model_path(version)) as f:
+                data = json.load(f)
+            if data.get('format') != MODEL_FORMAT:
+                raise ValueError(f"unsupported model format {data.get('format')}")
+            with np.load(self.arrays_path(version)) as npz:
+                arrays = dict(npz)
+        except (OSError, ValueError, KeyError) as e:
+            if version is not None:
+                print(f"Refitting chatbot model v{version}: {str(e)}")
+            return self._refit_saved_training_data((version or 0) + 1)
+        
+        training_data = [tuple(item) for item in data['training_data']]
+        responses = data['responses']
+        meta = data['vectorizer']
+        rows = sparse.csr_matrix(
+            (arrays['rows_data'], arrays['rows_indices'], arrays['rows_indptr']),
+            shape=tuple(arrays['rows_shape'])
+        )
+        if meta['kind'] == 'hashed':
+            vectorizer = OnlineTfidfVectorizer.from_state(LemmaTokenizer(), meta, arrays)
+            matrix, counts = vectorizer.weight(rows), rows
+        else:
+            vectorizer = VocabularyTfidfVectorizer.from_state(meta, arrays)
+            matrix, counts = rows, None
+        
+        if rows.shape != (len(training_data), vectorizer.n_features) or (meta['kind'] == 'hashed') != self.incremental:
+            # Mismatched arrays or a training-mode switch; rebuild once
+            model = ChatbotModel.fit(training_data, responses, version + 1, incremental=self.incremental)
+            self._save_model(model)
+            return model
+        return ChatbotModel(vectorizer, training_data, responses, matrix, version,
+                            counts=counts, updates=data.get('updates', 0))
+    
+    def reload_if_stale(self):
+        """Pick up a model saved by another process (e.g. another gunicorn worker)"""
+        now = time.monotonic()
+        if now < self._next_reload_check or not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_reload_check = now + MODEL_RELOAD_INTERVAL
+            version = self._saved_version()
+            if version is not None and version > self._model.version:
+                with self._train_lock:
+                    if version > self._model.version:
+                        self._model = self._load_model() or self._model
+        except Exception as e:
+            print(f"Error reloading chatbot model: {str(e)}")
+        finally:
+            self._reload_lock.release()
+    
+    def cache_stats(self):
+        return {'intents': self.intent_cache.stats(), 'tokenizer': tokenizer_cache_info()}
+    
+    def warm_up(self):
+        """Load NLTK, its data and sklearn now rather than on the first message.
+        
+        Worth calling once at boot under `gunicorn --preload`, where forked
+        workers inherit the imports.
+        """
+        self._query_vector('warm up')
+    
+    def _query_vector(self, message, model=None):
+        return l2_normalize((model or self._model).vectorizer.transform([message])).tocsr()
+    
+    def top_matches(self, message, k=5):
+        """The k most similar training phrases with their intents and scores, for debugging"""
+        model = self._model
+        query_vec = self._query_vector(message, model)
+        if query_vec.nnz == 0:
+            return []
+        return [
+            {'text': model.training_data[row][0], 'intent': model.training_data[row][1], 'score': round(score, 4)}
+            for row, score in model.index.search(query_vec, k)
+        ]
+    
+    def _resolve_intent(self, message, model):
+        """The intent of the closest training phrase, or None if nothing is close enough"""
+        # Get the most similar question from training data
+        query_vec = self._query_vector(message, model)
+        matches = model.index.search(query_vec, k=1) if query_vec.nnz else []
+        
+        # If similarity is above threshold, use that phrase's intent
+        if matches and matches[0][1] > 0.6:  # Threshold can be adjusted
+            intent = model.training_data[matches[0][0]][1]
+            if intent in model.responses:
+                return intent
+        return None
     
     def get_response(self, message):
         """Get a response for the given message"""
-        # Vectorize the input
+        self.reload_if_stale()
+        model = self._model
         try:
-            # Get the most similar question from training data
-            query_vec = self.vectorizer.transform([message])
-            train_vecs = self.vectorizer.transform([item[0] for item in self.training_data])
-            
-            # Calculate similarity scores
-            similarity_scores = cosine_similarity(query_vec, train_vecs).flatten()
-            
-            # Get the most similar question's index
-            most_similar_idx = np.argmax(similarity_scores)
-            similarity = similarity_scores[most_similar_idx]
-            
-            # If similarity is above threshold, return the corresponding response
-            if similarity > 0.6:  # Threshold can be adjusted
-                intent = self.training_data[most_similar_idx][1]
-                if intent in self.responses:
-                    return np.random.choice(self.responses[intent])
+            # Repeated phrasings skip all NLP work; the tokenizer lowercases and
+            # splits on whitespace anyway, so resolving the normalized form is equivalent
+            key = normalize_message(message)
+            intent = self.intent_cache.get(model.version, key)
+            if intent is MISS:
+                intent = self._resolve_intent(key, model)
+                self.intent_cache.set(model.version, key, intent)
+            if intent is not None:
+                return np.random.choice(model.responses[intent])
             
             # Default response if no good match found
-            return np.random.choice(self.responses.get('default', ["I'm not sure how to respond to that."]))
+            return np.random.choice(model.responses.get('default', ["I'm not sure how to respond to that."]))
             
         except Exception as e:
             print(f"Error in get_response: {str(e)}")
@@ -181,6 +572,15 @@ def initialize_chatbot():
 
 # For testing
 if __name__ == "__main__":
+    import argparse
+    arg_parser = argparse.ArgumentParser(description='Train the chatbot, or provision its NLTK data')
+    arg_parser.add_argument('--download-nltk', nargs='?', const=NLTK_DATA_DIR, metavar='DIR',
+                            help=f'Download the NLTK data into DIR (default {NLTK_DATA_DIR}) and exit')
+    args = arg_parser.parse_args()
+    if args.download_nltk:
+        download_nltk_data(args.download_nltk)
+        raise SystemExit(0)
+    
     chatbot = NLPChatbot()
     print("Chatbot initialized. Type 'quit' to exit.")
     
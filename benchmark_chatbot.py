@@ -0,0 +1,247 @@
+"""
+Benchmark /api/chat latency against training sets of increasing size.
+
+Trains the NLPChatbot on synthetic phrases (1k, 10k and 100k by default) in
+a temporary model directory, then posts messages to a minimal Flask app that
+serves /api/chat the same way app.py does and reports per-request latency,
+then repeats the messages to show intent cache hits. With --legacy it also
+times the old path that re-transformed every training phrase on each message
+(slow; skipped above --legacy-max phrases). Each size also compares the
+exact and LSH intent indexes: lookup time and how often LSH returns the
+exact top match (recall). With --incremental it times adding --batch phrases
+to each size with incremental training against a full refit, and how often
+both models pick the same intent. With --startup it measures, in fresh
+interpreters, how long importing train.py takes (target: under 200ms),
+loading a saved model of each size and answering the first message (which is
+when sklearn and NLTK get imported). With --tokenizer it times vectorizing
+the queries repeatedly with the memoized tokenizer against uncached
+tokenization, and checks both give the same rows.
+
+    python benchmark_chatbot.py --sizes 1000 10000 100000 --queries 200
+    python benchmark_chatbot.py --incremental --batch 100
+    python benchmark_chatbot.py --startup --sizes 1000 100000
+    python benchmark_chatbot.py --tokenizer --sizes 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import numpy as np
+from scipy import sparse
+from flask import Flask, request, jsonify
+from sklearn.metrics.pairwise import cosine_similarity
+
+NLP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'nlp')
+sys.path.insert(0, NLP_DIR)
+import train
+from train import NLPChatbot
+from intent_index import ExactIntentIndex, LSHIntentIndex, evaluate_recall
+
+WORDS = (
+    "candidate interview resume skills experience salary offer benefits schedule "
+    "feedback onboarding role team manager technical assessment coding review "
+    "python java cloud remote hybrid contract policy deadline reference portfolio "
+    "culture growth promotion training mentor project deliver evaluate hire screen"
+).split()
+
+def synthetic_phrases(n, n_intents=50, seed=13):
+    rng = random.Random(seed)
+    return [
+        (" ".join(rng.sample(WORDS, k=rng.randint(3, 8))), f"intent_{rng.randrange(n_intents)}")
+        for _ in range(n)
+    ]
+
+def make_app(chatbot):
+    app = Flask(__name__)
+
+    @app.route('/api/chat', methods=['POST'])
+    def chat():
+        message = request.get_json().get('message', '').strip()
+        return jsonify({'response': chatbot.get_response(message)})
+
+    return app
+
+def legacy_get_response(chatbot, message):
+    """The original per-request path: transform the whole training set every time"""
+    query_vec = chatbot.vectorizer.transform([message])
+    train_vecs = chatbot.vectorizer.transform([item[0] for item in chatbot.training_data])
+    scores = cosine_similarity(query_vec, train_vecs).flatten()
+    return int(np.argmax(scores))
+
+def uncached_tokens(text):
+    """LemmaTokenizer without its memo caches"""
+    word_tokenize, lemmatizer, stop_words = train._nltk_tools()
+    return [lemmatizer.lemmatize(token) for token in word_tokenize(text.lower()) if token not in stop_words]
+
+def compare_tokenizer(chatbot, queries, passes=5):
+    """Vectorize queries passes times with the memoized and the uncached tokenizer"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    baseline = TfidfVectorizer(
+        tokenizer=uncached_tokens,
+        stop_words='english',
+        vocabulary={term: column for column, term in enumerate(chatbot.vectorizer.vocabulary)}
+    )
+    baseline.idf_ = chatbot.vectorizer.idf
+    timings = {'uncached': [], 'memoized': []}
+    for _ in range(passes):
+        for name, vectorizer in (('uncached', baseline), ('memoized', chatbot.vectorizer)):
+            start = time.perf_counter()
+            rows = vectorizer.transform(queries)
+            timings[name].append((time.perf_counter() - start) * 1000 / len(queries))
+        same = abs(rows - baseline.transform(queries)).max() == 0
+    for name, samples in timings.items():
+        print(f"{'':>7} transform {name:<9} {summarize(samples)} per message")
+    print(f"{'':>7} same rows {same}  caches {train.tokenizer_cache_info()}")
+
+def time_index(index, query_vecs):
+    latencies = []
+    for i in range(query_vecs.shape[0]):
+        start = time.perf_counter()
+        index.search(query_vecs[i], k=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def compare_incremental(size, batch, queries):
+    """Time adding batch phrases to size phrases: incremental update vs full refit"""
+    base, extra = synthetic_phrases(size), synthetic_phrases(batch, seed=size + 1)
+    results = {}
+    for incremental in (True, False):
+        with tempfile.TemporaryDirectory() as model_dir:
+            chatbot = NLPChatbot(model_dir=model_dir, incremental=incremental)
+            chatbot.train(base, replace=True)
+            start = time.perf_counter()
+            chatbot.train(extra)
+            results[incremental] = ((time.perf_counter() - start) * 1000, chatbot)
+    (incremental_ms, incremental_bot), (full_ms, full_bot) = results[True], results[False]
+    # Exact indexes, so only the vectorizers differ; compared by score so ties
+    # between equally similar phrases don't count as misses
+    indexes = [(bot, ExactIntentIndex(bot.training_matrix)) for bot in (incremental_bot, full_bot)]
+    agree = 0
+    for message in queries:
+        incremental_top, full_top = [index.search(bot._query_vector(message), k=1) for bot, index in indexes]
+        agree += [round(score, 6) for _, score in incremental_top] == [round(score, 6) for _, score in full_top]
+    print(f"{size:>7} +{batch} phrases  incremental {incremental_ms:9.1f}ms  full {full_ms:9.1f}ms  "
+          f"top match agreement {agree / len(queries):.3f}")
+
+STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, {nlp_dir!r})
+start = time.perf_counter()
+import train
+imported = time.perf_counter()
+chatbot = train.NLPChatbot(model_dir={model_dir!r})
+loaded = time.perf_counter()
+heavy = [name for name in ('sklearn', 'nltk') if name in sys.modules]
+chatbot.get_response('how to evaluate a candidate')
+answered = time.perf_counter()
+print((imported - start) * 1000, (loaded - imported) * 1000, (answered - loaded) * 1000, ','.join(heavy) or '-')
+"""
+
+def measure_startup(model_dir, runs=5):
+    """Median import, load and first-response times over fresh interpreters"""
+    script = STARTUP_SCRIPT.format(nlp_dir=NLP_DIR, model_dir=model_dir)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+        *timings, heavy = output.split()[-4:]
+        samples.append([float(ms) for ms in timings])
+    import_ms, load_ms, first_ms = (statistics.median(column) for column in zip(*samples))
+    verdict = 'ok' if import_ms < 200 else 'over 200ms target'
+    return f"import {import_ms:7.1f}ms ({verdict})  load {load_ms:7.1f}ms  first response {first_ms:7.1f}ms  " \
+           f"loaded before first message: {heavy}"
+
+def summarize(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"mean {statistics.mean(samples):8.2f}ms  p50 {statistics.median(samples):8.2f}ms  p95 {p95:8.2f}ms"
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    arg_parser.add_argument('--queries', type=int, default=200)
+    arg_parser.add_argument('--legacy', action='store_true', help='Also time the per-request transform path')
+    arg_parser.add_argument('--legacy-max', type=int, default=10000)
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='Compare incremental training against a full refit instead')
+    arg_parser.add_argument('--batch', type=int, default=100)
+    arg_parser.add_argument('--startup', action='store_true',
+                            help='Measure import, model load and first response in fresh interpreters instead')
+    arg_parser.add_argument('--tokenizer', action='store_true',
+                            help='Compare memoized and uncached tokenization instead')
+    args = arg_parser.parse_args()
+
+    if args.startup:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as model_dir:
+                NLPChatbot(model_dir=model_dir).train(synthetic_phrases(size), replace=True)
+                print(f"{size:>7} phrases  {measure_startup(model_dir)}")
+        return
+
+    rng = random.Random(99)
+    queries = [" ".join(rng.sample(WORDS, k=rng.randint(2, 6))) for _ in range(args.queries)]
+
+    if args.tokenizer:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as model_dir:
+                chatbot = NLPChatbot(model_dir=model_dir, incremental=False)
+                chatbot.train(synthetic_phrases(size), replace=True)
+                print(f"{size:>7} phrases")
+                compare_tokenizer(chatbot, queries)
+        return
+
+    if args.incremental:
+        for size in args.sizes:
+            compare_incremental(size, args.batch, queries)
+        return
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as model_dir:
+            chatbot = NLPChatbot(model_dir=model_dir)
+            start = time.perf_counter()
+            chatbot.train(synthetic_phrases(size), replace=True)
+            train_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            NLPChatbot(model_dir=model_dir)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            client = make_app(chatbot).test_client()
+            # The second pass repeats every message, so it is served by the intent cache
+            passes = []
+            for _ in range(2):
+                latencies = []
+                for message in queries:
+                    start = time.perf_counter()
+                    client.post('/api/chat', json={'message': message})
+                    latencies.append((time.perf_counter() - start) * 1000)
+                passes.append(latencies)
+
+            print(f"{size:>7} phrases  train {train_ms:9.1f}ms  load {load_ms:7.1f}ms")
+            print(f"{'':>7} /api/chat       {summarize(passes[0])}")
+            print(f"{'':>7} /api/chat again {summarize(passes[1])}  (intent cache {chatbot.cache_stats()['intents']['hit_rate']})")
+
+            query_vecs = sparse.vstack([chatbot._query_vector(message) for message in queries]).tocsr()
+            exact = ExactIntentIndex(chatbot.training_matrix)
+            start = time.perf_counter()
+            lsh = LSHIntentIndex(chatbot.training_matrix)
+            build_ms = (time.perf_counter() - start) * 1000
+            print(f"{'':>7} index exact     {summarize(time_index(exact, query_vecs))}")
+            print(f"{'':>7} index lsh       {summarize(time_index(lsh, query_vecs))}  (build {build_ms:.1f}ms)")
+            print(f"{'':>7} lsh vs exact    {evaluate_recall(lsh, exact, query_vecs, k=5)}")
+
+            if args.legacy and size <= args.legacy_max:
+                legacy = []
+                for message in queries[:20]:
+                    start = time.perf_counter()
+                    legacy_get_response(chatbot, message)
+                    legacy.append((time.perf_counter() - start) * 1000)
+                print(f"{'':>7} legacy lookup   {summarize(legacy)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+def completion_key(model: str, messages: List[Dict], **params) -> str:
+    """SHA-256 over the model, the messages and every request parameter"""
+    payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SQLiteCompletionCache:
+    """Chat completion replies stored in one SQLite file, shared by every process on the host.
+
+    Any object with get(key) and set(key, value) can stand in for it, e.g.
+    in tests. Reads bump an entry's access time; once the table grows past
+    max_entries the least recently used rows are deleted. Entries older than
+    ttl_seconds (if set) are treated as misses and removed. Hit/miss
+    counters are kept per process.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed_at ON completions (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        """A short-lived connection (safe across threads) that commits on success"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            evicted = conn.execute(
+                "DELETE FROM completions WHERE key IN "
+                "(SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+def init_completion_cache(app) -> SQLiteCompletionCache:
+    """Attach a SQLiteCompletionCache to the app using COMPLETION_CACHE_* config"""
+    cache = SQLiteCompletionCache(
+        app.config.get('COMPLETION_CACHE_PATH') or os.path.join(app.instance_path, 'completion_cache.sqlite3'),
+        max_entries=app.config.get('COMPLETION_CACHE_MAX_ENTRIES', 10000),
+        ttl_seconds=app.config.get('COMPLETION_CACHE_TTL', 7 * 24 * 3600)
+    )
+    app.extensions['completion_cache'] = cache
+    return cache
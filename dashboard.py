@@ -1,110 +1,269 @@
-from flask import Blueprint, render_template, jsonify, request
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import random
+import os
+import hashlib
+from flask import Blueprint, render_template, jsonify, request, current_app, make_response
 import json
-from datetime import datetime, timedelta
 import numpy as np
-from collections import defaultdict
+from sqlalchemy import func
+
+from models import db, Candidate, Application, InterviewFeedback, Skill, resume_skills
+from dashboard_stats import DashboardStats
+from rollups import ATS_SCORE_BUCKETS
+from utils.disk_cache import DiskCache
+
+# Plotly is only needed for the server-rendered charts (DASHBOARD_SERVER_CHARTS)
+try:
+    import plotly.graph_objects as go
+except ImportError:
+    go = None
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-@dashboard_bp.route('/dashboard')
-def dashboard():
-    # Sample data - replace with actual data from your database
-    resume_scores = [random.randint(60, 100) for _ in range(50)]
-    
-    # Enhanced metrics
-    metrics = {
-        'total_applicants': random.randint(100, 500),
-        'shortlisted': random.randint(20, 100),
-        'interviews': random.randint(10, 50),
-        'hired': random.randint(1, 20),
-        'avg_processing_time': f"{random.randint(1, 7)} days",
-        'ats_score': random.randint(60, 95)
-    }
-    
-    # Sentiment analysis data
-    sentiment_data = {
-        'Positive': random.randint(5, 15),
-        'Neutral': random.randint(2, 10),
-        'Negative': random.randint(1, 5)
-    }
-    
-    # Generate hiring trends data
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)
-    date_range = pd.date_range(start_date, end_date, freq='W')
-    trends_data = {
-        'date': date_range,
-        'applications': [random.randint(10, 50) for _ in date_range],
-        'interviews': [random.randint(5, 25) for _ in date_range],
-        'hires': [random.randint(1, 10) for _ in date_range],
-        'rejections': [random.randint(5, 30) for _ in date_range]
-    }
-    
-    # Skill distribution data
-    skills = ['Python', 'JavaScript', 'Java', 'SQL', 'React', 'Node.js', 'AWS', 'Docker']
-    skill_distribution = [random.randint(10, 100) for _ in skills]
-    
-    # Recent activities
-    activities = [
-        {'id': i, 'candidate': f"Candidate {i}", 'action': random.choice(['Applied', 'Screened', 'Interviewed', 'Hired']), 
-         'time': (datetime.now() - timedelta(hours=random.randint(1, 24))).strftime('%H:%M')}
-        for i in range(1, 6)
+# Bump when a create_*_chart function changes so stale chart HTML is never served
+CHART_CACHE_VERSION = 2
+
+# ATS scores (percent) at or above this pass screening; a bucket boundary so pass/fail is exact
+ATS_PASS_THRESHOLD = 60
+
+# Funnel stages with the application statuses that have reached them (later stages included)
+PIPELINE_STAGES = [
+    ('Applied', '#4e73df'),
+    ('Screened', '#36b9cc'),
+    ('Interview', '#1cc88a'),
+    ('Offered', '#f6c23e'),
+    ('Hired', '#e74a3b')
+]
+STATUS_STAGE = {
+    'in_review': 1, 'screening': 1,
+    'interview': 2, 'interview_scheduled': 2, 'interviewed': 2,
+    'offered': 3, 'offer_sent': 3, 'offer_accepted': 3,
+    'hired': 4
+}
+
+# InterviewFeedback.recommendation -> sentiment shown on the dashboard
+RECOMMENDATION_SENTIMENT = {
+    'strong_yes': 'Positive', 'yes': 'Positive',
+    'no_hire': 'Negative', 'strong_no_hire': 'Negative'
+}
+
+@dashboard_bp.record_once
+def init_chart_cache(state):
+    """Attach the rendered-chart cache to the app using CHART_CACHE_* config"""
+    app = state.app
+    app.extensions['chart_cache'] = DiskCache(
+        app.config.get('CHART_CACHE_DIR') or os.path.join(app.instance_path, 'chart_cache'),
+        max_entries=app.config.get('CHART_CACHE_MAX_ENTRIES', 200),
+        ttl_seconds=app.config.get('CHART_CACHE_TTL', 300)
+    )
+
+def _jsonable(value):
+    # numpy scalars/arrays; anything else (datetimes) as text
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def data_fingerprint(*data) -> str:
+    """Stable SHA-256 of the inputs a chart or page is rendered from"""
+    payload = json.dumps(data, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def chart_cache_key(chart_type: str, *data) -> str:
+    return f"{chart_type}-v{CHART_CACHE_VERSION}-{data_fingerprint(*data)[:32]}"
+
+def cached_chart(key: str, builder, *data) -> str:
+    """Rendered chart HTML for key, building it with builder(*data) on a miss"""
+    cache = current_app.extensions.get('chart_cache')
+    if cache is None:
+        return builder(*data)
+    html = cache.get(key)
+    if html is None:
+        html = builder(*data)
+        cache.set(key, html)
+    return html
+
+def dashboard_data(now=None):
+    """Everything the HR dashboard shows, from the rollup tables and a few small queries.
+
+    The page and /dashboard/api/charts are both built from this, so the
+    numbers in the cards and the charts always agree. Nothing here depends on
+    the time of the request beyond the month window, so unchanged data gives
+    the same chart cache keys and ETags.
+    """
+    stats = DashboardStats(now=now).collect()
+    
+    top_candidates = Candidate.query.filter(Candidate.ats_score.isnot(None))\
+                                    .order_by(Candidate.ats_score.desc(), Candidate.id)\
+                                    .limit(5).all()
+    candidates = [
+        {
+            'name': f"{c.first_name} {c.last_name}",
+            'score': int(round((c.ats_score or 0) * 100)),
+            'status': (c.status or '').replace('_', ' ').title(),
+            'applied': c.created_at.strftime('%Y-%m-%d') if c.created_at else ''
+        }
+        for c in top_candidates
     ]
     
-    # Pipeline stages
-    pipeline = [
-        {'stage': 'Applied', 'count': metrics['total_applicants'], 'color': '#4e73df'},
-        {'stage': 'Screened', 'count': metrics['shortlisted'], 'color': '#36b9cc'},
-        {'stage': 'Interview', 'count': metrics['interviews'], 'color': '#1cc88a'},
-        {'stage': 'Offered', 'count': random.randint(5, 15), 'color': '#f6c23e'},
-        {'stage': 'Hired', 'count': metrics['hired'], 'color': '#e74a3b'}
+    recent = Application.query.options(db.joinedload(Application.candidate))\
+                              .order_by(Application.updated_at.desc(), Application.id.desc())\
+                              .limit(5).all()
+    activities = [
+        {
+            'id': a.id,
+            'candidate': f"{a.candidate.first_name} {a.candidate.last_name}",
+            'action': (a.status or '').replace('_', ' ').title(),
+            'time': a.updated_at.strftime('%b %d %H:%M') if a.updated_at else ''
+        }
+        for a in recent
     ]
     
-    # Generate top candidates data
-    candidates = [
-        {'name': 'John Doe', 'score': 92, 'status': 'Interview Scheduled', 'applied': (end_date - timedelta(days=5)).strftime('%Y-%m-%d')},
-        {'name': 'Jane Smith', 'score': 88, 'status': 'Offer Sent', 'applied': (end_date - timedelta(days=10)).strftime('%Y-%m-%d')},
-        {'name': 'Robert Johnson', 'score': 85, 'status': 'New Application', 'applied': (end_date - timedelta(days=1)).strftime('%Y-%m-%d')},
-        {'name': 'Emily Davis', 'score': 82, 'status': 'Interviewed', 'applied': (end_date - timedelta(days=7)).strftime('%Y-%m-%d')},
-        {'name': 'Michael Brown', 'score': 79, 'status': 'Screening', 'applied': (end_date - timedelta(days=3)).strftime('%Y-%m-%d')},
-    ]
+    sentiment_data = {'Positive': 0, 'Neutral': 0, 'Negative': 0}
+    for recommendation, count in db.session.query(InterviewFeedback.recommendation, func.count(InterviewFeedback.id))\
+                                           .group_by(InterviewFeedback.recommendation).all():
+        sentiment_data[RECOMMENDATION_SENTIMENT.get(recommendation, 'Neutral')] += count
+    
+    resumes = func.count(resume_skills.c.resume_id)
+    skill_counts = db.session.query(Skill.name, resumes)\
+                             .join(resume_skills, resume_skills.c.skill_id == Skill.id)\
+                             .group_by(Skill.id, Skill.name)\
+                             .order_by(resumes.desc(), Skill.name)\
+                             .limit(8).all()
+    
+    return dict(
+        stats=stats,
+        candidates=candidates,
+        activities=activities,
+        sentiment_data=sentiment_data,
+        skills=[name for name, _ in skill_counts],
+        skill_distribution=[count for _, count in skill_counts]
+    )
+
+def resume_score_series(score_distribution, mean, threshold=ATS_PASS_THRESHOLD):
+    """ATS score buckets plus mean and pass/fail counts for the score chart"""
+    labels = [label for label, _, _ in ATS_SCORE_BUCKETS]
+    counts = [int(score_distribution.get(label, 0)) for label in labels]
+    passed = sum(count for (_, lower, _), count in zip(ATS_SCORE_BUCKETS, counts)
+                 if lower is not None and lower * 100 >= threshold)
+    return {
+        'labels': labels,
+        'counts': counts,
+        'mean': mean,
+        'threshold': threshold,
+        'pass': passed,
+        'fail': sum(counts) - passed
+    }
+
+def sentiment_series(sentiment_data):
+    labels = ['Positive', 'Neutral', 'Negative']
+    values = [sentiment_data.get(label, 0) for label in labels]
+    return {'labels': labels, 'values': values, 'total': sum(values)}
+
+def skill_distribution_series(skills, distribution):
+    """Skills ordered by candidate count, highest first (ties by name)"""
+    counts = np.asarray(distribution, dtype=int)
+    order = np.lexsort((np.asarray(skills), -counts)) if len(skills) else []
+    return {'skills': [skills[i] for i in order], 'counts': counts[order].tolist()}
+
+def pipeline_series(status_counts):
+    """Funnel counts: applications that have reached each PIPELINE_STAGES stage"""
+    reached = np.zeros(len(PIPELINE_STAGES), dtype=float)
+    for status, count in status_counts.items():
+        stage = STATUS_STAGE.get(status.lower().replace(' ', '_'), 0)
+        reached[:stage + 1] += count
+    total = reached[0]
+    conversion = np.round(reached / total * 100, 1) if total else np.zeros_like(reached)
+    return {
+        'stages': [stage for stage, _ in PIPELINE_STAGES],
+        'counts': reached.astype(int).tolist(),
+        'colors': [color for _, color in PIPELINE_STAGES],
+        'conversion': conversion.tolist()
+    }
+
+def hiring_trends_series(monthly_hires):
+    return {'dates': list(monthly_hires), 'hires': [int(count) for count in monthly_hires.values()]}
+
+# Chart type -> function turning dashboard_data() into that chart's series
+CHART_SERIES = {
+    'resume_score': lambda data: resume_score_series(data['stats']['score_distribution'], data['stats']['avg_ats_score']),
+    'sentiment': lambda data: sentiment_series(data['sentiment_data']),
+    'hiring_trends': lambda data: hiring_trends_series(data['stats']['hiring_trends']),
+    'skill_distribution': lambda data: skill_distribution_series(data['skills'], data['skill_distribution']),
+    'pipeline': lambda data: pipeline_series(data['stats']['status_counts'])
+}
+
+# Template variable -> chart type, for the server-rendered charts
+SERVER_CHARTS = {
+    'resume_chart': 'resume_score',
+    'sentiment_chart': 'sentiment',
+    'hiring_trends_chart': 'hiring_trends',
+    'skill_chart': 'skill_distribution',
+    'pipeline_chart': 'pipeline'
+}
+
+def _conditional_json(payload):
+    response = jsonify(payload)
+    response.set_etag(data_fingerprint(payload))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+@dashboard_bp.route('/dashboard/api/charts')
+def chart_data():
+    """Series data for every dashboard chart; the browser renders them (static/js/analytics.js)"""
+    data = dashboard_data()
+    return _conditional_json({chart_type: series(data) for chart_type, series in CHART_SERIES.items()})
+
+@dashboard_bp.route('/dashboard/api/charts/<chart_type>')
+def chart_data_for(chart_type):
+    series = CHART_SERIES.get(chart_type)
+    if series is None:
+        return jsonify({'error': f'Unknown chart type: {chart_type}'}), 404
+    return _conditional_json(series(dashboard_data()))
+
+@dashboard_bp.route('/dashboard')
+def dashboard():
+    """HR dashboard: rollup counts, top candidates, recent activity and charts"""
+    data = dashboard_data()
+    sentiment_total = sum(data['sentiment_data'].values())
+    context = dict(
+        data['stats'],
+        candidates=data['candidates'],
+        activities=data['activities'],
+        sentiment_data=data['sentiment_data'],
+        sentiment_total=sentiment_total or 1  # Avoid division by zero
+    )
     
-    # Create visualizations
-    resume_chart = create_resume_score_chart(resume_scores)
-    sentiment_chart = create_sentiment_chart(sentiment_data)
-    hiring_trends = create_hiring_trends_chart(trends_data)
-    
-    # Skill distribution chart
-    skill_chart = create_skill_distribution_chart(skills, skill_distribution)
-    
-    # Pipeline chart
-    pipeline_chart = create_pipeline_chart(pipeline)
-    
-    return render_template('dashboard.html',
-                         metrics=metrics,
-                         activities=activities,
-                         pipeline=pipeline,
-                         resume_chart=resume_chart,
-                         sentiment_chart=sentiment_chart,
-                         hiring_trends=hiring_trends,
-                         skill_chart=skill_chart,
-                         pipeline_chart=pipeline_chart,
-                         candidates=candidates,
-                         sentiment_data=sentiment_data)
-
-def create_resume_score_chart(scores):
-    # Create histogram of resume scores with dark theme
+    # Charts are drawn in the browser from /dashboard/api/charts unless
+    # DASHBOARD_SERVER_CHARTS asks for the server-rendered Plotly HTML
+    series = {}
+    if current_app.config.get('DASHBOARD_SERVER_CHARTS', False) and go is not None:
+        series = {name: CHART_SERIES[chart_type](data) for name, chart_type in SERVER_CHARTS.items()}
+    chart_keys = {name: chart_cache_key(SERVER_CHARTS[name], series[name]) for name in series}
+    
+    # The page is a pure function of its inputs, so a matching ETag means the
+    # browser's copy is current and nothing needs rendering at all
+    etag = data_fingerprint(context, chart_keys)
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    
+    # Create visualizations (served from the chart cache when the data is unchanged)
+    for name in series:
+        context[name] = cached_chart(chart_keys[name], CHART_BUILDERS[SERVER_CHARTS[name]], series[name])
+    
+    response = make_response(render_template('dashboard.html', **context))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def create_resume_score_chart(series):
+    # Create histogram of ATS score buckets (resume_score_series) with dark theme
     fig = go.Figure()
     
-    # Calculate score distribution
-    hist, bin_edges = np.histogram(scores, bins=10, range=(0, 100))
-    
-    # Create custom bin labels
-    bin_labels = [f"{int(bin_edges[i])}-{int(bin_edges[i+1])}" for i in range(len(bin_edges)-1)]
+    hist = series['counts']
+    bin_labels = series['labels']
+    # Vertical markers sit on the categorical axis at bucket index positions
+    bin_width = 100 / len(bin_labels)
     
     # Add histogram trace with gradient colors
     colors = ['#4e73df' if x < max(hist) else '#1cc88a' for x in hist]
@@ -125,12 +284,11 @@ def create_resume_score_chart(scores):
         width=0.8
     ))
     
-    # Add mean and median lines
-    mean_score = np.mean(scores)
-    median_score = np.median(scores)
+    # Add mean line
+    mean_score = series['mean']
     
     fig.add_vline(
-        x=mean_score/10 - 0.5,  # Adjust position for categorical x-axis
+        x=mean_score/bin_width - 0.5,  # Adjust position for categorical x-axis
         line_dash='dash',
         line_color='#e74a3b',
         annotation_text=f'Mean: {mean_score:.1f}',
@@ -139,20 +297,10 @@ def create_resume_score_chart(scores):
         annotation_bgcolor='rgba(255,255,255,0.9)'
     )
     
+    # Add pass/fail threshold
+    threshold = series['threshold']
     fig.add_vline(
-        x=median_score/10 - 0.5,  # Adjust position for categorical x-axis
-        line_dash='dot',
-        line_color='#36b9cc',
-        annotation_text=f'Median: {median_score:.1f}',
-        annotation_position='top left',
-        annotation_font_size=12,
-        annotation_bgcolor='rgba(255,255,255,0.9)'
-    )
-    
-    # Add pass/fail threshold (e.g., 70%)
-    threshold = 70
-    fig.add_vline(
-        x=threshold/10 - 0.5,  # Adjust position for categorical x-axis
+        x=threshold/bin_width - 0.5,  # Adjust position for categorical x-axis
         line_dash='dash',
         line_color='#1cc88a',
         annotation_text=f'Pass: {threshold}%',
@@ -162,8 +310,8 @@ def create_resume_score_chart(scores):
     )
     
     # Add pass/fail summary
-    pass_count = sum(1 for s in scores if s >= threshold)
-    fail_count = len(scores) - pass_count
+    pass_count = series['pass']
+    fail_count = series['fail']
     
     fig.add_annotation(
         x=0.5,
@@ -243,10 +391,10 @@ def create_resume_score_chart(scores):
         'modeBarButtonsToRemove': ['select2d', 'lasso2d']
     })
 
-def create_sentiment_chart(sentiment_data):
-    # Create pie chart for sentiment analysis with dark theme
-    labels = ['Positive', 'Neutral', 'Negative']
-    values = [sentiment_data.get(label, 0) for label in labels]
+def create_sentiment_chart(series):
+    # Create pie chart for sentiment analysis (sentiment_series) with dark theme
+    labels = series['labels']
+    values = series['values']
     
     # Define colors and hover text
     colors = ['#1cc88a', '#f6c23e', '#e74a3b']
@@ -281,7 +429,7 @@ def create_sentiment_chart(sentiment_data):
     )])
     
     # Add center text with total count
-    total = sum(values)
+    total = series['total']
     fig.add_annotation(
         text=f"{total}<br>Total",
         x=0.5,
@@ -334,16 +482,16 @@ def create_sentiment_chart(sentiment_data):
         'displayModeBar': False
     })
 
-def create_skill_distribution_chart(skills, distribution):
-    """Create a horizontal bar chart for skill distribution with dark theme."""
+def create_skill_distribution_chart(series):
+    """Create a horizontal bar chart for skill distribution (skill_distribution_series) with dark theme."""
     # Set dark theme colors
     bg_color = '#1a1a1a'
     grid_color = '#2d2d2d'
     text_color = '#f8f9fa'
     
-    # Sort skills by distribution for better visualization
-    sorted_skills = [x for _, x in sorted(zip(distribution, skills), reverse=True)]
-    sorted_dist = sorted(distribution, reverse=True)
+    # Already sorted by count, highest first
+    sorted_skills = series['skills']
+    sorted_dist = series['counts']
     
     # Create a horizontal bar chart
     fig = go.Figure(go.Bar(
@@ -399,20 +547,19 @@ def create_skill_distribution_chart(skills, distribution):
     
     return fig.to_html(full_html=False, include_plotlyjs='cdn', config={'displayModeBar': False})
 
-def create_pipeline_chart(pipeline_data):
-    """Create a funnel chart for recruitment pipeline with dark theme."""
+def create_pipeline_chart(series):
+    """Create a funnel chart for recruitment pipeline (pipeline_series) with dark theme."""
     # Set dark theme colors
     bg_color = '#1a1a1a'
     text_color = '#f8f9fa'
     
     # Extract data from pipeline
-    stages = [stage['stage'] for stage in pipeline_data]
-    counts = [stage['count'] for stage in pipeline_data]
-    colors = [stage['color'] for stage in pipeline_data]
+    stages = series['stages']
+    counts = series['counts']
+    colors = series['colors']
     
-    # Calculate conversion rates
-    total = counts[0] if counts else 0
-    conversion_rates = [f"{count} ({(count/total*100):.1f}%)" for count in counts]
+    # Conversion rates from the first stage
+    conversion_rates = [f"{count} ({rate:.1f}%)" for count, rate in zip(counts, series['conversion'])]
     
     # Create funnel chart
     fig = go.Figure()
@@ -466,9 +613,8 @@ def create_pipeline_chart(pipeline_data):
     
     return fig.to_html(full_html=False, include_plotlyjs='cdn', config={'displayModeBar': False})
 
-def create_hiring_trends_chart(trends_data):
-    # Create line chart for hiring trends with dark theme
-    df = pd.DataFrame(trends_data)
+def create_hiring_trends_chart(series):
+    # Create line chart of hires per month (hiring_trends_series) with dark theme
     
     # Set dark theme colors
     bg_color = '#1a1a1a'
@@ -477,57 +623,25 @@ def create_hiring_trends_chart(trends_data):
     
     fig = go.Figure()
     
-    # Add traces with more visible styling
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['applications'],
-        mode='lines+markers',
-        name='Applications',
-        line=dict(color='#4e73df', width=3),
-        marker=dict(size=8, symbol='circle')
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['interviews'],
-        mode='lines+markers',
-        name='Interviews',
-        line=dict(color='#1cc88a', width=3, dash='dash'),
-        marker=dict(size=8, symbol='diamond')
-    ))
-    
     fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['hires'],
+        x=series['dates'],
+        y=series['hires'],
         mode='lines+markers',
         name='Hires',
-        line=dict(color='#36b9cc', width=3, dash='dot'),
+        line=dict(color='#36b9cc', width=3),
         marker=dict(size=10, symbol='star')
     ))
     
-    # Add rejection rate as a line chart if rejections data is available
-    if 'rejections' in df.columns:
-        rejection_rate = [r/(a+0.001)*100 for a, r in zip(df['applications'], df['rejections'])]
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=rejection_rate,
-            mode='lines',
-            name='Rejection Rate %',
-            line=dict(color='#e74a3b', width=2, dash='dot'),
-            yaxis='y2',
-            opacity=0.7
-        ))
-    
-    # Update layout with dark theme and dual y-axes
+    # Update layout with dark theme
     fig.update_layout(
         title=dict(
-            text='Hiring Trends & Rejection Rate (Last 3 Months)',
+            text='Hires per Month (Last 6 Months)',
             x=0.5,
             xanchor='center',
             font=dict(size=16, family='Inter', color=text_color)
         ),
         xaxis=dict(
-            title='Date',
+            title='Month',
             title_font=dict(size=12, family='Inter'),
             tickfont=dict(size=11, family='Inter'),
             gridcolor=grid_color,
@@ -537,7 +651,7 @@ def create_hiring_trends_chart(trends_data):
             mirror=True
         ),
         yaxis=dict(
-            title='Count',
+            title='Hires',
             title_font=dict(size=12, family='Inter'),
             tickfont=dict(size=11, family='Inter'),
             gridcolor=grid_color,
@@ -547,16 +661,6 @@ def create_hiring_trends_chart(trends_data):
             zerolinecolor='#444',
             showgrid=True
         ),
-        yaxis2=dict(
-            title='Rejection Rate (%)',
-            overlaying='y',
-            side='right',
-            range=[0, 100],
-            showgrid=False,
-            showline=True,
-            linewidth=1,
-            linecolor='#e74a3b'
-        ),
         hovermode='x unified',
         template='plotly_white',
         margin=dict(l=50, r=60, t=80, b=60),
@@ -580,4 +684,13 @@ def create_hiring_trends_chart(trends_data):
         )
     )
     
-    return fig.to_html(full_html=False, config={'displayModeBar': False})
\ No newline at end of file
+    return fig.to_html(full_html=False, config={'displayModeBar': False})
+
+# Chart type -> function rendering its series as Plotly HTML
+CHART_BUILDERS = {
+    'resume_score': create_resume_score_chart,
+    'sentiment': create_sentiment_chart,
+    'hiring_trends': create_hiring_trends_chart,
+    'skill_distribution': create_skill_distribution_chart,
+    'pipeline': create_pipeline_chart
+}
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from models import db, RollupCounter, DailyHireRollup
+from rollups import ATS_SCORE_BUCKETS
+
+def month_starts(now: datetime, months: int) -> List[datetime]:
+    """First day of each of the last `months` calendar months, oldest first"""
+    starts = []
+    year, month = now.year, now.month
+    for _ in range(months):
+        starts.append(datetime(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return starts[::-1]
+
+def next_month(start: datetime) -> datetime:
+    return datetime(start.year + 1, 1, 1) if start.month == 12 else datetime(start.year, start.month + 1, 1)
+
+class DashboardStats:
+    """Aggregates behind the HR dashboard, read from the rollup tables.
+
+    rollups.py keeps RollupCounter and DailyHireRollup current on every write,
+    so a dashboard view costs two queries whose size depends on the number of
+    buckets rather than the number of candidates or applications.
+    """
+
+    def __init__(self, now: Optional[datetime] = None, months: int = 6):
+        self.now = now or datetime.now()
+        self.months = months
+
+    def counters(self) -> Dict[Tuple[str, str], float]:
+        return {(c.metric, c.bucket): c.value for c in RollupCounter.query.all()}
+
+    def _month_key(self, column):
+        """Dialect-specific YYYY-MM truncation of a datetime column"""
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            return func.to_char(func.date_trunc('month', column), 'YYYY-MM')
+        if dialect == 'mysql':
+            return func.date_format(column, '%Y-%m')
+        return func.strftime('%Y-%m', column)
+
+    def monthly_hires(self) -> Dict[str, int]:
+        """Hires per month over the window, keyed by 'Mon YYYY'"""
+        starts = month_starts(self.now, self.months)
+        month_key = self._month_key(DailyHireRollup.day)
+        counts = dict(
+            db.session.query(month_key, func.sum(DailyHireRollup.hires))
+                      .filter(
+                          DailyHireRollup.day >= starts[0].date(),
+                          DailyHireRollup.day < next_month(starts[-1]).date()
+                      )
+                      .group_by(month_key)
+                      .all()
+        )
+        return {start.strftime('%b %Y'): int(counts.get(start.strftime('%Y-%m')) or 0) for start in starts}
+
+    def collect(self) -> Dict:
+        """Everything hr_dashboard renders apart from recent activity and top candidates"""
+        counters = self.counters()
+        status_counts = {
+            bucket: int(value) for (metric, bucket), value in counters.items()
+            if metric == 'application_status' and value
+        }
+        total_applications = sum(status_counts.values())
+        hired_count = status_counts.get('hired', 0)
+        scored = counters.get(('candidates', 'scored'), 0)
+        avg_score = counters.get(('candidates', 'ats_score_sum'), 0) / scored if scored else 0
+
+        return {
+            'total_candidates': int(counters.get(('candidates', 'total'), 0)),
+            'total_applications': total_applications,
+            'interviews_scheduled': status_counts.get('interview_scheduled', 0),
+            'jobs_posted': int(counters.get(('job_postings', 'active'), 0)),
+            'avg_ats_score': round(avg_score * 100, 1),
+            'hiring_rate': round((hired_count / total_applications * 100), 1) if total_applications > 0 else 0,
+            'status_counts': {
+                status.replace('_', ' ').title(): count
+                for status, count in status_counts.items()
+            },
+            'score_distribution': {
+                label: int(counters.get(('ats_score', label), 0))
+                for label, _, _ in ATS_SCORE_BUCKETS
+            },
+            'hiring_trends': self.monthly_hires()
+        }
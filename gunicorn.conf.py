@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for SmartHire AI.
+
+The app is imported once in the master process and workers are forked from it,
+so the spaCy model loaded below is shared copy-on-write by every worker instead
+of being loaded again on each worker's first resume upload.
+"""
+
+import os
+
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threads keep a worker serving other requests while it streams an AI interview question
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+def when_ready(server):
+    """Warm the resume parser in the master before workers are forked"""
+    if os.environ.get('PRELOAD_RESUME_PARSER', '1') != '1':
+        return
+    from resume_parser import get_resume_parser, parser_stats
+    get_resume_parser()
+    server.log.info(f"Resume parser preloaded: {parser_stats()}")
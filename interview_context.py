@@ -0,0 +1,130 @@
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Counts fall back to a characters-per-token estimate
+    tiktoken = None
+
+# Token budget for the conversation turns sent with each prompt; older turns are folded into a summary
+INTERVIEW_CONTEXT_TOKENS = int(os.getenv("INTERVIEW_CONTEXT_TOKENS", 1500))
+
+# Token cap for the resume digest sent in place of the full parsed resume
+RESUME_DIGEST_TOKENS = int(os.getenv("RESUME_DIGEST_TOKENS", 300))
+
+# Per-message framing tokens in the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 3
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Tokens in text, exact with tiktoken installed, otherwise about 4 characters per token"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoding(model).encode(text))
+    return len(text) // 4 + 1
+
+def count_message_tokens(messages: List[Dict], model: str = "gpt-4") -> int:
+    """Prompt tokens for a list of chat messages, including the chat format's framing"""
+    return sum(count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS for message in messages) + MESSAGE_OVERHEAD_TOKENS
+
+def clip_to_tokens(text: str, max_tokens: int, model: str = "gpt-4") -> str:
+    """text cut down to at most max_tokens tokens"""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    if tiktoken is not None:
+        encoding = _encoding(model)
+        return encoding.decode(encoding.encode(text)[:max_tokens])
+    return text[:max(0, max_tokens - 1) * 4]
+
+def resume_digest(resume_data: Dict, max_tokens: int = None, model: str = "gpt-4") -> str:
+    """A few lines of skills, roles and education from parsed resume data
+
+    The raw text and contact details are left out; only what the interviewer
+    asks about is kept, clipped to max_tokens.
+    """
+    lines = []
+    skills = resume_data.get("skills") or []
+    if skills:
+        lines.append("Skills: " + ", ".join(str(skill) for skill in skills))
+    for job in resume_data.get("experience") or []:
+        if isinstance(job, dict):
+            role = " at ".join(str(job[key]) for key in ("title", "company") if job.get(key))
+            dates = "-".join(str(job[key]) for key in ("start_date", "end_date") if job.get(key))
+            lines.append(f"Experience: {role} ({dates})" if dates else f"Experience: {role}")
+        else:
+            lines.append(f"Experience: {job}")
+    for school in resume_data.get("education") or []:
+        if isinstance(school, dict):
+            lines.append("Education: " + ", ".join(str(school[key]) for key in ("degree", "institution", "year") if school.get(key)))
+        else:
+            lines.append(f"Education: {school}")
+    digest = "\n".join(lines)
+    return clip_to_tokens(digest, max_tokens or RESUME_DIGEST_TOKENS, model)
+
+def format_turns(turns: List[Dict]) -> str:
+    return "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+
+class InterviewContext:
+    """The slice of an interview's conversation that is sent with each prompt.
+
+    The full transcript stays in the interviewer's conversation_history; this
+    only tracks a running summary and how many of its turns the summary
+    covers. Once the turns after that point exceed max_tokens, the oldest
+    are folded into the summary by summarize(previous_summary, turns_text),
+    oldest first, until the rest fit in half the budget, so a summary call is
+    made every few turns rather than on every question. Each summary call
+    only sees the previous summary and the turns being folded, so its cost
+    stays bounded however long the interview runs.
+    """
+
+    def __init__(self, summarize: Callable[[str, str], str], max_tokens: int = None, model: str = "gpt-4"):
+        self.summarize = summarize
+        self.max_tokens = max_tokens or INTERVIEW_CONTEXT_TOKENS
+        self.model = model
+        self.summary = ""
+        self.summarized_turns = 0
+
+    def _fold(self, history: List[Dict]):
+        recent = history[self.summarized_turns:]
+        sizes = [count_tokens(turn["content"], self.model) + MESSAGE_OVERHEAD_TOKENS for turn in recent]
+        if sum(sizes) <= self.max_tokens:
+            return
+        # Keep the newest turns within half the budget; always keep the last one verbatim
+        folded, remaining = 0, sum(sizes)
+        while folded < len(recent) - 1 and remaining > self.max_tokens // 2:
+            remaining -= sizes[folded]
+            folded += 1
+        try:
+            self.summary = self.summarize(self.summary, format_turns(recent[:folded])).strip()
+        except Exception as e:
+            # Drop the turns anyway so the prompt stays within its budget
+            print(f"Error summarizing interview turns: {str(e)}")
+        self.summarized_turns += folded
+
+    def messages(self, history: List[Dict]) -> List[Dict]:
+        """The running summary (as a system message) followed by the recent turns of history"""
+        self._fold(history)
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the interview so far: {self.summary}"})
+        return messages + history[self.summarized_turns:]
+
+    def transcript(self, history: List[Dict]) -> str:
+        """The running summary and recent turns as one block of text, for summary and skills prompts"""
+        self._fold(history)
+        recent = format_turns(history[self.summarized_turns:])
+        if self.summary:
+            return f"Summary of earlier turns: {self.summary}\n\n{recent}"
+        return recent
+
+    def reset(self):
+        self.summary = ""
+        self.summarized_turns = 0
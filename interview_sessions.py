@@ -0,0 +1,95 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from models import db, AIConversation, AIMessage
+
+# AIConversation.title of AI interviews, so other conversations are left alone
+AI_INTERVIEW_TITLE = 'AI Interview'
+
+class InterviewSessions:
+    """Per-candidate AIInterviewers whose conversations live in AIConversation/AIMessage rows.
+
+    The rows are the shared state: save() writes each new question and
+    answer as an AIMessage, and get() brings an interviewer up to date with
+    its conversation's rows, so any gunicorn worker can serve the next turn.
+    A worker keeps at most max_sessions interviewers in memory, dropping the
+    least recently used first and any unused for idle_seconds; a dropped one
+    is rebuilt from the rows on its next request.
+    """
+
+    def __init__(self, factory: Callable, max_sessions: int = 100, idle_seconds: float = 1800):
+        self.factory = factory  # candidate_id -> new AIInterviewer with the job and resume set
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions = OrderedDict()  # candidate_id -> session dict, least recently used first
+        self._lock = threading.Lock()
+
+    def _conversation_id(self, candidate_id) -> int:
+        # The earliest AI interview conversation, so workers that race to create one all settle on the same row
+        query = AIConversation.query.filter_by(candidate_id=candidate_id, title=AI_INTERVIEW_TITLE)\
+                                    .order_by(AIConversation.id)
+        conversation = query.first()
+        if conversation is None:
+            db.session.add(AIConversation(candidate_id=candidate_id, title=AI_INTERVIEW_TITLE))
+            db.session.commit()
+            conversation = query.first()
+        return conversation.id
+
+    def _evict(self, now):
+        # Caller holds self._lock
+        for candidate_id in [cid for cid, session in self._sessions.items() if now - session['used'] > self.idle_seconds]:
+            del self._sessions[candidate_id]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def get(self, candidate_id):
+        """The candidate's AIInterviewer, its conversation_history matching the saved messages"""
+        conversation_id = self._conversation_id(candidate_id)
+        saved = AIMessage.query.filter_by(conversation_id=conversation_id).count()
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.pop(candidate_id, None)
+        if session is None or session['conversation_id'] != conversation_id:
+            session = {'interviewer': self.factory(candidate_id), 'conversation_id': conversation_id, 'saved': 0}
+
+        interviewer = session['interviewer']
+        if saved != session['saved'] or len(interviewer.conversation_history) != saved:
+            # Another worker saved turns (or this one was just built); reload them
+            messages = AIMessage.query.filter_by(conversation_id=conversation_id).order_by(AIMessage.id).all()
+            history = [{'role': message.role, 'content': message.content} for message in messages]
+            known = interviewer.conversation_history
+            if history[:len(known)] != known:
+                interviewer.context.reset()  # Its summary covers turns that are not in the rows
+            interviewer.conversation_history = history
+            session['saved'] = len(history)
+
+        session['used'] = now
+        with self._lock:
+            self._sessions[candidate_id] = session
+            self._evict(now)
+        return interviewer
+
+    def save(self, candidate_id):
+        """Write the turns the candidate's interviewer added since get() as AIMessages"""
+        with self._lock:
+            session = self._sessions.get(candidate_id)
+        if session is None:
+            return
+        new_turns = session['interviewer'].conversation_history[session['saved']:]
+        for turn in new_turns:
+            db.session.add(AIMessage(conversation_id=session['conversation_id'], role=turn['role'], content=turn['content']))
+        db.session.commit()
+        session['saved'] += len(new_turns)
+
+def init_interview_sessions(app, factory: Callable) -> InterviewSessions:
+    """Attach InterviewSessions to the app using AI_INTERVIEW_SESSIONS_* config"""
+    sessions = InterviewSessions(
+        factory,
+        max_sessions=app.config.get('AI_INTERVIEW_SESSIONS_MAX', 100),
+        idle_seconds=app.config.get('AI_INTERVIEW_SESSIONS_IDLE', 1800)
+    )
+    app.extensions['ai_interview_sessions'] = sessions
+    return sessions
@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import numpy as np
+from scipy import sparse
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Skill taxonomy: canonical names, categories and aliases (e.g. "k8s" -> Kubernetes)
+SKILL_TAXONOMY_PATH = os.environ.get(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+)
+
+def load_skill_taxonomy(path: Optional[str] = None) -> List[Dict]:
+    """Load the skill taxonomy as a list of {name, category, aliases} entries"""
+    with open(path or SKILL_TAXONOMY_PATH, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+_TAXONOMY = load_skill_taxonomy()
+
+# Skills matched between resumes and job descriptions: the taxonomy's canonical names
+REQUIRED_SKILLS = sorted(entry['name'] for entry in _TAXONOMY)
+SKILL_INDEX = {skill: i for i, skill in enumerate(REQUIRED_SKILLS)}
+
+# Lowercased name or alias -> canonical name
+_CANONICAL_NAMES = {
+    term.lower(): entry['name']
+    for entry in _TAXONOMY
+    for term in [entry['name']] + list(entry.get('aliases', []))
+}
+
+# Every name and alias as whole words (so "JS" in "Node.js" doesn't count),
+# longest first so "Ruby on Rails" wins over "Ruby" like the resume parser's
+# filter_spans; case_sensitive entries ("Go", "React") only match as written
+_TERMS = sorted(
+    ((term, entry.get('case_sensitive', False)) for entry in _TAXONOMY for term in [entry['name']] + list(entry.get('aliases', []))),
+    key=lambda item: -len(item[0])
+)
+_EXACT_NAMES = {term: entry['name'] for entry in _TAXONOMY if entry.get('case_sensitive')
+                for term in [entry['name']] + list(entry.get('aliases', []))}
+_SKILL_PATTERN = re.compile(
+    r'(?<![\w.])(?:' + '|'.join(re.escape(term) if exact else f"(?i:{re.escape(term)})" for term, exact in _TERMS) + r')(?!\w)'
+)
+
+# Bump when the skill vocabulary or the seniority rules change so stored
+# JobPosting skill indexes get recompiled by the backfill command
+SKILL_INDEX_VERSION = 2
+
+# Seniority keywords checked against the job title/description
+SENIORITY_KEYWORDS = {
+    'junior': 1,
+    'mid-level': 2,
+    'senior': 3,
+    'lead': 4,
+    'principal': 5,
+    'architect': 5
+}
+
+# Years of experience that count as a full experience match at each seniority level
+SENIORITY_YEARS = {1: 1, 2: 3, 3: 5, 4: 8, 5: 10}
+DEFAULT_SENIORITY_LEVEL = 2
+
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+
+def _field(resume: Any, name: str):
+    """Read a field from a ResumeData or a parsed_data dict"""
+    if isinstance(resume, dict):
+        return resume.get(name)
+    return getattr(resume, name, None)
+
+def canonical_skill(name: str) -> Optional[str]:
+    """The taxonomy name for a skill or alias in any case ("gcp" -> "Google Cloud"), or None"""
+    return _CANONICAL_NAMES.get(" ".join((name or '').split()).lower())
+
+def canonical_skills(names: Iterable[str]) -> set:
+    """Canonical names of the known skills among names; unknown ones are dropped"""
+    return {skill for skill in (canonical_skill(name) for name in names or []) if skill}
+
+def job_skill_set(job_description: str) -> set:
+    """Skills (canonical names) whose name or an alias appears in the job description"""
+    return {_EXACT_NAMES.get(term) or _CANONICAL_NAMES[term.lower()]
+            for term in _SKILL_PATTERN.findall(job_description or '')}
+
+def job_seniority_level(job_title: str, job_description: str) -> int:
+    """Seniority level implied by the job title/description (defaults to mid-level)"""
+    text = f"{job_title or ''} {job_description or ''}".lower()
+    for keyword, level in SENIORITY_KEYWORDS.items():
+        if keyword in text:
+            return level
+    return DEFAULT_SENIORITY_LEVEL
+
+def experience_years(experience: List[Dict]) -> int:
+    """Total years found in each experience entry's duration"""
+    exp_years = 0
+    for exp in experience or []:
+        if 'duration' in exp:
+            # Try to extract years from duration (simplified)
+            years = re.findall(r'\d+', exp['duration'])
+            if years:
+                exp_years += int(years[0])
+    return exp_years
+
+def experience_match(experience: List[Dict], seniority_level: Optional[int] = None) -> float:
+    """0-100 experience score: the candidate's years against those expected at the job's seniority"""
+    if not experience:
+        return 0
+    expected = SENIORITY_YEARS[seniority_level or DEFAULT_SENIORITY_LEVEL]
+    return min(experience_years(experience) / expected * 100, 100)
+
+def skill_matrix(skill_sets: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+    """Binary (rows x REQUIRED_SKILLS) matrix; skills outside the taxonomy are dropped"""
+    rows, cols = [], []
+    for row, skills in enumerate(skill_sets):
+        for col in {SKILL_INDEX[skill] for skill in canonical_skills(skills)}:
+            rows.append(row)
+            cols.append(col)
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(skill_sets), len(REQUIRED_SKILLS)))
+
+class MatchScores:
+    """Scores for every resume x job pair, as produced by score_matrix"""
+
+    def __init__(self, resume_matrix, job_matrix, experience, scores, has_description):
+        self.resume_matrix = resume_matrix
+        self.job_matrix = job_matrix
+        self.experience = experience
+        self.scores = scores
+        self.has_description = has_description
+
+    def _row_skills(self, matrix, i) -> set:
+        return set(matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]])
+
+    def matched_skills(self, i: int, j: int) -> List[str]:
+        cols = self._row_skills(self.resume_matrix, i) & self._row_skills(self.job_matrix, j)
+        return [REQUIRED_SKILLS[c] for c in sorted(cols)]
+
+    def missing_skills(self, i: int, j: int) -> List[str]:
+        cols = self._row_skills(self.job_matrix, j) - self._row_skills(self.resume_matrix, i)
+        return [REQUIRED_SKILLS[c] for c in sorted(cols)]
+
+    def result(self, i: int, j: int) -> Dict[str, Any]:
+        """Same shape as app.calculate_match_score for one resume/job pair"""
+        if not self.has_description[j]:
+            return {'score': 0, 'matched_skills': [], 'missing_skills': [], 'experience_match': 0}
+        return {
+            'score': round(float(self.scores[i, j]), 1),
+            'matched_skills': self.matched_skills(i, j),
+            'missing_skills': self.missing_skills(i, j),
+            'experience_match': round(float(self.experience[i, j]), 1)
+        }
+
+    def top_resumes(self, j: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Indices and scores of the k best resumes for job j, best first"""
+        column = self.scores[:, j]
+        k = min(k, len(column))
+        if k == 0:
+            return []
+        top = np.argpartition(-column, k - 1)[:k]
+        top = top[np.argsort(-column[top], kind='stable')]
+        return [(int(i), float(column[i])) for i in top]
+
+def score_matrix(resumes: Sequence[Any], job_descriptions: Sequence[str],
+                 job_skill_sets: Optional[Sequence[Iterable[str]]] = None,
+                 seniority_levels: Optional[Sequence[int]] = None) -> MatchScores:
+    """Score N resumes against M job descriptions in one pass.
+
+    Resumes and jobs become binary skill matrices over REQUIRED_SKILLS, so the
+    matched-skill counts for every pair are a single sparse product. The
+    result matches calculate_match_score pair by pair. Pass job_skill_sets
+    and seniority_levels (e.g. from JobPosting.job_skills/job_seniority) to
+    skip scanning the descriptions.
+    """
+    if job_skill_sets is None:
+        job_skill_sets = [job_skill_set(d) for d in job_descriptions]
+    if seniority_levels is None:
+        seniority_levels = [job_seniority_level('', d) for d in job_descriptions]
+    resume_matrix = skill_matrix([_field(r, 'skills') for r in resumes])
+    job_matrix = skill_matrix(job_skill_sets)
+
+    years = np.array([experience_years(_field(r, 'experience')) for r in resumes], dtype=np.float64)
+    expected = np.array([SENIORITY_YEARS[level or DEFAULT_SENIORITY_LEVEL] for level in seniority_levels], dtype=np.float64)
+    experience = np.minimum(years[:, None] / expected[None, :] * 100, 100)
+
+    matched = (resume_matrix @ job_matrix.T).toarray()
+    job_counts = np.asarray(job_matrix.sum(axis=1)).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skill_match = np.where(job_counts > 0, matched / job_counts * 100, 0.0)
+
+    scores = skill_match * SKILL_WEIGHT + experience * EXPERIENCE_WEIGHT
+    # An empty job description scores zero across the board
+    has_description = np.array([bool(d) for d in job_descriptions], dtype=bool)
+    scores[:, ~has_description] = 0
+    return MatchScores(resume_matrix, job_matrix, experience, scores, has_description)
+
+def score_job_postings(resumes: Sequence[Any], jobs: Sequence[Any]) -> MatchScores:
+    """score_matrix against JobPosting rows, reading their precompiled skill index"""
+    return score_matrix(
+        resumes,
+        [job.description for job in jobs],
+        [job.job_skills() for job in jobs],
+        [job.job_seniority() for job in jobs]
+    )
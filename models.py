@@ -1,7 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from matching import job_skill_set, job_seniority_level, SKILL_INDEX, SKILL_INDEX_VERSION
+
 db = SQLAlchemy()
 
 class User(db.Model):
@@ -69,7 +72,7 @@ class Resume(db.Model):
     __tablename__ = 'resumes'
     
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.id'), nullable=False, index=True)
     file_path = db.Column(db.String(500), nullable=False)
     file_name = db.Column(db.String(255), nullable=False)
     file_type = db.Column(db.String(50), nullable=False)
@@ -93,7 +96,9 @@ class Skill(db.Model):
 resume_skills = db.Table('resume_skills',
     db.Column('resume_id', db.Integer, db.ForeignKey('resumes.id'), primary_key=True),
     db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
-    db.Column('relevance', db.Float, default=0.0)  # How relevant is this skill to the job
+    db.Column('relevance', db.Float, default=0.0),  # How relevant is this skill to the job
+    # Inverted index for skill search: skill -> resumes, filterable by relevance
+    db.Index('ix_resume_skills_skill_relevance', 'skill_id', 'relevance', 'resume_id')
 )
 
 class Experience(db.Model):
@@ -132,8 +137,70 @@ class JobPosting(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Precompiled skill index (kept in sync by compile_skill_index on insert/update)
+    required_skills = db.Column(db.JSON, nullable=True)  # Canonical taxonomy skills (matching.REQUIRED_SKILLS) found in the posting
+    keyword_vector = db.Column(db.JSON, nullable=True)  # Sorted REQUIRED_SKILLS column indices of required_skills
+    seniority_level = db.Column(db.Integer, nullable=True, index=True)  # 1 (junior) - 5 (principal/architect)
+    skill_index_version = db.Column(db.Integer, nullable=True, index=True)  # Stale when != SKILL_INDEX_VERSION
+    
     # Relationships
     applications = db.relationship('Application', backref='job_posting', lazy=True)
+    
+    @property
+    def full_description(self):
+        """Description and requirements, the text skills are matched against"""
+        return f"{self.description or ''}\n{self.requirements or ''}"
+    
+    def compile_skill_index(self):
+        """Derive the required skills, keyword vector and seniority from the posting text"""
+        skills = job_skill_set(self.full_description)
+        self.required_skills = sorted(skills)
+        self.keyword_vector = sorted(SKILL_INDEX[skill] for skill in skills)
+        self.seniority_level = job_seniority_level(self.title, self.full_description)
+        self.skill_index_version = SKILL_INDEX_VERSION
+    
+    def job_skills(self):
+        """Required skills, from the stored index when it is current"""
+        if self.skill_index_version == SKILL_INDEX_VERSION and self.required_skills is not None:
+            return set(self.required_skills)
+        return job_skill_set(self.full_description)
+    
+    def job_seniority(self):
+        """Seniority level scoring compares experience against, from the stored index when it is current"""
+        if self.skill_index_version == SKILL_INDEX_VERSION and self.seniority_level is not None:
+            return self.seniority_level
+        return job_seniority_level(self.title, self.full_description)
+
+@event.listens_for(JobPosting, 'before_insert')
+@event.listens_for(JobPosting, 'before_update')
+def _compile_job_posting_index(mapper, connection, target):
+    target.compile_skill_index()
+
+def add_missing_columns(model):
+    """ALTER model's existing table to add the nullable columns and indexes it lacks.
+
+    create_all never alters a table that already exists, so columns added to
+    a model later (such as JobPosting's skill index) reach deployed databases
+    through this. Returns the names of the columns added.
+    """
+    table = model.__table__
+    existing = {column['name'] for column in inspect(db.engine).get_columns(table.name)}
+    preparer = db.engine.dialect.identifier_preparer
+    added = []
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                raise RuntimeError(f"{table.name}.{column.name} is NOT NULL and needs a real migration")
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+            added.append(column.name)
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    return added
 
 class Application(db.Model):
     __tablename__ = 'applications'
@@ -249,3 +316,19 @@ class AIMessage(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     message_metadata = db.Column('metadata', db.JSON, nullable=True)  # Additional metadata like tokens, model used, etc.
+
+class RollupCounter(db.Model):
+    """Precomputed dashboard counter, kept current by the hooks in rollups.py"""
+    __tablename__ = 'rollup_counters'
+    
+    metric = db.Column(db.String(50), primary_key=True)  # application_status, ats_score, candidates, job_postings
+    bucket = db.Column(db.String(50), primary_key=True)  # status name, score bucket label, total, etc.
+    value = db.Column(db.Float, nullable=False, default=0.0)  # A count, or a running sum for averages
+
+class DailyHireRollup(db.Model):
+    """Hired applications per job posting per day (of Application.updated_at)"""
+    __tablename__ = 'daily_hire_rollups'
+    
+    job_posting_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True, index=True)
+    hires = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,74 @@
+import os
+import time
+import hashlib
+from dataclasses import asdict
+from typing import Dict, Optional
+from flask import current_app
+
+from resume_parser import ResumeData, PARSER_VERSION, SPACY_MODEL, get_resume_parser
+from utils.disk_cache import DiskCache
+
+class ResumeParseCache:
+    """Cache of parsed resumes keyed by the SHA-256 of the uploaded file.
+
+    The same resume is often uploaded through several routes; hashing the
+    bytes is far cheaper than PDF extraction plus spaCy, so repeat uploads
+    are served from disk. Keys include PARSER_VERSION and the spaCy model
+    name, so results from older extraction logic are never returned.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 1000):
+        self.store = DiskCache(directory, max_entries=max_entries)
+
+    @staticmethod
+    def file_digest(file_path: str) -> str:
+        """SHA-256 of the file contents, read in chunks"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key_for(self, file_path: str) -> str:
+        return f"{self.file_digest(file_path)}-v{PARSER_VERSION}-{SPACY_MODEL}"
+
+    def get(self, file_path: str) -> Optional[ResumeData]:
+        data = self.store.get(self.key_for(file_path))
+        return ResumeData(**data) if data is not None else None
+
+    def parse(self, file_path: str, parser=None) -> ResumeData:
+        """Return the cached parse for this file, parsing and storing it on a miss"""
+        key = self.key_for(file_path)
+        data = self.store.get(key)
+        if data is not None:
+            return ResumeData(**data)
+
+        resume_data = (parser or get_resume_parser()).parse_resume(file_path)
+        # parse_resume returns an empty ResumeData on failure; don't cache those
+        if resume_data.raw_text:
+            self.store.set(key, asdict(resume_data))
+        return resume_data
+
+    def stats(self) -> Dict:
+        return self.store.stats()
+
+def init_parse_cache(app) -> ResumeParseCache:
+    """Attach a ResumeParseCache to the app using PARSE_CACHE_* config"""
+    cache = ResumeParseCache(
+        app.config.get('PARSE_CACHE_DIR') or os.path.join(app.instance_path, 'parse_cache'),
+        max_entries=app.config.get('PARSE_CACHE_MAX_ENTRIES', 1000)
+    )
+    app.extensions['resume_parse_cache'] = cache
+    return cache
+
+def parse_resume_file(file_path: str) -> ResumeData:
+    """Parse a resume through the app's parse cache and log how long it took"""
+    cache = current_app.extensions['resume_parse_cache']
+    hits = cache.store.hits
+    start = time.perf_counter()
+    resume_data = cache.parse(file_path)
+    current_app.logger.info(
+        f"Parsed resume {os.path.basename(file_path)} in {(time.perf_counter() - start) * 1000:.1f}ms "
+        f"({'cache hit' if cache.store.hits > hits else 'cache miss'}; {cache.stats()})"
+    )
+    return resume_data
@@ -0,0 +1,419 @@
+import os
+import re
+import json
+import math
+import heapq
+import shutil
+import time
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+from scipy import sparse
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from models import Resume
+from utils.file_lock import file_lock
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the to was were will with
+you your we our they their this these those i me my he she his her them who what which
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping skill-style tokens like c++, c# and node.js whole"""
+    return [t for t in TOKEN_PATTERN.findall((text or '').lower()) if t not in STOP_WORDS]
+
+def resume_search_text(parsed_data: Dict) -> str:
+    """Text to index for a resume: raw_text when available, else its structured fields"""
+    parsed_data = parsed_data or {}
+    if parsed_data.get('raw_text'):
+        return parsed_data['raw_text']
+    parts = list(parsed_data.get('skills') or [])
+    for exp in parsed_data.get('experience') or []:
+        parts.extend(str(v) for v in exp.values())
+    for edu in parsed_data.get('education') or []:
+        parts.extend(str(v) for v in edu.values())
+    return "\n".join(parts)
+
+class BM25Index:
+    """Okapi BM25 ranking over resume text, stored as sparse postings.
+
+    The committed part of the index is a document x term matrix in CSC form,
+    i.e. one contiguous postings list per term, which is what scoring reads.
+    Saved indexes are loaded with memory-mapped arrays, so a restarted worker
+    can serve queries straight away and workers share pages via the OS cache.
+
+    New documents go into an in-memory delta segment and are searchable
+    immediately; once it holds merge_threshold documents it is folded into
+    the committed matrix. Re-adding or removing a doc_id hides the older copy
+    and withdraws its terms from the document frequencies at once, so IDF
+    matches a fresh build; the copy itself is dropped at the next merge.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, merge_threshold: int = 1000):
+        self.k1 = k1
+        self.b = b
+        self.merge_threshold = merge_threshold
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_ids: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._deleted = set()
+        # Committed segment
+        self._postings = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self._doc_lengths = np.zeros(0, dtype=np.float32)
+        self._doc_freq: List[int] = []
+        self._committed_rows = None  # CSR copy of _postings (doc -> terms), built on the first removal
+        # Delta segment: term id -> [(doc position, tf)]
+        self._delta_postings = defaultdict(list)
+        self._delta_lengths: List[float] = []
+        self._delta_terms: Dict[int, List[int]] = {}  # doc position -> term ids
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_ids) - len(self._deleted)
+
+    def add(self, doc_id: Hashable, text: str):
+        """Index (or re-index) one document"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            if doc_id in self._positions:
+                self._forget(self._positions[doc_id])
+            position = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self._positions[doc_id] = position
+            self._delta_lengths.append(float(sum(counts.values())))
+
+            for term, tf in counts.items():
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = self.vocabulary[term] = len(self.vocabulary)
+                    self._doc_freq.append(0)
+                self._doc_freq[term_id] += 1
+                self._delta_postings[term_id].append((position, float(tf)))
+            self._delta_terms[position] = [self.vocabulary[term] for term in counts]
+
+            if len(self._delta_lengths) >= self.merge_threshold:
+                self.merge()
+
+    def add_many(self, documents: Iterable[Tuple[Hashable, str]]):
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: Hashable):
+        with self._lock:
+            position = self._positions.pop(doc_id, None)
+            if position is not None:
+                self._forget(position)
+
+    def _term_ids(self, position: int):
+        if position in self._delta_terms:
+            return self._delta_terms[position]
+        if self._committed_rows is None:
+            self._committed_rows = self._postings.tocsr()
+        rows = self._committed_rows
+        return rows.indices[rows.indptr[position]:rows.indptr[position + 1]]
+
+    def _forget(self, position: int):
+        # Caller holds the lock; hides the document and takes it out of the document frequencies
+        self._deleted.add(position)
+        for term_id in self._term_ids(position):
+            self._doc_freq[term_id] -= 1
+
+    def _doc_lengths_all(self) -> np.ndarray:
+        if not self._delta_lengths:
+            return self._doc_lengths
+        return np.concatenate([self._doc_lengths, np.asarray(self._delta_lengths, dtype=np.float32)])
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Return the top-k (doc_id, score) pairs for the query, best first"""
+        with self._lock:
+            terms = Counter(t for t in tokenize(query) if t in self.vocabulary)
+            n_docs = len(self)
+            if not terms or n_docs == 0 or k <= 0:
+                return []
+
+            doc_lengths = self._doc_lengths_all()
+            live_lengths = doc_lengths.sum() - sum(doc_lengths[p] for p in self._deleted)
+            avg_length = max(live_lengths / n_docs, 1.0)
+            length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / avg_length)
+
+            scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+            n_committed_terms = self._postings.shape[1]
+            for term, query_tf in terms.items():
+                term_id = self.vocabulary[term]
+                df = self._doc_freq[term_id]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                if term_id < n_committed_terms:
+                    start, end = self._postings.indptr[term_id], self._postings.indptr[term_id + 1]
+                    docs = self._postings.indices[start:end]
+                    tf = self._postings.data[start:end]
+                    scores[docs] += query_tf * idf * tf * (self.k1 + 1) / (tf + length_norm[docs])
+                for position, tf in self._delta_postings.get(term_id, ()):
+                    scores[position] += query_tf * idf * tf * (self.k1 + 1) / (tf + length_norm[position])
+
+            if self._deleted:
+                scores[list(self._deleted)] = 0
+            candidates = np.flatnonzero(scores)
+            # Heap-based partial sort: O(n log k) instead of sorting every match
+            top = heapq.nlargest(k, candidates, key=scores.__getitem__)
+            return [(self.doc_ids[p], float(scores[p])) for p in top]
+
+    def merge(self):
+        """Fold the delta segment into the committed postings and drop deleted docs"""
+        with self._lock:
+            if not self._delta_lengths and not self._deleted:
+                return
+            committed = self._postings.tocoo()
+            rows = [committed.row]
+            cols = [committed.col]
+            data = [committed.data]
+            for term_id, postings in self._delta_postings.items():
+                if postings:
+                    positions, tfs = zip(*postings)
+                    rows.append(np.asarray(positions, dtype=np.int64))
+                    cols.append(np.full(len(positions), term_id, dtype=np.int64))
+                    data.append(np.asarray(tfs, dtype=np.float32))
+
+            doc_lengths = self._doc_lengths_all()
+            keep = np.ones(len(self.doc_ids), dtype=bool)
+            keep[list(self._deleted)] = False
+            new_positions = np.cumsum(keep) - 1
+
+            rows = np.concatenate(rows).astype(np.int64)
+            cols = np.concatenate(cols).astype(np.int64)
+            data = np.concatenate(data).astype(np.float32)
+            live = keep[rows]
+            postings = sparse.csc_matrix(
+                (data[live], (new_positions[rows[live]], cols[live])),
+                shape=(int(keep.sum()), len(self.vocabulary)),
+                dtype=np.float32
+            )
+            postings.sort_indices()
+
+            self._postings = postings
+            self._doc_lengths = doc_lengths[keep].astype(np.float32)
+            self._doc_freq = np.diff(postings.indptr).tolist()
+            self.doc_ids = [doc_id for doc_id, kept in zip(self.doc_ids, keep) if kept]
+            self._positions = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+            self._deleted = set()
+            self._delta_postings = defaultdict(list)
+            self._delta_lengths = []
+            self._delta_terms = {}
+            self._committed_rows = None
+
+    def save(self, directory: str):
+        """Merge and write the index; the directory is swapped in atomically"""
+        with self._lock:
+            self.merge()
+            tmp_dir = f"{directory}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            np.save(os.path.join(tmp_dir, 'data.npy'), self._postings.data)
+            np.save(os.path.join(tmp_dir, 'indices.npy'), self._postings.indices)
+            np.save(os.path.join(tmp_dir, 'indptr.npy'), self._postings.indptr)
+            np.save(os.path.join(tmp_dir, 'doc_lengths.npy'), self._doc_lengths)
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({
+                    'k1': self.k1,
+                    'b': self.b,
+                    'shape': list(self._postings.shape),
+                    'vocabulary': self.vocabulary,
+                    'doc_ids': self.doc_ids
+                }, f)
+
+            # Open memory maps keep reading the old files after the swap
+            old_dir = f"{directory}.old"
+            shutil.rmtree(old_dir, ignore_errors=True)
+            if os.path.exists(directory):
+                os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True, merge_threshold: int = 1000) -> 'BM25Index':
+        """Load a saved index; postings are memory-mapped unless mmap=False"""
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in ('data', 'indices', 'indptr', 'doc_lengths')
+        }
+
+        index = cls(k1=meta['k1'], b=meta['b'], merge_threshold=merge_threshold)
+        index.vocabulary = meta['vocabulary']
+        index.doc_ids = meta['doc_ids']
+        index._positions = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        index._postings = sparse.csc_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=tuple(meta['shape']),
+            copy=False
+        )
+        index._doc_lengths = arrays['doc_lengths']
+        index._doc_freq = np.diff(arrays['indptr']).tolist()
+        return index
+
+    @classmethod
+    def open(cls, directory: str, **kwargs) -> 'BM25Index':
+        """Load the index in directory, or start an empty one if none is saved yet"""
+        if os.path.exists(os.path.join(directory, 'meta.json')):
+            return cls.load(directory, **kwargs)
+        return cls(merge_threshold=kwargs.get('merge_threshold', 1000))
+
+class SharedRankingIndex:
+    """The app's BM25Index, kept in step with the copy saved on disk.
+
+    Every gunicorn worker holds its own index. Documents added in a worker
+    are searchable there at once and are saved save_interval seconds later
+    by a background timer. Saving takes a file lock and first reloads the
+    saved index if another worker has changed it, so no worker overwrites
+    another's documents. Searches check the saved copy's mtime every
+    reload_interval seconds and reload it when it has changed, re-applying
+    any of this worker's changes that are not saved yet.
+    """
+
+    def __init__(self, directory: str, save_interval: float = 30.0, reload_interval: float = 5.0):
+        self.directory = directory
+        self.save_interval = save_interval
+        self.reload_interval = reload_interval
+        self.index = BM25Index.open(directory)
+        self._saved_mtime = self._disk_mtime()
+        self._last_check = time.monotonic()
+        self._pending: Dict[Hashable, Optional[str]] = {}  # doc_id -> text, or None for a removal
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.index)
+
+    def _disk_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(self.directory, 'meta.json')).st_mtime_ns
+        except OSError:
+            return None
+
+    def _apply(self, index: BM25Index, changes: Dict[Hashable, Optional[str]]):
+        for doc_id, text in changes.items():
+            if text is None:
+                index.remove(doc_id)
+            else:
+                index.add(doc_id, text)
+
+    def _reload(self, mtime: Optional[int]):
+        index = BM25Index.open(self.directory)
+        self._apply(index, self._pending)
+        self.index = index
+        self._saved_mtime = mtime
+
+    def update(self, add: Optional[Dict[Hashable, str]] = None, remove: Iterable[Hashable] = ()):
+        """Index the documents in add (doc_id -> text), drop those in remove, and schedule a save"""
+        changes = {doc_id: None for doc_id in remove}
+        changes.update(add or {})
+        if not changes:
+            return
+        with self._lock:
+            self._apply(self.index, changes)
+            self._pending.update(changes)
+            # A timer inherited from the pre-fork master never runs in a worker
+            if self._timer is None or not self._timer.is_alive():
+                self._timer = threading.Timer(self.save_interval, self.save)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Hashable, float]]:
+        now = time.monotonic()
+        if now - self._last_check >= self.reload_interval:
+            self._last_check = now
+            mtime = self._disk_mtime()
+            if mtime != self._saved_mtime:
+                with self._lock:
+                    try:
+                        self._reload(mtime)
+                    except (OSError, ValueError) as e:  # Caught mid-save; retried at the next check
+                        print(f"Error reloading ranking index: {str(e)}")
+        return self.index.search(query, k)
+
+    def save(self):
+        """Write this worker's pending changes, merged with whatever other workers have saved"""
+        with file_lock(f"{self.directory}.lock"), self._lock:
+            self._timer = None
+            if not self._pending:
+                return
+            try:
+                mtime = self._disk_mtime()
+                if mtime != self._saved_mtime:
+                    self._reload(mtime)
+                self.index.save(self.directory)
+            except (OSError, ValueError) as e:  # Pending changes stay queued for the next save
+                print(f"Error saving ranking index: {str(e)}")
+                return
+            self._saved_mtime = self._disk_mtime()
+            self._pending = {}
+
+    def replace(self, index: BM25Index):
+        """Save a freshly built index over the current one (other workers pick it up on reload)"""
+        with file_lock(f"{self.directory}.lock"), self._lock:
+            index.save(self.directory)
+            self.index = index
+            self._saved_mtime = self._disk_mtime()
+            self._pending = {}
+
+def _queue_resume(connection, target):
+    """Note a written resume for the ranking index; it is indexed once the transaction commits"""
+    session = object_session(target)
+    if session is None or not target.parsed_data:
+        return
+    # Only each candidate's latest resume is ranked, as in build-ranking-index
+    resume_ids = connection.execute(
+        select(Resume.id).where(Resume.candidate_id == target.candidate_id)
+        .order_by(Resume.created_at.desc(), Resume.id.desc())
+    ).scalars().all()
+    if resume_ids and resume_ids[0] != target.id:
+        return
+    queued = session.info.setdefault('ranking_index_updates', {'add': {}, 'remove': set()})
+    queued['add'][target.id] = resume_search_text(target.parsed_data)
+    queued['remove'].update(resume_ids[1:])
+
+def _after_insert(mapper, connection, target):
+    _queue_resume(connection, target)
+
+def _after_update(mapper, connection, target):
+    if inspect(target).attrs.parsed_data.history.has_changes():
+        _queue_resume(connection, target)
+
+event.listen(Resume, 'after_insert', _after_insert)
+event.listen(Resume, 'after_update', _after_update)
+
+@event.listens_for(Session, 'after_commit')
+def _index_committed_resumes(session):
+    queued = session.info.pop('ranking_index_updates', None)
+    if not queued or not has_app_context():
+        return
+    index = current_app.extensions.get('ranking_index')
+    if index is not None:
+        index.update(queued['add'], queued['remove'] - set(queued['add']))
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_queued_resumes(session):
+    session.info.pop('ranking_index_updates', None)
+
+def init_ranking_index(app) -> SharedRankingIndex:
+    """Open the saved ranking index (RANKING_INDEX_DIR) and attach it to the app
+
+    Resumes are added to it as they are committed, so new uploads are
+    searchable without running build-ranking-index.
+    """
+    directory = app.config.get('RANKING_INDEX_DIR') or os.path.join(app.instance_path, 'ranking_index')
+    index = SharedRankingIndex(
+        directory,
+        save_interval=app.config.get('RANKING_INDEX_SAVE_INTERVAL', 30.0),
+        reload_interval=app.config.get('RANKING_INDEX_RELOAD_INTERVAL', 5.0)
+    )
+    app.extensions['ranking_index'] = index
+    return index
@@ -1,13 +1,25 @@
 import os
 import re
+import sys
 import json
+import time
+import argparse
+import threading
 import mimetypes
+from io import BytesIO
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
 import spacy
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
 import PyPDF2
 import docx
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple, Iterable, Iterator
 from dataclasses import dataclass, asdict
 
+# The taxonomy lives with the matcher, which must import without spaCy
+from matching import SKILL_TAXONOMY_PATH, load_skill_taxonomy
+
 # Try to use python-magic-bin if available, otherwise fall back to file extensions
 try:
     import magic
@@ -15,14 +27,40 @@ try:
 except (ImportError, OSError):
     USE_MAGIC = False
 
-# Load the English language model for spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading language model for the spaCy (en_core_web_sm)...")
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# Bump whenever extraction logic or the skill taxonomy changes, so cached
+# parse results from older versions are ignored
+PARSER_VERSION = "4"
+
+# English language model for spaCy, loaded lazily once per process
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+
+# Name extraction only needs NER (and the tok2vec layer it listens to) and skill
+# extraction only needs tokens, so the rest of the pipeline is never loaded.
+UNUSED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+_nlp = None
+_nlp_load_seconds = None
+_resume_parser = None
+_registry_lock = threading.Lock()
+
+def load_nlp():
+    """Load the spaCy model on first use and reuse it for the life of the process"""
+    global _nlp, _nlp_load_seconds
+    if _nlp is None:
+        with _registry_lock:
+            if _nlp is None:
+                start = time.perf_counter()
+                try:
+                    nlp = spacy.load(SPACY_MODEL, exclude=UNUSED_PIPES)
+                except OSError:
+                    print(f"Downloading language model for the spaCy ({SPACY_MODEL})...")
+                    from spacy.cli import download
+                    download(SPACY_MODEL)
+                    nlp = spacy.load(SPACY_MODEL, exclude=UNUSED_PIPES)
+                _nlp_load_seconds = time.perf_counter() - start
+                print(f"Loaded spaCy model {SPACY_MODEL} ({', '.join(nlp.pipe_names)}) in {_nlp_load_seconds:.2f}s")
+                _nlp = nlp
+    return _nlp
 
 @dataclass
 class ResumeData:
@@ -35,36 +73,135 @@ class ResumeData:
     education: List[Dict] = None
     raw_text: str = ""
 
+
+# PDF extraction budgets: files larger than PDF_PARALLEL_MIN_BYTES are
+# extracted in parallel (judged by size, so the parent never parses them), and
+# the page/char limits stop a 200-page upload from tying up a worker
+PDF_PARALLEL_MIN_BYTES = int(os.environ.get("PDF_PARALLEL_MIN_BYTES", 512 * 1024))
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 40))
+PDF_MAX_CHARS = int(os.environ.get("PDF_MAX_CHARS", 200000))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_PAGES_PER_TASK = 4
+
+_pdf_pool = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Worker pool for page-parallel PDF extraction, created on first use
+
+    Workers are spawned, not forked: the pool is created inside threaded
+    gunicorn workers, and a forked child can inherit locks held by other
+    threads and deadlock on them.
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _registry_lock:
+            if _pdf_pool is None:
+                _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=get_context('spawn'))
+    return _pdf_pool
+
+# The last PDF a pool worker parsed, as ((path, mtime, size), reader)
+_worker_pdf = (None, None)
+
+def _worker_pdf_reader(file_path: str) -> PyPDF2.PdfReader:
+    """The parsed PDF for file_path, reused across the page ranges one worker is given"""
+    global _worker_pdf
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    if _worker_pdf[0] != key:
+        with open(file_path, 'rb') as file:
+            _worker_pdf = (key, PyPDF2.PdfReader(BytesIO(file.read())))
+    return _worker_pdf[1]
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> Tuple[int, List[str]]:
+    """(page count, text of pages [start, stop)) of a PDF (runs in a pool worker)"""
+    reader = _worker_pdf_reader(file_path)
+    n_pages = len(reader.pages)
+    return n_pages, [reader.pages[i].extract_text() or "" for i in range(start, min(stop, n_pages))]
+
+# File extensions picked up when a directory is passed to the bulk CLI
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
 class ResumeParser:
-    def __init__(self):
-        self.nlp = nlp
+    def __init__(self, nlp=None, taxonomy_path: Optional[str] = None,
+                 max_pdf_pages: int = PDF_MAX_PAGES, max_pdf_chars: int = PDF_MAX_CHARS,
+                 pdf_parallel_min_bytes: int = PDF_PARALLEL_MIN_BYTES):
+        self.nlp = nlp or load_nlp()
+        self.taxonomy_path = taxonomy_path
+        self.max_pdf_pages = max_pdf_pages
+        self.max_pdf_chars = max_pdf_chars
+        self.pdf_parallel_min_bytes = pdf_parallel_min_bytes
         self.skills = self._load_skills_list()
         
     def _load_skills_list(self) -> set:
-        """Load a predefined list of technical skills"""
-        skills = {
-            # Programming Languages
-            'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'PHP',
-            'Swift', 'Kotlin', 'Go', 'Rust', 'TypeScript', 'HTML', 'CSS',
-            # Frameworks
-            'Django', 'Flask', 'React', 'Angular', 'Vue', 'Node.js',
-            'Spring', 'Ruby on Rails', 'Laravel', '.NET', 'TensorFlow',
-            'PyTorch', 'scikit-learn', 'Pandas', 'NumPy', 'Docker', 'Kubernetes',
-            # Tools & Platforms
-            'Git', 'AWS', 'Azure', 'Google Cloud', 'MongoDB', 'PostgreSQL',
-            'MySQL', 'SQL', 'NoSQL', 'Linux', 'Docker', 'Kubernetes',
-            'CI/CD', 'Jenkins', 'GitHub Actions', 'REST API', 'GraphQL'
-        }
-        return skills
+        """Load the canonical skill names from the skill taxonomy"""
+        self.skill_taxonomy = load_skill_taxonomy(self.taxonomy_path)
+        self.skill_categories = {entry['name']: entry.get('category') for entry in self.skill_taxonomy}
+        self.skill_matcher = self._build_skill_matcher(self.skill_taxonomy)
+        return set(self.skill_categories)
+
+    def _build_skill_matcher(self, taxonomy: List[Dict]) -> Tuple[PhraseMatcher, PhraseMatcher]:
+        """Compile every skill name and alias into PhraseMatchers.
+
+        Most skills match case-insensitively on the LOWER attribute; the few
+        that collide with ordinary English words ("Go", "React", "Swift")
+        are flagged case_sensitive in the taxonomy and match on ORTH instead.
+        Match ids are the canonical skill names, so aliases resolve for free.
+        """
+        lower_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        exact_matcher = PhraseMatcher(self.nlp.vocab, attr="ORTH")
+        for entry in taxonomy:
+            terms = [entry['name']] + list(entry.get('aliases', []))
+            patterns = [self.nlp.make_doc(term) for term in terms]
+            matcher = exact_matcher if entry.get('case_sensitive') else lower_matcher
+            matcher.add(entry['name'], patterns)
+        return lower_matcher, exact_matcher
+
+    def iter_pdf_pages(self, file_path: str) -> Iterator[str]:
+        """Yield the text of each PDF page in order, up to max_pdf_pages.
+
+        Files up to pdf_parallel_min_bytes are read page by page in this
+        process. Larger ones are never parsed here: a pool worker extracts the
+        first page range and reports the page count, then the remaining
+        ranges are extracted in parallel. Each worker parses the file once and
+        keeps it for the later ranges it gets, so a file is parsed at most
+        once per worker rather than once per range. Pages are still yielded in
+        order, and closing the iterator early cancels any ranges that have
+        not started.
+        """
+        if os.path.getsize(file_path) <= self.pdf_parallel_min_bytes:
+            with open(file_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for i in range(min(len(reader.pages), self.max_pdf_pages)):
+                    yield reader.pages[i].extract_text() or ""
+            return
+
+        pool = _get_pdf_pool()
+        first_stop = min(PDF_PAGES_PER_TASK, self.max_pdf_pages)
+        n_pages, first_pages = pool.submit(_extract_pdf_pages, file_path, 0, first_stop).result()
+        n_pages = min(n_pages, self.max_pdf_pages)
+        futures = [
+            pool.submit(_extract_pdf_pages, file_path, start, min(start + PDF_PAGES_PER_TASK, n_pages))
+            for start in range(first_stop, n_pages, PDF_PAGES_PER_TASK)
+        ]
+        try:
+            yield from first_pages
+            for future in futures:
+                yield from future.result()[1]
+        finally:
+            for future in futures:
+                future.cancel()
 
     def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        """Extract text from PDF file, stopping once max_pdf_chars is reached"""
+        pages = []
+        remaining = self.max_pdf_chars
+        for page_text in self.iter_pdf_pages(file_path):
+            if len(page_text) >= remaining:
+                pages.append(page_text[:remaining])
+                break
+            pages.append(page_text + "\n")
+            remaining -= len(page_text) + 1
+        return "".join(pages)
 
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
@@ -94,10 +231,13 @@ class ResumeParser:
             with open(file_path, 'r', encoding='utf-8') as file:
                 return file.read()
 
-    def extract_name(self, text: str) -> str:
+    def extract_name(self, text: str, doc=None) -> str:
         """Extract candidate name from resume text"""
-        doc = self.nlp(text[:1000])  # Only check the first 1000 characters for name
+        if doc is None:
+            doc = self.nlp(text[:1000])  # Only check the first 1000 characters for name
         for ent in doc.ents:
+            if ent.start_char >= 1000:
+                break
             if ent.label_ == "PERSON":
                 return ent.text
         return ""
@@ -114,23 +254,25 @@ class ResumeParser:
         match = re.search(phone_pattern, text)
         return match.group(0) if match else ""
 
-    def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
-        doc = self.nlp(text.lower())
-        found_skills = set()
-        
-        # Check for exact matches
-        for token in doc:
-            if token.text in self.skills:
-                found_skills.add(token.text)
-        
-        # Check for n-grams (phrases)
-        for i in range(len(doc) - 1):
-            phrase = f"{doc[i].text} {doc[i+1].text}"
-            if phrase in self.skills:
-                found_skills.add(phrase)
+    def extract_skills(self, text: str, doc=None) -> List[str]:
+        """Extract skills from resume text in a single pass of the skill matchers"""
+        if doc is None:
+            doc = self.nlp.make_doc(text)  # Matching only needs tokens
+        spans = []
+        for matcher in self.skill_matcher:
+            spans.extend(matcher(doc, as_spans=True))
         
-        return list(found_skills)
+        # Prefer the longest match where skills overlap ("Ruby on Rails" over "Ruby")
+        found_skills = {span.label_ for span in filter_spans(spans)}
+        return sorted(found_skills)
+
+    def categorize_skills(self, skills: List[str]) -> Dict[str, List[str]]:
+        """Group canonical skill names by their taxonomy category"""
+        categories = {}
+        for skill in skills:
+            category = self.skill_categories.get(skill) or 'Other'
+            categories.setdefault(category, []).append(skill)
+        return categories
 
     def extract_experience(self, text: str) -> List[Dict]:
         """Extract work experience from resume text"""
@@ -160,36 +302,133 @@ class ResumeParser:
             
         return experience
 
+    def _build_resume_data(self, text: str, doc) -> ResumeData:
+        """Run every extractor against a single shared spaCy Doc"""
+        resume_data = ResumeData()
+        resume_data.raw_text = text
+        resume_data.name = self.extract_name(text, doc)
+        resume_data.email = self.extract_email(text)
+        resume_data.phone = self.extract_phone(text)
+        resume_data.skills = self.extract_skills(text, doc)
+        resume_data.experience = self.extract_experience(text)
+        # Note: Education extraction would be implemented similarly to experience
+        
+        return resume_data
+
     def parse_resume(self, file_path: str) -> ResumeData:
         """Parse resume file and return structured data"""
         try:
             text = self.extract_text(file_path)
-            resume_data = ResumeData()
-            resume_data.raw_text = text
-            resume_data.name = self.extract_name(text)
-            resume_data.email = self.extract_email(text)
-            resume_data.phone = self.extract_phone(text)
-            resume_data.skills = self.extract_skills(text)
-            resume_data.experience = self.extract_experience(text)
-            # Note: Education extraction would be implemented similarly to experience
-            
-            return resume_data
+            return self._build_resume_data(text, self.nlp(text))
             
         except Exception as e:
             print(f"Error parsing resume: {str(e)}")
             return ResumeData()
 
+    def _iter_texts(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+        """Lazily extract text from each file, flagging the ones that failed"""
+        for file_path in file_paths:
+            try:
+                yield self.extract_text(file_path), True
+            except Exception as e:
+                print(f"Error parsing resume {file_path}: {str(e)}")
+                yield "", False
+
+    def parse_many(self, file_paths: Iterable[str], n_process: int = 1, batch_size: int = 32) -> Iterator[ResumeData]:
+        """Parse many resume files, streaming them through nlp.pipe.
+
+        Text is extracted lazily and every resume goes through the spaCy
+        pipeline exactly once, with the resulting Doc shared by all extractors.
+        With n_process > 1 spaCy spreads the batches across worker processes.
+        Results are yielded in input order as each batch finishes; files that
+        fail to parse yield an empty ResumeData, like parse_resume does.
+        """
+        docs = self.nlp.pipe(
+            self._iter_texts(file_paths),
+            as_tuples=True,
+            n_process=n_process,
+            batch_size=batch_size
+        )
+        for doc, ok in docs:
+            if not ok:
+                yield ResumeData()
+                continue
+            try:
+                yield self._build_resume_data(doc.text, doc)
+            except Exception as e:
+                print(f"Error parsing resume: {str(e)}")
+                yield ResumeData()
+
     def to_json(self, resume_data: ResumeData) -> str:
         """Convert ResumeData object to JSON"""
         return json.dumps(asdict(resume_data), indent=2)
 
-# Example usage
-if __name__ == "__main__":
+def get_resume_parser() -> ResumeParser:
+    """Return the process-wide ResumeParser, creating it on first use.
+
+    Under gunicorn with preload_app the master process warms this up before
+    forking, so every worker shares the already-loaded model.
+    """
+    global _resume_parser
+    if _resume_parser is None:
+        parser = ResumeParser()
+        with _registry_lock:
+            if _resume_parser is None:
+                _resume_parser = parser
+    return _resume_parser
+
+def parser_stats() -> Dict:
+    """Report which model is loaded and how long the cold start took"""
+    return {
+        'model': SPACY_MODEL,
+        'loaded': _nlp is not None,
+        'pipes': list(_nlp.pipe_names) if _nlp is not None else [],
+        'load_seconds': _nlp_load_seconds
+    }
+
+def iter_resume_files(paths: Iterable[str]) -> Iterator[str]:
+    """Expand files and directories into a sorted stream of resume files"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                for name in sorted(files):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Bulk-parse resumes from the command line, writing one JSON object per line"""
+    arg_parser = argparse.ArgumentParser(description="Parse resumes into structured JSON.")
+    arg_parser.add_argument('paths', nargs='*', help="Resume files or directories to parse")
+    arg_parser.add_argument('--n-process', type=int, default=1, help="Number of spaCy worker processes")
+    arg_parser.add_argument('--batch-size', type=int, default=32, help="Documents per nlp.pipe batch")
+    arg_parser.add_argument('-o', '--output', help="Write JSON lines to this file instead of stdout")
+    args = arg_parser.parse_args(argv)
+
     parser = ResumeParser()
-    resume_path = input("Enter path to resume file: ")
-    if os.path.exists(resume_path):
-        result = parser.parse_resume(resume_path)
-        print("\nParsed Resume Data:")
-        print(parser.to_json(result))
-    else:
+
+    if not args.paths:
+        # Example usage
+        resume_path = input("Enter path to resume file: ")
+        if os.path.exists(resume_path):
+            result = parser.parse_resume(resume_path)
+            print("\nParsed Resume Data:")
+            print(parser.to_json(result))
+            return 0
         print("File not found. Please check the file path.")
+        return 1
+
+    files = list(iter_resume_files(args.paths))
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        results = parser.parse_many(files, n_process=args.n_process, batch_size=args.batch_size)
+        for file_path, result in zip(files, results):
+            out.write(json.dumps({'file': file_path, **asdict(result)}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
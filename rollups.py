@@ -0,0 +1,250 @@
+import math
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm.attributes import get_history
+
+from models import db, Candidate, Application, JobPosting, RollupCounter, DailyHireRollup
+
+# ATS score buckets as (label, lower bound exclusive, upper bound inclusive)
+ATS_SCORE_BUCKETS = [
+    ('0-20', None, 0.2),
+    ('21-40', 0.2, 0.4),
+    ('41-60', 0.4, 0.6),
+    ('61-80', 0.6, 0.8),
+    ('81-100', 0.8, None)
+]
+
+# Columns each rollup reads; the hooks only care about changes to these
+TRACKED_ATTRIBUTES = {
+    Candidate: ('ats_score',),
+    Application: ('status', 'job_posting_id', 'updated_at'),
+    JobPosting: ('is_active',)
+}
+
+def ats_score_bucket(score: Optional[float]) -> Optional[str]:
+    if score is None:
+        return None
+    for label, lower, upper in ATS_SCORE_BUCKETS:
+        if (lower is None or score > lower) and (upper is None or score <= upper):
+            return label
+    return None
+
+def _contributions(target, values: Dict) -> Tuple[Counter, Counter]:
+    """RollupCounter and DailyHireRollup increments for one row with these values"""
+    counters, hires = Counter(), Counter()
+    if isinstance(target, Candidate):
+        counters[('candidates', 'total')] += 1
+        score = values['ats_score']
+        if score is not None:
+            counters[('candidates', 'scored')] += 1
+            counters[('candidates', 'ats_score_sum')] += score
+            counters[('ats_score', ats_score_bucket(score))] += 1
+    elif isinstance(target, Application):
+        counters[('application_status', values['status'] or 'unknown')] += 1
+        if values['status'] == 'hired' and values['updated_at'] is not None:
+            hires[(values['job_posting_id'], values['updated_at'].date())] += 1
+    elif isinstance(target, JobPosting):
+        if values['is_active']:
+            counters[('job_postings', 'active')] += 1
+    return counters, hires
+
+def _current_values(target) -> Dict:
+    return {attr: getattr(target, attr) for attr in TRACKED_ATTRIBUTES[type(target)]}
+
+def _committed_values(target) -> Dict:
+    """Tracked values as last flushed, ignoring pending changes"""
+    values = {}
+    for attr in TRACKED_ATTRIBUTES[type(target)]:
+        history = get_history(target, attr)
+        if history.deleted:
+            values[attr] = history.deleted[0]
+        elif history.unchanged:
+            values[attr] = history.unchanged[0]
+        else:
+            values[attr] = None
+    return values
+
+def _diff(new: Counter, old: Counter) -> Dict:
+    return {key: new.get(key, 0) - old.get(key, 0) for key in set(new) | set(old)}
+
+def _upsert(connection, table, keys: Dict, column: str, delta):
+    """Add delta to table.column for the row at keys, creating the row if needed"""
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        stmt = insert(table).values(**keys, **{column: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + stmt.excluded[column]}
+        )
+        connection.execute(stmt)
+    elif dialect == 'mysql':
+        stmt = mysql_insert(table).values(**keys, **{column: delta})
+        connection.execute(stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column]}))
+    else:
+        where = [table.c[name] == value for name, value in keys.items()]
+        result = connection.execute(
+            table.update().where(*where).values({column: table.c[column] + delta})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**keys, **{column: delta}))
+
+def _apply(connection, counters: Dict, hires: Dict):
+    for (metric, bucket), delta in counters.items():
+        if delta:
+            _upsert(connection, RollupCounter.__table__, {'metric': metric, 'bucket': bucket}, 'value', delta)
+    for (job_posting_id, day), delta in hires.items():
+        if delta:
+            _upsert(connection, DailyHireRollup.__table__,
+                    {'job_posting_id': job_posting_id, 'day': day}, 'hires', delta)
+
+def _after_insert(mapper, connection, target):
+    counters, hires = _contributions(target, _current_values(target))
+    _apply(connection, counters, hires)
+
+def _before_update(mapper, connection, target):
+    # updated_at is only known after the UPDATE runs, so the old contribution
+    # is captured here and diffed against the new one in _after_update
+    inspect(target).info['rollup_committed'] = _contributions(target, _committed_values(target))
+
+def _after_update(mapper, connection, target):
+    committed = inspect(target).info.pop('rollup_committed', None)
+    if committed is None:
+        return
+    counters, hires = _contributions(target, _current_values(target))
+    _apply(connection, _diff(counters, committed[0]), _diff(hires, committed[1]))
+
+def _before_delete(mapper, connection, target):
+    counters, hires = _contributions(target, _committed_values(target))
+    _apply(connection, {k: -v for k, v in counters.items()}, {k: -v for k, v in hires.items()})
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """No-op; registering it with active_history makes set() keep the old value"""
+
+for _model, _attrs in TRACKED_ATTRIBUTES.items():
+    event.listen(_model, 'after_insert', _after_insert)
+    event.listen(_model, 'before_update', _before_update)
+    event.listen(_model, 'after_update', _after_update)
+    event.listen(_model, 'before_delete', _before_delete)
+    for _attr in _attrs:
+        event.listen(getattr(_model, _attr), 'set', _load_previous_value, active_history=True)
+
+def expected_counters() -> Dict[Tuple[str, str], float]:
+    """RollupCounter values recomputed from the base tables"""
+    buckets = []
+    for _, lower, upper in ATS_SCORE_BUCKETS:
+        conditions = []
+        if lower is not None:
+            conditions.append(Candidate.ats_score > lower)
+        if upper is not None:
+            conditions.append(Candidate.ats_score <= upper)
+        buckets.append(func.sum(case((db.and_(*conditions), 1), else_=0)))
+
+    row = db.session.query(
+        func.count(Candidate.id),
+        func.count(Candidate.ats_score),
+        func.sum(Candidate.ats_score),
+        *buckets
+    ).one()
+    counters = {
+        ('candidates', 'total'): row[0],
+        ('candidates', 'scored'): row[1],
+        ('candidates', 'ats_score_sum'): row[2] or 0.0
+    }
+    for (label, _, _), count in zip(ATS_SCORE_BUCKETS, row[3:]):
+        counters[('ats_score', label)] = count or 0
+
+    statuses = db.session.query(Application.status, func.count(Application.id))\
+                         .group_by(Application.status)
+    for status, count in statuses:
+        key = ('application_status', status or 'unknown')
+        counters[key] = counters.get(key, 0) + count
+
+    counters[('job_postings', 'active')] = JobPosting.query.filter(JobPosting.is_active.is_(True)).count()
+    return counters
+
+def expected_hires() -> Dict[Tuple[int, date], int]:
+    """DailyHireRollup values recomputed from the base tables"""
+    day = func.date(Application.updated_at)
+    rows = db.session.query(Application.job_posting_id, day, func.count(Application.id))\
+                     .filter(Application.status == 'hired', Application.updated_at.isnot(None))\
+                     .group_by(Application.job_posting_id, day)
+    hires = {}
+    for job_posting_id, hire_day, count in rows:
+        if isinstance(hire_day, str):  # SQLite returns DATE() as text
+            hire_day = date.fromisoformat(hire_day)
+        elif isinstance(hire_day, datetime):
+            hire_day = hire_day.date()
+        hires[(job_posting_id, hire_day)] = count
+    return hires
+
+def _drift(stored: Dict, actual: Dict) -> List[Tuple]:
+    drift = []
+    for key in sorted(set(stored) | set(actual), key=str):
+        stored_value, actual_value = stored.get(key, 0), actual.get(key, 0)
+        if not math.isclose(stored_value, actual_value, abs_tol=1e-6):
+            drift.append((key, stored_value, actual_value))
+    return drift
+
+def reconcile_rollups(fix: bool = True) -> Dict[str, List[Dict]]:
+    """Recompute every rollup from scratch and report where the stored ones drifted.
+
+    Drift comes from writes the mapper hooks don't see (bulk query.update/delete,
+    raw SQL, other services). With fix=True the rollup tables are rebuilt from the
+    recomputed values. Writes that land while this runs can be lost, so schedule it
+    off-peak.
+    """
+    actual_counters = expected_counters()
+    actual_hires = expected_hires()
+    stored_counters = {(c.metric, c.bucket): c.value for c in RollupCounter.query.all()}
+    stored_hires = {(h.job_posting_id, h.day): h.hires for h in DailyHireRollup.query.all()}
+
+    report = {
+        'counters': [
+            {'metric': metric, 'bucket': bucket, 'stored': stored, 'actual': actual}
+            for (metric, bucket), stored, actual in _drift(stored_counters, actual_counters)
+        ],
+        'hires': [
+            {'job_posting_id': job_posting_id, 'day': day.isoformat(), 'stored': stored, 'actual': actual}
+            for (job_posting_id, day), stored, actual in _drift(stored_hires, actual_hires)
+        ]
+    }
+
+    if fix and (report['counters'] or report['hires']):
+        counter_rows = [
+            {'metric': metric, 'bucket': bucket, 'value': value}
+            for (metric, bucket), value in actual_counters.items() if value
+        ]
+        hire_rows = [
+            {'job_posting_id': job_posting_id, 'day': day, 'hires': count}
+            for (job_posting_id, day), count in actual_hires.items() if count
+        ]
+        db.session.execute(RollupCounter.__table__.delete())
+        db.session.execute(DailyHireRollup.__table__.delete())
+        if counter_rows:
+            db.session.execute(RollupCounter.__table__.insert(), counter_rows)
+        if hire_rows:
+            db.session.execute(DailyHireRollup.__table__.insert(), hire_rows)
+        db.session.commit()
+    return report
+
+def seed_rollups() -> bool:
+    """Fill the rollup tables if they exist but are empty; returns whether it did.
+
+    create_all adds the rollup tables to a database that already holds
+    candidates and applications, and the hooks only count rows written after
+    that, so the tables start out empty and the dashboard would report zeros.
+    """
+    tables = inspect(db.engine)
+    if not all(tables.has_table(model.__tablename__) for model in (RollupCounter, DailyHireRollup)):
+        return False
+    if RollupCounter.query.first() is not None or DailyHireRollup.query.first() is not None:
+        return False
+    reconcile_rollups(fix=True)
+    return True
@@ -0,0 +1,137 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from models import db, Candidate, Resume, Skill, resume_skills
+from matching import load_skill_taxonomy
+
+_canonical_names = None
+_categories = None
+
+def _load_taxonomy():
+    global _canonical_names, _categories
+    if _canonical_names is None:
+        names, categories = {}, {}
+        for entry in load_skill_taxonomy():
+            categories[entry['name']] = entry.get('category')
+            for term in [entry['name']] + list(entry.get('aliases', [])):
+                names[term.lower()] = entry['name']
+        _canonical_names, _categories = names, categories
+    return _canonical_names, _categories
+
+def normalize_skill_name(name: str) -> str:
+    """Map a skill or alias to its canonical taxonomy name ("k8s" -> "Kubernetes")"""
+    name = " ".join(name.split())
+    canonical_names, _ = _load_taxonomy()
+    return canonical_names.get(name.lower(), name)
+
+def skill_relevance(skills: Union[List[str], Dict[str, float]]) -> Dict[str, float]:
+    """Canonical skill name -> relevance; plain lists get relevance 1.0"""
+    if not isinstance(skills, dict):
+        skills = {name: 1.0 for name in skills}
+    relevance = {}
+    for name, score in skills.items():
+        canonical = normalize_skill_name(name)
+        if canonical:
+            relevance[canonical] = max(score, relevance.get(canonical, 0.0))
+    return relevance
+
+def _write_resume_skills(connection, resume_id: int, relevance: Dict[str, float]):
+    """Replace a resume's resume_skills links, creating missing Skill rows, on connection"""
+    skill_ids = {}
+    if relevance:
+        skill_ids = dict(connection.execute(select(Skill.name, Skill.id).where(Skill.name.in_(relevance))).all())
+    _, categories = _load_taxonomy()
+    for name in sorted(set(relevance) - set(skill_ids)):
+        result = connection.execute(Skill.__table__.insert().values(name=name, category=categories.get(name)))
+        skill_ids[name] = result.inserted_primary_key[0]
+    connection.execute(resume_skills.delete().where(resume_skills.c.resume_id == resume_id))
+    if relevance:
+        connection.execute(resume_skills.insert(), [
+            {'resume_id': resume_id, 'skill_id': skill_ids[name], 'relevance': score}
+            for name, score in relevance.items()
+        ])
+
+def index_resume_skills(resume: Resume, skills: Optional[Union[List[str], Dict[str, float]]] = None):
+    """Write normalized Skill rows and resume_skills links for a resume.
+
+    Resumes are indexed from parsed_data['skills'] whenever one is inserted
+    or its parsed_data changes (see the listeners below), so this is only
+    needed to rebuild the index or to give each skill its own relevance
+    (pass a dict; plain lists are indexed with relevance 1.0). Existing
+    links for the resume are replaced. The caller commits.
+    """
+    if skills is None:
+        skills = (resume.parsed_data or {}).get('skills') or []
+    if resume.id is None:
+        db.session.flush()
+    _write_resume_skills(db.session.connection(), resume.id, skill_relevance(skills))
+    db.session.expire(resume, ['skills'])
+
+def _index_written_resume(connection, target):
+    _write_resume_skills(connection, target.id, skill_relevance((target.parsed_data or {}).get('skills') or []))
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('skill_indexed_resumes', []).append(target)
+
+def _after_insert(mapper, connection, target):
+    _index_written_resume(connection, target)
+
+def _after_update(mapper, connection, target):
+    if inspect(target).attrs.parsed_data.history.has_changes():
+        _index_written_resume(connection, target)
+
+event.listen(Resume, 'after_insert', _after_insert)
+event.listen(Resume, 'after_update', _after_update)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_indexed_skills(session, flush_context):
+    # The links were written behind the ORM's back; reload Resume.skills on next access
+    for resume in session.info.pop('skill_indexed_resumes', []):
+        if resume in session:
+            session.expire(resume, ['skills'])
+
+def search_candidates(all_skills: Iterable[str] = (), any_skills: Iterable[str] = (),
+                      not_skills: Iterable[str] = (), min_relevance: float = 0.0,
+                      page: int = 1, per_page: int = 20):
+    """Find candidates by skill through the resume_skills index.
+
+    A candidate matches when one of their resumes has every skill in
+    all_skills (AND), at least one of any_skills (OR) and none of
+    not_skills (NOT). AND/OR links must have relevance >= min_relevance.
+    Returns a Flask-SQLAlchemy Pagination of Candidate rows.
+    """
+    all_names = {normalize_skill_name(s) for s in all_skills if s.strip()}
+    any_names = {normalize_skill_name(s) for s in any_skills if s.strip()}
+    not_names = {normalize_skill_name(s) for s in not_skills if s.strip()}
+
+    wanted = all_names | any_names | not_names
+    skill_ids = dict(db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(wanted)).all()) if wanted else {}
+
+    query = db.session.query(Resume.id)
+    if all_names:
+        if not all_names <= set(skill_ids):
+            query = query.filter(db.false())  # A required skill nobody has
+        else:
+            has_all = db.session.query(resume_skills.c.resume_id).filter(
+                resume_skills.c.skill_id.in_([skill_ids[n] for n in all_names]),
+                resume_skills.c.relevance >= min_relevance
+            ).group_by(resume_skills.c.resume_id).having(db.func.count() == len(all_names))
+            query = query.filter(Resume.id.in_(has_all))
+    if any_names:
+        has_any = db.session.query(resume_skills.c.resume_id).filter(
+            resume_skills.c.skill_id.in_([skill_ids[n] for n in any_names if n in skill_ids]),
+            resume_skills.c.relevance >= min_relevance
+        )
+        query = query.filter(Resume.id.in_(has_any))
+    if not_names & set(skill_ids):
+        has_excluded = db.session.query(resume_skills.c.resume_id).filter(
+            resume_skills.c.skill_id.in_([skill_ids[n] for n in not_names if n in skill_ids])
+        )
+        query = query.filter(~Resume.id.in_(has_excluded))
+
+    matching_candidates = db.session.query(Resume.candidate_id).filter(Resume.id.in_(query))
+    return Candidate.query.filter(Candidate.id.in_(matching_candidates))\
+                          .order_by(Candidate.ats_score.desc(), Candidate.id)\
+                          .paginate(page=page, per_page=per_page, error_out=False)
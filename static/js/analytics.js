@@ -1,4 +1,10 @@
 document.addEventListener('DOMContentLoaded', function() {
+    // Dashboard charts are drawn here from the JSON series in /dashboard/api/charts
+    renderDashboardCharts();
+    
+    // The Chart.js analytics charts only exist on the analytics page
+    if (!document.getElementById('hiringTrendsChart')) return;
+    
     // Initialize all charts when the page loads
     initAllCharts();
     
@@ -9,6 +15,159 @@ document.addEventListener('DOMContentLoaded', function() {
     loadInitialData();
 });
 
+// Shared dark theme for the dashboard's Plotly charts
+const DASHBOARD_CHART_LAYOUT = {
+    plot_bgcolor: '#1a1a1a',
+    paper_bgcolor: '#1a1a1a',
+    font: { color: '#f8f9fa', family: 'Inter' },
+    margin: { l: 50, r: 20, t: 60, b: 50 },
+    showlegend: false
+};
+
+// Render every [data-chart] container that the server left empty
+function renderDashboardCharts() {
+    const containers = Array.from(document.querySelectorAll('[data-chart]'))
+        .filter(el => !el.querySelector('.js-plotly-plot, .plotly-graph-div'));
+    if (!containers.length || typeof Plotly === 'undefined') return;
+    
+    fetch('/dashboard/api/charts', { credentials: 'same-origin' })
+        .then(response => {
+            if (!response.ok) throw new Error(`Chart data request failed: ${response.status}`);
+            return response.json();
+        })
+        .then(series => {
+            containers.forEach(container => {
+                const render = DASHBOARD_CHART_RENDERERS[container.dataset.chart];
+                const data = series[container.dataset.chart];
+                if (render && data) {
+                    container.innerHTML = '';
+                    render(container, data);
+                }
+            });
+        })
+        .catch(error => console.error('Error loading dashboard charts:', error));
+}
+
+const DASHBOARD_CHART_RENDERERS = {
+    resume_score(container, data) {
+        const peak = Math.max(...data.counts);
+        // Vertical markers sit on the categorical axis at bin index positions
+        const binWidth = 100 / data.labels.length;
+        const marker = (value, color, dash, text) => ({
+            type: 'line', x0: value / binWidth - 0.5, x1: value / binWidth - 0.5, yref: 'paper', y0: 0, y1: 1,
+            line: { color, dash }, label: { text }
+        });
+        Plotly.newPlot(container, [{
+            type: 'bar',
+            x: data.labels,
+            y: data.counts,
+            marker: { color: data.counts.map(c => c < peak ? '#4e73df' : '#1cc88a'), line: { color: 'white', width: 1 } },
+            opacity: 0.85,
+            hovertemplate: '<b>%{x}%</b><br>Candidates: %{y}<extra></extra>'
+        }], {
+            ...DASHBOARD_CHART_LAYOUT,
+            title: { text: 'Resume Score Distribution', x: 0.5 },
+            xaxis: { title: 'Score Range', gridcolor: '#2d2d2d' },
+            yaxis: { title: 'Number of Candidates', gridcolor: '#2d2d2d' },
+            bargap: 0.1,
+            height: 400,
+            shapes: [
+                marker(data.mean, '#e74a3b', 'dash', `Mean: ${data.mean}`),
+                marker(data.threshold, '#1cc88a', 'dash', `Pass: ${data.threshold}%`)
+            ],
+            annotations: [{
+                x: 0.5, y: 0.95, xref: 'paper', yref: 'paper', showarrow: false,
+                text: `Pass: ${data.pass} | Fail: ${data.fail}`,
+                font: { size: 12, color: '#4e73df' }, bgcolor: 'rgba(255,255,255,0.9)'
+            }]
+        }, { displaylogo: false, modeBarButtonsToRemove: ['select2d', 'lasso2d'] });
+    },
+    
+    sentiment(container, data) {
+        Plotly.newPlot(container, [{
+            type: 'pie',
+            labels: data.labels,
+            values: data.values,
+            hole: 0.6,
+            marker: { colors: ['#1cc88a', '#f6c23e', '#e74a3b'], line: { color: '#ffffff', width: 2 } },
+            sort: false,
+            direction: 'clockwise',
+            rotation: 90,
+            texttemplate: '%{label}<br>%{percent:.0%}',
+            hovertemplate: '<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent:.1%}<extra></extra>'
+        }], {
+            ...DASHBOARD_CHART_LAYOUT,
+            title: { text: 'Candidate Sentiment Analysis', x: 0.5 },
+            showlegend: true,
+            legend: { orientation: 'h', x: 0.5, xanchor: 'center', y: -0.1 },
+            margin: { l: 10, r: 10, t: 60, b: 50 },
+            height: 320,
+            annotations: [{ text: `${data.total}<br>Total`, x: 0.5, y: 0.5, showarrow: false, font: { size: 16, color: '#4e73df' } }]
+        }, { displayModeBar: false });
+    },
+    
+    skill_distribution(container, data) {
+        Plotly.newPlot(container, [{
+            type: 'bar',
+            orientation: 'h',
+            x: data.counts,
+            y: data.skills,
+            text: data.counts,
+            textposition: 'auto',
+            marker: { color: '#4e73df' },
+            opacity: 0.85,
+            hovertemplate: '<b>%{y}</b><br>Count: %{x}<extra></extra>'
+        }], {
+            ...DASHBOARD_CHART_LAYOUT,
+            title: { text: 'Top In-Demand Skills', x: 0.5 },
+            xaxis: { title: 'Number of Candidates', gridcolor: '#2d2d2d' },
+            yaxis: { automargin: true },
+            margin: { l: 10, r: 10, t: 80, b: 30, pad: 5 },
+            height: 400
+        }, { displayModeBar: false });
+    },
+    
+    pipeline(container, data) {
+        Plotly.newPlot(container, [{
+            type: 'funnel',
+            y: data.stages,
+            x: data.counts,
+            textposition: 'inside',
+            textinfo: 'value+percent initial',
+            opacity: 0.8,
+            marker: { color: data.colors },
+            connector: { line: { color: '#6c757d', width: 1 } }
+        }], {
+            ...DASHBOARD_CHART_LAYOUT,
+            title: { text: 'Recruitment Pipeline', x: 0.5 },
+            margin: { l: 10, r: 10, t: 80, b: 30, pad: 5 },
+            height: 400,
+            annotations: data.stages.map((stage, i) => ({
+                x: 0.95, y: 1 - i * 0.2, xref: 'paper', yref: 'paper', xanchor: 'left', showarrow: false,
+                text: `${stage}: ${data.counts[i]} (${data.conversion[i].toFixed(1)}%)`
+            }))
+        }, { displayModeBar: false });
+    },
+    
+    hiring_trends(container, data) {
+        const line = (name, y, color, dash, symbol) => ({
+            type: 'scatter', mode: 'lines+markers', name, x: data.dates, y,
+            line: { color, width: 3, dash }, marker: { size: 8, symbol }
+        });
+        const traces = [line('Hires', data.hires, '#36b9cc', 'solid', 'star')];
+        Plotly.newPlot(container, traces, {
+            ...DASHBOARD_CHART_LAYOUT,
+            title: { text: 'Hires per Month (Last 6 Months)', x: 0.5 },
+            xaxis: { title: 'Month', gridcolor: '#2d2d2d' },
+            yaxis: { title: 'Hires', gridcolor: '#2d2d2d', rangemode: 'tozero' },
+            hovermode: 'x unified',
+            showlegend: true,
+            legend: { orientation: 'h', x: 1, xanchor: 'right', y: 1.02, yanchor: 'bottom' },
+            margin: { l: 50, r: 60, t: 80, b: 60 }
+        }, { displayModeBar: false });
+    }
+};
+
 // Initialize all charts
 function initAllCharts() {
     initHiringTrendsChart();
@@ -0,0 +1,247 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+openai = pytest.importorskip("openai")
+if not openai.version.VERSION.startswith("0."):
+    pytest.skip("AIInterviewer uses the pre-1.0 openai API", allow_module_level=True)
+
+from ai_interviewer import AIInterviewer
+from completion_cache import SQLiteCompletionCache
+from interview_context import count_message_tokens
+
+# Stub replies and delays (seconds), picked by the first phrase found in a prompt's system messages
+STUB_REPLIES = {
+    'one-sentence follow-up question': (json.dumps({
+        'analysis': 'Structured analysis.', 'score': 5, 'follow_up': 'How did you test it?'
+    }), 0.3),
+    'analyzing a candidate': ('Clear and relevant answer.', 0.3),
+    'Rate the candidate': ('4', 0.2),
+    'follow-up question': ('Which database did you use?', 0.4),
+    'professional interviewer': ('What did you learn from your last project?', 0.1),
+    'keep notes on a job interview': ('Candidate described API and database work.', 0.0)
+}
+
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    """Answers /chat/completions like the OpenAI API, after a per-prompt delay"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        system = '\n'.join(message['content'] for message in body['messages'] if message['role'] == 'system')
+        self.server.requests += 1
+        content, delay = next(reply for phrase, reply in self.server.replies.items() if phrase in system)
+        if body.get('stream'):
+            self.stream(body, content, delay)
+            return
+        time.sleep(delay)
+        payload = json.dumps({
+            'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream(self, body, content, delay):
+        """Send content word by word as server-sent events, delay seconds apart"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')  # As the API does; the client reads each chunk as it lands
+        self.end_headers()
+        for word in content.split(' '):
+            time.sleep(delay)
+            chunk = {
+                'id': 'stub', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                'choices': [{'index': 0, 'finish_reason': None, 'delta': {'content': word + ' '}}]
+            }
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.write_chunk(b"data: [DONE]\n\n")
+        self.write_chunk(b"")
+
+    def write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubCompletionHandler)
+    server.replies = dict(STUB_REPLIES)
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_interviewer(server, **options):
+    return AIInterviewer('test-key', api_base=f"http://127.0.0.1:{server.server_port}/v1", **options)
+
+def test_analyze_response_waits_for_the_slowest_call(stub_server):
+    interviewer = make_interviewer(stub_server, structured=False)
+    interviewer.set_job_description('Backend engineer')
+    interviewer.analyze_response('Warm-up', 'Connections')  # Keep connection setup out of the timing
+
+    start = time.perf_counter()
+    result = interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+    elapsed = time.perf_counter() - start
+
+    assert result == {
+        'text': 'Clear and relevant answer.',
+        'score': 4,
+        'suggested_follow_up': 'Which database did you use?'
+    }
+    slowest = max(delay for phrase, (_, delay) in STUB_REPLIES.items() if 'one-sentence' not in phrase)
+    assert slowest <= elapsed < slowest + 0.25  # Sequential calls would take 0.9s
+
+def test_analyze_response_falls_back_per_call_on_timeout(stub_server):
+    stub_server.replies['follow-up question'] = ('Too late', 2.0)
+    interviewer = make_interviewer(stub_server, request_timeout=0.5, structured=False)
+
+    start = time.perf_counter()
+    result = interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert time.perf_counter() - start < 1.5
+    assert result['text'] == 'Clear and relevant answer.'
+    assert result['score'] == 4
+    assert result['suggested_follow_up'] == ''
+
+def test_structured_analysis_is_one_call(stub_server):
+    interviewer = make_interviewer(stub_server, structured=True)
+
+    result = interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert stub_server.requests == 1
+    assert result == {'text': 'Structured analysis.', 'score': 5, 'suggested_follow_up': 'How did you test it?'}
+
+def test_structured_analysis_falls_back_when_schema_fails(stub_server):
+    stub_server.replies['one-sentence follow-up question'] = (
+        json.dumps({'analysis': 'Out of range', 'score': 9, 'follow_up': ''}), 0.0
+    )
+    interviewer = make_interviewer(stub_server, structured=True)
+
+    result = interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert stub_server.requests == 4
+    assert result == {
+        'text': 'Clear and relevant answer.',
+        'score': 4,
+        'suggested_follow_up': 'Which database did you use?'
+    }
+
+def test_stream_question_yields_tokens_before_the_completion_ends(stub_server):
+    interviewer = make_interviewer(stub_server)
+    interviewer.record_answer('I led the payments migration.')
+
+    start = time.perf_counter()
+    stream = interviewer.stream_question()
+    first = next(stream)
+    first_token = time.perf_counter() - start
+    rest = list(stream)
+    total = time.perf_counter() - start
+
+    question = 'What did you learn from your last project?'
+    assert ''.join([first] + rest).strip() == question
+    assert len(rest) >= 5
+    assert first_token < total / 3
+    assert interviewer.conversation_history[-1] == {'role': 'assistant', 'content': question}
+
+def test_low_temperature_completions_are_cached(stub_server, tmp_path):
+    cache = SQLiteCompletionCache(str(tmp_path / 'completions.sqlite3'))
+    interviewer = make_interviewer(stub_server, structured=True, completion_cache=cache)
+
+    first = interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+    second = make_interviewer(stub_server, structured=True, completion_cache=cache)\
+        .analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert first == second
+    assert stub_server.requests == 1
+    assert cache.stats()['hits'] == 1
+
+def test_completions_above_the_temperature_threshold_are_not_cached(stub_server, tmp_path):
+    cache = SQLiteCompletionCache(str(tmp_path / 'completions.sqlite3'))
+    interviewer = make_interviewer(stub_server, structured=True, completion_cache=cache, cache_max_temperature=0.2)
+
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert stub_server.requests == 2  # The combined analysis runs at 0.3
+    assert cache.stats()['hits'] == 0
+
+def test_invalid_structured_replies_are_not_cached(stub_server, tmp_path):
+    stub_server.replies['one-sentence follow-up question'] = ('not json', 0.0)
+    cache = SQLiteCompletionCache(str(tmp_path / 'completions.sqlite3'))
+    interviewer = make_interviewer(stub_server, structured=True, completion_cache=cache)
+
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    # Each call retries the combined prompt; the score (temperature 0.2) is cached after the first
+    assert stub_server.requests == 4 + 3
+
+def test_expired_and_least_recently_used_entries_are_dropped(tmp_path):
+    cache = SQLiteCompletionCache(str(tmp_path / 'completions.sqlite3'), max_entries=2, ttl_seconds=60)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    assert cache.get('a') == '1'
+    cache.set('c', '3')
+
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get('a') is None
+
+def test_prompt_stays_within_the_context_budget(stub_server):
+    interviewer = make_interviewer(stub_server, context_tokens=1000)
+    interviewer.set_resume_data({'skills': ['Python', 'SQL'], 'email': 'a@example.com', 'raw_text': 'x ' * 5000})
+
+    sizes = []
+    for turn in range(30):
+        interviewer.conversation_history.append({'role': 'assistant', 'content': f'Question {turn}: ' + 'tell me more ' * 20})
+        interviewer.record_answer(f'Answer {turn}: ' + 'I designed and shipped it ' * 20)
+        sizes.append(count_message_tokens(interviewer._build_prompt()))
+
+    assert max(sizes) < 1000 + 200  # Budget plus the fixed system messages
+    assert 'a@example.com' not in str(interviewer._build_prompt())
+    assert 'Candidate described API and database work.' in interviewer._build_prompt()[2]['content']
+    assert 1 < stub_server.requests <= 10  # Turns (~200 tokens a pair) are summarized a few at a time
+    assert len(interviewer.conversation_history) == 60
+
+def test_token_usage_is_reported_per_call(stub_server, tmp_path):
+    cache = SQLiteCompletionCache(str(tmp_path / 'completions.sqlite3'))
+    interviewer = make_interviewer(stub_server, structured=True, completion_cache=cache)
+
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert interviewer.token_log[0] == {'prompt_tokens': 1, 'completion_tokens': 1, 'cached': False}
+    assert interviewer.token_log[1]['cached'] is True
+    assert interviewer.token_usage() == {
+        'calls': 2, 'cached_calls': 1, 'prompt_tokens': 1, 'completion_tokens': 1,
+        'max_prompt_tokens': interviewer.token_log[1]['prompt_tokens']
+    }
+
+def test_reported_usage_skips_local_token_counting(stub_server, monkeypatch):
+    interviewer = make_interviewer(stub_server, structured=True)
+
+    def count(*args):
+        raise AssertionError('tokens counted although the API reported usage')
+
+    monkeypatch.setattr('ai_interviewer.count_message_tokens', count)
+    monkeypatch.setattr('ai_interviewer.count_tokens', count)
+    interviewer.analyze_response('Tell me about a project', 'I built an API in Flask')
+
+    assert interviewer.token_log == [{'prompt_tokens': 1, 'completion_tokens': 1, 'cached': False}]
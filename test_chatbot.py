@@ -0,0 +1,283 @@
+import json
+import os
+import random
+import re
+import string
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+NLP_DIR = os.path.join(ROOT_DIR, 'app', 'nlp')
+sys.path.insert(0, NLP_DIR)
+import train
+from train import NLPChatbot
+import intent_index
+from intent_index import build_intent_index, evaluate_recall, l2_normalize
+from intent_cache import IntentCache, MISS
+
+# Stands in for NLTK's punkt, WordNet and stop word data, which tests can't download
+STUB_LEMMAS = {'candidates': 'candidate', 'interviews': 'interview', 'questions': 'question', 'skills': 'skill'}
+STUB_STOP_WORDS = frozenset("a an and the to how what is for in of on do i you".split()) | frozenset(string.punctuation)
+
+class StubLemmatizer:
+    def lemmatize(self, token):
+        return STUB_LEMMAS.get(token, token)
+
+def stub_word_tokenize(text):
+    stub_word_tokenize.calls += 1
+    return re.findall(r"\w+|[^\w\s]", text)
+
+WORDS = (
+    "candidate interview resume skills experience salary offer benefits schedule "
+    "feedback onboarding role team manager technical assessment coding review "
+    "python java cloud remote hybrid contract policy deadline reference portfolio "
+    "culture growth promotion training mentor project deliver evaluate hire screen"
+).split()
+
+def synthetic_phrases(n, n_intents=20, seed=3):
+    rng = random.Random(seed)
+    return [
+        (" ".join(rng.sample(WORDS, k=rng.randint(3, 8))), f"intent_{rng.randrange(n_intents)}")
+        for _ in range(n)
+    ]
+
+def shortened(phrases, n, seed=5):
+    """Training phrases with a word dropped, as unseen queries"""
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(text.split(), k=len(text.split()) - 1)) for text, _ in rng.sample(phrases, n)]
+
+@pytest.fixture(autouse=True)
+def stub_nltk(monkeypatch):
+    monkeypatch.setattr(train, '_nltk_tools', lambda: (stub_word_tokenize, StubLemmatizer(), STUB_STOP_WORDS))
+    train._lemma.cache_clear()
+    train._lemma_tokens.cache_clear()
+    stub_word_tokenize.calls = 0
+    yield
+    train._lemma.cache_clear()
+    train._lemma_tokens.cache_clear()
+
+@pytest.fixture
+def chatbot(tmp_path):
+    return NLPChatbot(model_dir=str(tmp_path), incremental=False)
+
+def test_training_matrix_is_precomputed_and_normalized(chatbot):
+    model = chatbot.model
+    texts = [text for text, _ in model.training_data]
+
+    norms = np.sqrt(np.asarray(model.training_matrix.multiply(model.training_matrix).sum(axis=1)).ravel())
+    expected = l2_normalize(model.vectorizer.transform(texts)).toarray()
+    assert np.allclose(norms[norms > 0], 1.0)
+    assert np.allclose(model.training_matrix.toarray(), expected)
+
+def test_a_message_is_the_only_text_transformed(chatbot, monkeypatch):
+    transformed = []
+    transform = chatbot.vectorizer.transform
+    monkeypatch.setattr(chatbot.vectorizer, 'transform', lambda texts: transformed.append(list(texts)) or transform(texts))
+
+    response = chatbot.get_response('How to conduct an interview')
+
+    assert transformed == [['how to conduct an interview']]
+    assert response in chatbot.responses['interview_conduct']
+
+def test_saved_training_matrix_is_loaded_rather_than_recomputed(chatbot, tmp_path, monkeypatch):
+    chatbot.train([("what is the salary range", "compensation")])
+    monkeypatch.setattr(train.ChatbotModel, 'fit', lambda *args, **kwargs: pytest.fail('model was refit on load'))
+
+    loaded = NLPChatbot(model_dir=str(tmp_path), incremental=False)
+
+    assert loaded.version == chatbot.version
+    assert np.allclose(loaded.training_matrix.toarray(), chatbot.training_matrix.toarray())
+
+def test_lsh_index_finds_the_exact_top_match_while_scoring_a_fraction():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    phrases = synthetic_phrases(3000)
+    vectorizer = TfidfVectorizer()
+    matrix = l2_normalize(vectorizer.fit_transform([text for text, _ in phrases]))
+    queries = l2_normalize(vectorizer.transform(shortened(phrases, 200)))
+
+    exact, lsh = build_intent_index(matrix), build_intent_index(matrix, exact_max=1000)
+    quality = evaluate_recall(lsh, exact, queries, k=5)
+
+    assert (exact.name, lsh.name) == ('exact', 'lsh')
+    assert quality['top1'] >= 0.95
+    assert quality['candidate_fraction'] < 0.2
+
+def test_lsh_backed_chatbot_answers_like_the_exact_one(tmp_path, monkeypatch):
+    phrases = synthetic_phrases(600)
+    exact = NLPChatbot(model_dir=str(tmp_path / 'exact'), incremental=False)
+    exact.train(phrases, replace=True)
+    monkeypatch.setattr(intent_index, 'INTENT_INDEX_EXACT_MAX', 100)
+    lsh = NLPChatbot(model_dir=str(tmp_path / 'lsh'), incremental=False)
+    lsh.train(phrases, replace=True)
+
+    assert (exact.index.name, lsh.index.name) == ('exact', 'lsh')
+    queries = shortened(phrases, 100)
+    agree = sum(
+        exact.top_matches(query, k=1)[0]['score'] <= lsh.top_matches(query, k=1)[0]['score'] + 1e-6
+        for query in queries
+    )
+    assert agree >= 95
+
+def test_top_matches_exposes_ranked_candidates(chatbot):
+    matches = chatbot.top_matches('good morning', k=3)
+
+    assert len(matches) == 3
+    assert matches[0] == {'text': 'good morning', 'intent': 'greeting', 'score': 1.0}
+    assert [match['score'] for match in matches] == sorted((match['score'] for match in matches), reverse=True)
+    assert chatbot.top_matches('zzz', k=3) == []
+
+def test_incremental_training_tokenizes_only_the_batch(tmp_path):
+    chatbot = NLPChatbot(model_dir=str(tmp_path), incremental=True)
+    chatbot.train(synthetic_phrases(300))
+    train._lemma_tokens.cache_clear()
+    stub_word_tokenize.calls = 0
+
+    batch = [("when is the onboarding session", "onboarding"), ("who is my onboarding mentor", "onboarding")]
+    chatbot.train(batch)
+
+    assert stub_word_tokenize.calls == len(batch)
+    assert chatbot.model.updates == 2
+
+def test_incremental_model_matches_a_full_refit(tmp_path):
+    phrases = synthetic_phrases(400)
+    incremental = NLPChatbot(model_dir=str(tmp_path / 'incremental'), incremental=True)
+    for start in range(0, len(phrases), 100):
+        incremental.train(phrases[start:start + 100])
+    refit = train.ChatbotModel.fit(incremental.training_data, incremental.responses, version=1, incremental=True)
+    full = NLPChatbot(model_dir=str(tmp_path / 'full'), incremental=False)
+    full.train(phrases)
+
+    # Online IDF is exact, so the matrix equals a hashed refit of the same corpus
+    assert np.allclose(incremental.training_matrix.toarray(), refit.training_matrix.toarray())
+    # And it picks the same training phrase as the vocabulary-based full refit
+    for query in shortened(phrases, 100):
+        assert incremental.top_matches(query, k=1)[0]['score'] == pytest.approx(full.top_matches(query, k=1)[0]['score'], abs=1e-4)
+
+def test_loading_a_saved_model_imports_neither_sklearn_nor_nltk(chatbot, tmp_path):
+    # A fresh interpreter, so modules imported by other tests don't count
+    script = (
+        "import sys; import train; chatbot = train.NLPChatbot(model_dir=sys.argv[1], incremental=False); "
+        "print(chatbot.version, 'sklearn' in sys.modules, 'nltk' in sys.modules)"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([NLP_DIR, ROOT_DIR]))
+    result = subprocess.run([sys.executable, '-c', script, str(tmp_path)], env=env, capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == [str(chatbot.version), 'False', 'False']
+
+def test_models_are_saved_as_json_and_plain_arrays(chatbot, tmp_path):
+    chatbot.train([("what is the salary range", "compensation")])
+
+    saved = sorted(os.listdir(tmp_path))
+    assert not [name for name in saved if name.endswith('.pkl')]
+    with open(chatbot.model_path(chatbot.version)) as f:
+        assert json.load(f)['training_data'][-1] == ["what is the salary range", "compensation"]
+    with np.load(chatbot.arrays_path(chatbot.version), allow_pickle=False) as npz:
+        assert tuple(npz['rows_shape']) == chatbot.training_matrix.shape
+
+def test_pickled_models_are_refit_from_training_data_and_removed(tmp_path):
+    with open(tmp_path / 'training_data.json', 'w') as f:
+        json.dump({'training_data': [["good morning", "greeting"]], 'responses': {'greeting': ["Hello!"]}}, f)
+    (tmp_path / 'chatbot_model.pkl').write_bytes(b'not unpickled')
+
+    chatbot = NLPChatbot(model_dir=str(tmp_path), incremental=False)
+
+    assert chatbot.training_data == [("good morning", "greeting")]
+    assert not (tmp_path / 'chatbot_model.pkl').exists()
+
+@pytest.fixture
+def nltk_data(monkeypatch):
+    """nltk.data.find with only the resources in `found`, recording downloads"""
+    nltk = pytest.importorskip("nltk")
+    found, downloaded = set(), []
+
+    def find(resource):
+        if resource not in found:
+            raise LookupError(resource)
+    monkeypatch.setattr(nltk.data, 'find', find)
+    monkeypatch.setattr(nltk, 'download', lambda package, **kwargs: downloaded.append(package))
+    monkeypatch.setattr(train, '_nltk_checked', False)
+    return found, downloaded
+
+def test_only_missing_nltk_data_is_downloaded(nltk_data, monkeypatch):
+    found, downloaded = nltk_data
+    found.update({'corpora/wordnet', 'corpora/stopwords'})
+    monkeypatch.setattr(train, 'NLTK_OFFLINE', False)
+
+    train.ensure_nltk_data()
+    train.ensure_nltk_data()
+
+    assert downloaded == [package for package in train._nltk_resources() if package.startswith('punkt')]
+
+def test_missing_nltk_data_is_an_error_when_offline(nltk_data, monkeypatch):
+    found, downloaded = nltk_data
+    monkeypatch.setattr(train, 'NLTK_OFFLINE', True)
+
+    with pytest.raises(LookupError, match='--download-nltk'):
+        train.ensure_nltk_data()
+    assert downloaded == []
+
+def test_lemma_tokenizer_caches_without_changing_tokens():
+    tokenizer = train.LemmaTokenizer()
+    text = "How do I schedule interviews for candidates?"
+    uncached = [StubLemmatizer().lemmatize(token) for token in stub_word_tokenize(text.lower()) if token not in STUB_STOP_WORDS]
+    stub_word_tokenize.calls = 0
+
+    assert tokenizer(text) == uncached == ['schedule', 'interview', 'candidate']
+    assert tokenizer(text) == uncached
+    assert stub_word_tokenize.calls == 1
+    stats = train.tokenizer_cache_info()
+    assert (stats['texts']['hits'], stats['texts']['misses']) == (1, 1)
+
+def test_retraining_reuses_cached_tokens(chatbot):
+    lemmas = train.tokenizer_cache_info()['lemmas']['misses']
+    stub_word_tokenize.calls = 0
+
+    chatbot.train([("what is the salary range", "compensation")])
+
+    # Only the new phrase is tokenized, and only its unseen words are lemmatized
+    assert stub_word_tokenize.calls == 1
+    assert train.tokenizer_cache_info()['lemmas']['misses'] - lemmas == len({'salary', 'range'} - {
+        token for text, _ in chatbot.training_data[:-1] for token in text.split()
+    })
+
+def test_intent_cache_evicts_the_least_recently_used_message():
+    cache = IntentCache(max_entries=2)
+    cache.get(1, 'hello')
+    cache.set(1, 'hello', 'greeting')
+    cache.set(1, 'bye', 'farewell')
+    cache.get(1, 'hello')
+    cache.set(1, 'salary', 'compensation')
+
+    assert cache.get(1, 'bye') is MISS
+    assert (cache.get(1, 'hello'), cache.get(1, 'salary')) == ('greeting', 'compensation')
+    assert cache.stats()['evictions'] == 1
+
+def test_intent_cache_entries_belong_to_one_model_version():
+    cache = IntentCache()
+    cache.get(1, 'hello')
+    cache.set(1, 'hello', 'greeting')
+
+    assert cache.get(2, 'hello') is MISS
+    cache.set(2, 'hello', 'welcome')
+    # A request still holding version 1 neither reads nor overwrites version 2's entries
+    assert cache.get(1, 'hello') is MISS
+    cache.set(1, 'hello', 'greeting')
+    assert cache.get(2, 'hello') == 'welcome'
+
+def test_repeated_messages_skip_intent_resolution(chatbot, monkeypatch):
+    resolved = []
+    resolve = chatbot._resolve_intent
+    monkeypatch.setattr(chatbot, '_resolve_intent', lambda message, model: resolved.append(message) or resolve(message, model))
+
+    for message in ('Good morning', '  good   MORNING ', 'good morning'):
+        assert chatbot.get_response(message) in chatbot.responses['greeting']
+    assert resolved == ['good morning']
+
+    chatbot.train([("good morning team", "greeting")])
+    chatbot.get_response('Good morning')
+    assert resolved == ['good morning', 'good morning']
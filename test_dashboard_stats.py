@@ -0,0 +1,175 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from models import db, Candidate, Application, JobPosting, Resume, RollupCounter, DailyHireRollup
+from dashboard_stats import DashboardStats
+from dashboard import dashboard_bp, dashboard_data
+from utils.disk_cache import DiskCache
+from rollups import reconcile_rollups, seed_rollups
+
+NOW = datetime(2024, 6, 15)
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        seed()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def seed():
+    jobs = [
+        JobPosting(title='Backend Engineer', description='Python and SQL', requirements='3 years'),
+        JobPosting(title='Frontend Engineer', description='React', requirements='2 years'),
+        JobPosting(title='Old Role', description='Java', requirements='5 years', is_active=False)
+    ]
+    db.session.add_all(jobs)
+    scores = [0.1, 0.35, 0.5, 0.75, 0.9, 0.95]
+    candidates = [
+        Candidate(first_name='C', last_name=str(i), email=f'c{i}@example.com', ats_score=score)
+        for i, score in enumerate(scores)
+    ]
+    db.session.add_all(candidates)
+    db.session.flush()
+
+    statuses = [
+        ('applied', datetime(2024, 6, 1)),
+        ('interview_scheduled', datetime(2024, 6, 2)),
+        ('interview_scheduled', datetime(2024, 5, 20)),
+        ('hired', datetime(2024, 6, 10)),
+        ('hired', datetime(2024, 3, 5)),
+        ('hired', datetime(2023, 11, 1)),  # outside the six-month window
+    ]
+    for candidate, (status, updated_at) in zip(candidates, statuses):
+        resume = Resume(candidate_id=candidate.id, file_path='r.pdf', file_name='r.pdf',
+                        file_type='pdf', file_size=1)
+        db.session.add(resume)
+        db.session.flush()
+        db.session.add(Application(candidate_id=candidate.id, job_posting_id=jobs[0].id,
+                                   resume_id=resume.id, status=status, updated_at=updated_at))
+    db.session.commit()
+
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_collect_reads_rollups_in_two_queries(app):
+    statements, stop = count_statements(db.engine)
+    try:
+        stats = DashboardStats(now=NOW).collect()
+    finally:
+        stop()
+    assert len(statements) == 2
+
+    assert stats['total_candidates'] == 6
+    assert stats['total_applications'] == 6
+    assert stats['interviews_scheduled'] == 2
+    assert stats['jobs_posted'] == 2
+    assert stats['avg_ats_score'] == round(sum([0.1, 0.35, 0.5, 0.75, 0.9, 0.95]) / 6 * 100, 1)
+    assert stats['hiring_rate'] == 50.0
+    assert stats['status_counts'] == {'Applied': 1, 'Interview Scheduled': 2, 'Hired': 3}
+    assert stats['score_distribution'] == {'0-20': 1, '21-40': 1, '41-60': 1, '61-80': 1, '81-100': 2}
+    assert stats['hiring_trends'] == {
+        'Jan 2024': 0, 'Feb 2024': 0, 'Mar 2024': 1,
+        'Apr 2024': 0, 'May 2024': 0, 'Jun 2024': 1
+    }
+
+def test_dashboard_render_is_six_queries(app, tmp_path):
+    app.config['CHART_CACHE_DIR'] = str(tmp_path / 'chart_cache')
+    app.register_blueprint(dashboard_bp)
+    client = app.test_client()
+    db.session.remove()  # Nothing preloaded from seeding
+
+    statements, stop = count_statements(db.engine)
+    try:
+        data = dashboard_data(now=NOW)
+        assert len(statements) == 6  # Rollups (2), top candidates, recent activity, sentiment, skills
+        del statements[:]
+        response = client.get('/dashboard/api/charts')
+    finally:
+        stop()
+    assert response.status_code == 200
+    assert len(statements) == 6
+    assert len(data['candidates']) == 5
+    assert [activity['candidate'] for activity in data['activities']] == ['C 3', 'C 1', 'C 0', 'C 2', 'C 4']
+
+def test_hooks_track_updates_and_deletes(app):
+    application = Application.query.filter_by(status='applied').one()
+    application.status = 'hired'
+    candidate = Candidate.query.filter_by(email='c0@example.com').one()
+    candidate.ats_score = 0.85
+    JobPosting.query.filter_by(title='Frontend Engineer').one().is_active = False
+    db.session.commit()
+    db.session.delete(Application.query.filter_by(status='interview_scheduled').first())
+    db.session.commit()
+
+    assert reconcile_rollups(fix=False) == {'counters': [], 'hires': []}
+    stats = DashboardStats(now=datetime.utcnow()).collect()
+    assert stats['jobs_posted'] == 1
+    assert stats['status_counts'] == {'Interview Scheduled': 1, 'Hired': 4}
+    assert stats['score_distribution']['0-20'] == 0
+    assert stats['score_distribution']['81-100'] == 3
+
+def test_reconcile_reports_and_fixes_drift(app):
+    assert reconcile_rollups() == {'counters': [], 'hires': []}
+
+    # Bulk updates bypass the mapper hooks
+    Application.query.filter_by(status='applied').update({'status': 'rejected'})
+    db.session.commit()
+
+    report = reconcile_rollups()
+    assert {(row['bucket'], row['stored'], row['actual']) for row in report['counters']} == {
+        ('applied', 1, 0), ('rejected', 0, 1)
+    }
+    assert db.session.get(RollupCounter, ('application_status', 'rejected')).value == 1
+    assert reconcile_rollups(fix=False) == {'counters': [], 'hires': []}
+
+def test_chart_api_serves_real_series_with_a_stable_etag(app, tmp_path):
+    app.config['CHART_CACHE_DIR'] = str(tmp_path / 'chart_cache')
+    app.register_blueprint(dashboard_bp)
+    client = app.test_client()
+
+    response = client.get('/dashboard/api/charts')
+    assert response.status_code == 200
+    series = response.get_json()
+    assert series['resume_score']['counts'] == [1, 1, 1, 1, 2]
+    assert series['pipeline']['counts'] == [6, 5, 5, 3, 3]
+    assert series['sentiment']['total'] == 0
+
+    again = client.get('/dashboard/api/charts', headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+def test_chart_cache_ttl_counts_from_when_the_entry_was_stored(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), ttl_seconds=60)
+    clock = [1000.0]
+    monkeypatch.setattr('utils.disk_cache.time.time', lambda: clock[0])
+    cache.set('chart', '<div></div>')
+
+    clock[0] += 50
+    assert cache.get('chart') == '<div></div>'
+    clock[0] += 20  # Read 20s ago, but stored 70s ago
+    assert cache.get('chart') is None
+
+def test_empty_rollup_tables_are_seeded_from_existing_rows(app):
+    expected = DashboardStats(now=NOW).collect()
+    # As after create_all adds the rollup tables to a populated database
+    RollupCounter.query.delete()
+    DailyHireRollup.query.delete()
+    db.session.commit()
+
+    assert seed_rollups() is True
+    assert DashboardStats(now=NOW).collect() == expected
+    assert seed_rollups() is False
@@ -0,0 +1,67 @@
+import pytest
+from flask import Flask
+
+from models import db, Candidate, AIMessage
+from interview_context import InterviewContext
+from interview_sessions import InterviewSessions
+
+class FakeInterviewer:
+    """The parts of AIInterviewer that InterviewSessions touches"""
+
+    def __init__(self):
+        self.conversation_history = []
+        self.context = InterviewContext(lambda summary, turns: summary)
+
+    def record_answer(self, answer):
+        self.conversation_history.append({'role': 'user', 'content': answer})
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        for i in range(3):
+            db.session.add(Candidate(first_name='C', last_name=str(i), email=f'c{i}@example.com'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_workers_continue_the_same_interview(app):
+    first = InterviewSessions(lambda candidate_id: FakeInterviewer())
+    second = InterviewSessions(lambda candidate_id: FakeInterviewer())
+
+    interviewer = first.get(1)
+    interviewer.conversation_history.append({'role': 'assistant', 'content': 'What did you build?'})
+    first.save(1)
+    second.get(1).record_answer('A Flask API')
+    second.save(1)
+
+    assert first.get(1) is interviewer
+    assert interviewer.conversation_history == [
+        {'role': 'assistant', 'content': 'What did you build?'},
+        {'role': 'user', 'content': 'A Flask API'}
+    ]
+    assert AIMessage.query.count() == 2
+
+def test_least_recently_used_and_idle_interviewers_are_dropped(app):
+    built = []
+
+    def factory(candidate_id):
+        built.append(candidate_id)
+        return FakeInterviewer()
+
+    sessions = InterviewSessions(factory, max_sessions=2)
+    for candidate_id in (1, 2, 1, 3):
+        sessions.get(candidate_id)
+    assert sorted(sessions._sessions) == [1, 3]
+
+    sessions.get(2)
+    assert built == [1, 2, 3, 2]
+
+    sessions.idle_seconds = 0
+    sessions.get(1)
+    assert list(sessions._sessions) == [1]
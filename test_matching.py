@@ -0,0 +1,48 @@
+from matching import canonical_skills, job_skill_set, score_matrix
+
+def test_resume_and_job_skills_meet_on_canonical_names():
+    resumes = [{'skills': ['node', 'rails', 'gcp'], 'experience': []}]
+    job = "Backend role: Node.js, Ruby on Rails and Google Cloud Platform"
+
+    scores = score_matrix(resumes, [job])
+
+    assert canonical_skills(['node', 'rails', 'gcp']) == {'Node.js', 'Ruby on Rails', 'Google Cloud'}
+    assert scores.result(0, 0)['matched_skills'] == ['Google Cloud', 'Node.js', 'Ruby on Rails']
+    assert scores.result(0, 0)['missing_skills'] == []
+
+def test_job_skills_match_whole_terms_only():
+    assert job_skill_set("Node.js and React.js, going forward") == {'Node.js', 'React'}
+
+def test_experience_is_scored_against_the_job_seniority():
+    resumes = [{'skills': ['Python'], 'experience': [{'duration': '3 years'}]}]
+
+    scores = score_matrix(resumes, ["Junior Python developer", "Python developer", "Principal Python architect"])
+
+    assert [scores.result(0, j)['experience_match'] for j in range(3)] == [100.0, 100.0, 30.0]
+
+def test_job_index_columns_are_added_to_an_existing_table():
+    from flask import Flask
+    from models import db, JobPosting, add_missing_columns
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        # job_postings as deployed before the skill index columns
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE job_postings (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+                "description TEXT NOT NULL, requirements TEXT NOT NULL, location VARCHAR(200), "
+                "is_active BOOLEAN NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            )
+        db.metadata.create_all(db.engine, tables=[t for t in db.metadata.sorted_tables if t.name != 'job_postings'])
+
+        added = add_missing_columns(JobPosting)
+        db.session.add(JobPosting(title='Senior Python developer', description='Python and SQL', requirements=''))
+        db.session.commit()
+
+        assert added == ['required_skills', 'keyword_vector', 'seniority_level', 'skill_index_version']
+        assert JobPosting.query.one().job_skills() == {'Python', 'SQL'}
+        assert add_missing_columns(JobPosting) == []
+        db.session.remove()
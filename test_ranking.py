@@ -0,0 +1,82 @@
+import pytest
+from flask import Flask
+
+from models import db, Candidate, Resume
+from ranking import BM25Index, SharedRankingIndex, init_ranking_index
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['RANKING_INDEX_DIR'] = str(tmp_path / 'ranking_index')
+    app.config['RANKING_INDEX_SAVE_INTERVAL'] = 60
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        init_ranking_index(app)
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+DOCUMENTS = {
+    1: 'python flask postgres',
+    2: 'python django react',
+    3: 'java spring postgres',
+    4: 'rust python embedded'
+}
+
+def add_resume(candidate, skills):
+    resume = Resume(candidate_id=candidate.id, file_path='r.pdf', file_name='r.pdf', file_type='pdf',
+                    file_size=1, parsed_data={'skills': skills})
+    db.session.add(resume)
+    db.session.commit()
+    return resume
+
+def test_committed_resumes_are_searchable_without_a_rebuild(app):
+    index = app.extensions['ranking_index']
+    candidate = Candidate(first_name='Ada', last_name='L', email='ada@example.com')
+    db.session.add(candidate)
+    db.session.commit()
+
+    first = add_resume(candidate, ['Kotlin', 'Android'])
+    assert [doc_id for doc_id, _ in index.search('kotlin')] == [first.id]
+
+    latest = add_resume(candidate, ['Rust', 'Kotlin'])
+    assert [doc_id for doc_id, _ in index.search('kotlin')] == [latest.id]
+
+    db.session.add(Resume(candidate_id=candidate.id, file_path='r.pdf', file_name='r.pdf', file_type='pdf',
+                          file_size=1, parsed_data={'skills': ['Haskell']}))
+    db.session.flush()
+    db.session.rollback()
+    assert index.search('haskell') == []
+
+def test_workers_pick_up_each_others_saved_documents(tmp_path):
+    directory = str(tmp_path / 'ranking_index')
+    first = SharedRankingIndex(directory, save_interval=60, reload_interval=0)
+    second = SharedRankingIndex(directory, save_interval=60, reload_interval=0)
+
+    first.update({1: 'python flask'})
+    second.update({2: 'python django'})
+    first.save()
+    second.save()  # Reloads the first worker's save before writing its own
+
+    assert sorted(doc_id for doc_id, _ in first.search('python')) == [1, 2]
+    assert sorted(doc_id for doc_id, _ in SharedRankingIndex(directory).search('python')) == [1, 2]
+
+@pytest.mark.parametrize('merge_first', [False, True])
+def test_updates_and_removals_score_like_a_fresh_build(merge_first):
+    index = BM25Index()
+    index.add_many(DOCUMENTS.items())
+    if merge_first:
+        index.merge()  # The changes below then hit committed documents
+    index.add(2, 'go kubernetes postgres')
+    index.remove(3)
+
+    fresh = BM25Index()
+    fresh.add_many([(1, DOCUMENTS[1]), (2, 'go kubernetes postgres'), (4, DOCUMENTS[4])])
+
+    for query in ('python', 'postgres', 'kubernetes go', 'java'):
+        assert dict(index.search(query)) == pytest.approx(dict(fresh.search(query)))
+    index.merge()
+    assert dict(index.search('python postgres')) == pytest.approx(dict(fresh.search('python postgres')))
@@ -0,0 +1,36 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+pytest.importorskip("PyPDF2")
+pytest.importorskip("docx")
+
+from benchmark_skills import LEGACY_SKILLS, build_corpus, legacy_extract_skills
+from matching import canonical_skill
+from resume_parser import ResumeParser, load_skill_taxonomy
+
+@pytest.fixture(scope='module')
+def parser():
+    # Extraction only needs tokens, so no trained pipeline is required
+    return ResumeParser(nlp=spacy.blank("en"))
+
+def test_multi_word_skills_and_aliases_resolve_to_canonical_names(parser):
+    text = "Shipped Ruby on Rails and node services to k8s with GitHub Actions; some postgres too."
+
+    assert parser.extract_skills(text) == ['GitHub Actions', 'Kubernetes', 'Node.js', 'PostgreSQL', 'Ruby on Rails']
+
+def test_case_sensitive_skills_only_match_their_proper_spelling(parser):
+    assert parser.extract_skills("Wrote Go services and a React app") == ['Go', 'React']
+    assert parser.extract_skills("Ready to go and react quickly") == []
+
+def test_matcher_finds_planted_skills_and_what_the_old_loop_was_meant_to(parser):
+    taxonomy = load_skill_taxonomy()
+    case_sensitive = {entry['name'] for entry in taxonomy if entry.get('case_sensitive')}
+    # The old loop compared lowercased tokens to mixed-case names; give it the lowercase set it meant
+    legacy_terms = {skill.lower() for skill in LEGACY_SKILLS}
+    for text, planted in build_corpus(taxonomy, 200):
+        doc = parser.nlp.make_doc(text)
+        found = set(parser.extract_skills(text, doc))
+        assert found == planted
+        for skill in {canonical_skill(term) for term in legacy_extract_skills(doc, legacy_terms)} - found:
+            # Only lowercase "go"/"react"-style words, or "Ruby" inside "Ruby on Rails", are dropped
+            assert skill in case_sensitive or any(skill in longer for longer in found)
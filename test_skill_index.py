@@ -0,0 +1,56 @@
+import pytest
+from flask import Flask
+
+from models import db, Candidate, Resume
+from skill_index import index_resume_skills, search_candidates
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def found(**query):
+    return [candidate.email for candidate in search_candidates(**query).items]
+
+def test_resumes_are_indexed_when_written(app):
+    candidate = Candidate(first_name='Ada', last_name='L', email='ada@example.com')
+    db.session.add(candidate)
+    db.session.flush()
+    resume = Resume(candidate_id=candidate.id, file_path='r.pdf', file_name='r.pdf', file_type='pdf',
+                    file_size=1, parsed_data={'skills': ['k8s', 'Python']})
+    db.session.add(resume)
+    db.session.commit()
+
+    assert found(all_skills=['Kubernetes', 'python']) == ['ada@example.com']
+    assert sorted(skill.name for skill in resume.skills) == ['Kubernetes', 'Python']
+
+    resume.parsed_data = {'skills': ['Rust']}
+    db.session.commit()
+    assert found(any_skills=['Kubernetes']) == []
+    assert found(any_skills=['Rust']) == ['ada@example.com']
+
+    db.session.add(Candidate(first_name='Bo', last_name='K', email='bo@example.com'))
+    db.session.commit()  # Writing other rows leaves the resume's links alone
+    assert [skill.name for skill in resume.skills] == ['Rust']
+
+def test_index_resume_skills_keeps_explicit_relevance(app):
+    candidate = Candidate(first_name='Ada', last_name='L', email='ada@example.com')
+    db.session.add(candidate)
+    db.session.flush()
+    resume = Resume(candidate_id=candidate.id, file_path='r.pdf', file_name='r.pdf', file_type='pdf',
+                    file_size=1, parsed_data={'skills': ['Python']})
+    db.session.add(resume)
+    db.session.commit()
+
+    index_resume_skills(resume, {'Python': 0.9, 'SQL': 0.2})
+    db.session.commit()
+
+    assert found(all_skills=['SQL'], min_relevance=0.5) == []
+    assert found(all_skills=['Python'], min_relevance=0.5) == ['ada@example.com']
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import tempfile
+import threading
+
+class DiskCache:
+    """A small JSON-on-disk cache shared by every process on the host.
+
+    Each entry is one file named after its key, holding the value and the
+    time it was stored. Reads bump the file's mtime, so evicting the oldest
+    mtimes once the cache grows past max_entries gives LRU behaviour across
+    gunicorn workers without any coordination. Entries stored more than
+    ttl_seconds ago (if set) are treated as misses and removed, however often
+    they are read. Hit/miss counters are kept per process.
+    """
+
+    def __init__(self, directory, max_entries=1000, ttl_seconds=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            created_at, value = entry['created_at'], entry['value']
+            # TTL runs from when the entry was stored; the mtime only tracks use
+            if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+                self._remove(path)
+                raise FileNotFoundError(path)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store a JSON-serializable value, evicting the least recently used entries"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': time.time(), 'value': value}, f)
+            os.replace(tmp_path, self._path(key))  # Atomic, so readers never see partial files
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:overflow]:
+            self._remove(path)
+            with self._lock:
+                self.evictions += 1
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                self._remove(os.path.join(self.directory, name))
+
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
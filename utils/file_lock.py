@@ -0,0 +1,28 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, which only matters with several workers
+    fcntl = None
+
+# flock is per open file, so threads in one process also need a lock of their own
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path (created if missing) across processes and threads"""
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(os.path.abspath(path), threading.Lock())
+    with thread_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)